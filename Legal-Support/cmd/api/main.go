@@ -38,7 +38,7 @@ func main() {
 		if cfg.EmbeddingProvider == "gemini" {
 			embedder = graph.NewGeminiEmbeddingProvider(cfg.EmbeddingAPIKey, cfg.EmbeddingModel)
 		} else {
-			embedder = graph.NewOpenAIEmbeddingProvider(cfg.EmbeddingAPIKey, cfg.EmbeddingModel)
+			embedder = graph.NewOpenAIEmbeddingProviderWithBaseURL(cfg.EmbeddingAPIKey, cfg.EmbeddingModel, cfg.EmbeddingBaseURL)
 		}
 		if embedder == nil {
 			log.Printf("embedding disabled: missing EMBEDDING_API_KEY")
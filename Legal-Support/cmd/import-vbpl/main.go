@@ -20,12 +20,21 @@ import (
 type VBPLDoc struct {
 	ID      int64
 	Content string
+	// Text is the crawl-time normalized paragraph list (vbpl.noidung_text).
+	Text string
+	// Header metadata parsed by the crawler (law-crawler/vbpl_meta.py); empty when unknown.
+	Number    string
+	Issued    sql.NullTime
+	Type      string
+	Authority string
 }
 
 type VBPLUnit struct {
 	ID      int64
 	Parent  sql.NullInt64
 	Content string
+	// Level is vb_chimuc.cap (part/chapter/section/article/clause/point); empty for rows split before it existed.
+	Level string
 }
 
 func main() {
@@ -66,23 +75,34 @@ func main() {
 		log.Fatalf("load vbpl docs: %v", err)
 	}
 
+	chimuc, err := tableColumns(ctx, mysqlDB, "vb_chimuc")
+	if err != nil {
+		log.Fatalf("read vb_chimuc columns: %v", err)
+	}
+	// cap is added by split_document.ensure_chimuc_columns; databases split before it have no levels.
+	levelColumn := "''"
+	if chimuc["cap"] {
+		levelColumn = "COALESCE(cap, '')"
+	}
+
 	log.Printf("Found %d VBPL documents", len(docs))
 	imported := 0
 
 	for _, doc := range docs {
-		units, err := loadUnits(ctx, mysqlDB, doc.ID)
+		units, err := loadUnits(ctx, mysqlDB, doc.ID, levelColumn)
 		if err != nil {
 			log.Printf("skip vbpl %d: %v", doc.ID, err)
 			continue
 		}
+		plain := docPlainText(doc)
 		if len(units) == 0 {
 			// Fallback: if no structured units, create a single unit from full text content
-			if strings.TrimSpace(doc.Content) != "" {
+			if strings.TrimSpace(plain) != "" {
 				units = []VBPLUnit{
 					{
 						ID:      doc.ID,
 						Parent:  sql.NullInt64{Valid: false},
-						Content: doc.Content,
+						Content: plain,
 					},
 				}
 			} else {
@@ -90,24 +110,26 @@ func main() {
 			}
 		}
 
-		title := extractTitle(doc.Content)
+		title := extractTitle(plain)
 		if title == "" {
 			title = fmt.Sprintf("%s %d", titlePrefix, doc.ID)
 		}
 
-		extractedType := extractType(doc.Content)
-		finalType := docType
-		if extractedType != "" {
-			finalType = extractedType
+		finalType := doc.Type
+		if finalType == "" {
+			finalType = extractType(plain)
+		}
+		if finalType == "" {
+			finalType = docType
 		}
 
 		req := graph.IngestRequest{
 			Document: graph.DocumentRequest{
 				Title:     title,
 				Type:      finalType,
-				Number:    nil,
-				Year:      nil,
-				Authority: nil,
+				Number:    optionalString(doc.Number),
+				Year:      docYear(doc),
+				Authority: optionalString(doc.Authority),
 			},
 			Units:          make([]graph.UnitRequest, 0, len(units)),
 			AutoEmbed:      boolPtr(cfg.EmbeddingEnabled),
@@ -123,6 +145,9 @@ func main() {
 				parentCode = &pc
 				level = "article"
 			}
+			if u.Level != "" {
+				level = u.Level
+			}
 			text := strings.TrimSpace(stripHTML(u.Content))
 			if text == "" {
 				text = "(empty)"
@@ -141,6 +166,13 @@ func main() {
 			log.Printf("ingest vbpl %d failed: %v", doc.ID, err)
 			continue
 		}
+		if resp.UnitsCreated == 0 {
+			// Already imported, possibly before the crawler parsed metadata: fill what is missing.
+			if err := repo.FillDocumentMetadata(ctx, resp.DocumentID, req.Document, docType); err != nil {
+				log.Printf("fill metadata of vbpl %d failed: %v", doc.ID, err)
+			}
+			continue
+		}
 		imported++
 		log.Printf("Imported VBPL %d: units=%d embeddings=%d", doc.ID, resp.UnitsCreated, resp.EmbeddingsCreated)
 	}
@@ -148,8 +180,31 @@ func main() {
 	log.Printf("Done. Imported %d VBPL documents", imported)
 }
 
+// metaColumns are the header fields added to vbpl by law-crawler/vbpl_meta.py.
+var metaColumns = []string{"so_hieu", "ngay_ban_hanh", "loai_van_ban", "co_quan_ban_hanh"}
+
 func loadDocs(ctx context.Context, mysql *sql.DB) ([]VBPLDoc, error) {
-	rows, err := mysql.QueryContext(ctx, "SELECT id, noidung FROM vbpl")
+	present, err := tableColumns(ctx, mysql, "vbpl")
+	if err != nil {
+		return nil, err
+	}
+	// A crawl database older than the metadata columns imports without them
+	// until the crawler (or document-crawler/backfill_text.py --meta) adds and fills them.
+	meta := make([]string, len(metaColumns))
+	for i, col := range metaColumns {
+		meta[i] = "NULL"
+		if present[col] {
+			meta[i] = col
+		}
+	}
+
+	// Raw HTML is only needed for rows the crawler has not normalized yet.
+	rows, err := mysql.QueryContext(ctx, fmt.Sprintf(`
+		SELECT id,
+		       CASE WHEN noidung_text IS NULL OR noidung_text = '' THEN COALESCE(noidung, '') ELSE '' END,
+		       COALESCE(noidung_text, ''),
+		       COALESCE(%s, ''), %s, COALESCE(%s, ''), COALESCE(%s, '')
+		FROM vbpl`, meta[0], meta[1], meta[2], meta[3]))
 	if err != nil {
 		return nil, err
 	}
@@ -158,7 +213,7 @@ func loadDocs(ctx context.Context, mysql *sql.DB) ([]VBPLDoc, error) {
 	var items []VBPLDoc
 	for rows.Next() {
 		var d VBPLDoc
-		if err := rows.Scan(&d.ID, &d.Content); err != nil {
+		if err := rows.Scan(&d.ID, &d.Content, &d.Text, &d.Number, &d.Issued, &d.Type, &d.Authority); err != nil {
 			return nil, err
 		}
 		items = append(items, d)
@@ -166,8 +221,26 @@ func loadDocs(ctx context.Context, mysql *sql.DB) ([]VBPLDoc, error) {
 	return items, rows.Err()
 }
 
-func loadUnits(ctx context.Context, mysql *sql.DB, docID int64) ([]VBPLUnit, error) {
-	rows, err := mysql.QueryContext(ctx, "SELECT id, chi_muc_cha, noi_dung FROM vb_chimuc WHERE id_vb = ? ORDER BY id ASC", docID)
+func tableColumns(ctx context.Context, mysql *sql.DB, table string) (map[string]bool, error) {
+	rows, err := mysql.QueryContext(ctx, "SELECT column_name FROM information_schema.columns WHERE table_schema = DATABASE() AND table_name = ?", table)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	columns := make(map[string]bool)
+	for rows.Next() {
+		var name string
+		if err := rows.Scan(&name); err != nil {
+			return nil, err
+		}
+		columns[strings.ToLower(name)] = true
+	}
+	return columns, rows.Err()
+}
+
+func loadUnits(ctx context.Context, mysql *sql.DB, docID int64, levelColumn string) ([]VBPLUnit, error) {
+	rows, err := mysql.QueryContext(ctx, "SELECT id, chi_muc_cha, noi_dung, "+levelColumn+" FROM vb_chimuc WHERE id_vb = ? ORDER BY id ASC", docID)
 	if err != nil {
 		return nil, err
 	}
@@ -176,7 +249,7 @@ func loadUnits(ctx context.Context, mysql *sql.DB, docID int64) ([]VBPLUnit, err
 	var items []VBPLUnit
 	for rows.Next() {
 		var u VBPLUnit
-		if err := rows.Scan(&u.ID, &u.Parent, &u.Content); err != nil {
+		if err := rows.Scan(&u.ID, &u.Parent, &u.Content, &u.Level); err != nil {
 			return nil, err
 		}
 		items = append(items, u)
@@ -190,6 +263,21 @@ func stripHTML(s string) string {
 	return tagRe.ReplaceAllString(s, " ")
 }
 
+// docPlainText returns one paragraph per line, preferring the normalized
+// text written by the crawler. Each normalized line is "<MARKER>\t<text>".
+func docPlainText(doc VBPLDoc) string {
+	if doc.Text == "" {
+		return stripHTML(doc.Content)
+	}
+	lines := strings.Split(doc.Text, "\n")
+	for i, line := range lines {
+		if idx := strings.IndexByte(line, '\t'); idx >= 0 {
+			lines[i] = line[idx+1:]
+		}
+	}
+	return strings.Join(lines, "\n")
+}
+
 func getenv(key, def string) string {
 	if v := os.Getenv(key); v != "" {
 		return v
@@ -199,8 +287,30 @@ func getenv(key, def string) string {
 
 func boolPtr(v bool) *bool { return &v }
 
-func extractTitle(content string) string {
-	text := strings.TrimSpace(stripHTML(content))
+func optionalString(s string) *string {
+	if s = strings.TrimSpace(s); s == "" {
+		return nil
+	}
+	return &s
+}
+
+var numberYearRe = regexp.MustCompile(`^\d+/((?:19|20)\d{2})/`)
+
+// docYear is the year of ngay_ban_hanh, else the year in the number ("23/2008/QH12").
+func docYear(doc VBPLDoc) *int {
+	if doc.Issued.Valid {
+		year := doc.Issued.Time.Year()
+		return &year
+	}
+	if m := numberYearRe.FindStringSubmatch(doc.Number); m != nil {
+		year, _ := strconv.Atoi(m[1])
+		return &year
+	}
+	return nil
+}
+
+func extractTitle(plain string) string {
+	text := strings.TrimSpace(plain)
 	lines := strings.Split(text, "\n")
 	for _, line := range lines {
 		line = strings.TrimSpace(line)
@@ -221,8 +331,8 @@ func extractTitle(content string) string {
 	return ""
 }
 
-func extractType(content string) string {
-	text := strings.TrimSpace(stripHTML(content))
+func extractType(plain string) string {
+	text := strings.TrimSpace(plain)
 	textUpper := strings.ToUpper(text)
 
 	// Check first 500 chars to avoid false positives later in text
@@ -9,10 +9,12 @@ type Config struct {
 	EmbeddingAPIKey  string
 	EmbeddingModel   string
 	EmbeddingProvider string
+	EmbeddingBaseURL string
 	EmbeddingEnabled bool
 	QAModel          string
 	RerankAPIKeys    string
 	RerankModel      string
+	PhraseLexicon    string
 }
 
 func Load() Config {
@@ -22,16 +24,19 @@ func Load() Config {
 	embeddingKey := getenv("EMBEDDING_API_KEY", "")
 	embeddingModel := getenv("EMBEDDING_MODEL", "text-embedding-3-small")
 	embeddingProvider := getenv("EMBEDDING_PROVIDER", "openai")
+	embeddingBaseURL := getenv("EMBEDDING_BASE_URL", "")
 	embeddingEnabled := getenvBool("EMBEDDING_ENABLED", "true")
 	qaModel := getenv("QA_MODEL", "gpt-4o-mini")
 	rerankKeys := getenv("RERANK_API_KEYS", "")
 	rerankModel := getenv("RERANK_MODEL", "rerank-english-v3.0")
+	phraseLexicon := getenv("PHRASE_LEXICON", "")
 
 	return Config{
 		HTTPPort: port, DatabaseURL: db, JWTSecret: secret,
-		EmbeddingAPIKey: embeddingKey, EmbeddingModel: embeddingModel, EmbeddingProvider: embeddingProvider, EmbeddingEnabled: embeddingEnabled,
+		EmbeddingAPIKey: embeddingKey, EmbeddingModel: embeddingModel, EmbeddingProvider: embeddingProvider, EmbeddingBaseURL: embeddingBaseURL, EmbeddingEnabled: embeddingEnabled,
 		QAModel: qaModel,
 		RerankAPIKeys: rerankKeys, RerankModel: rerankModel,
+		PhraseLexicon: phraseLexicon,
 	}
 }
 
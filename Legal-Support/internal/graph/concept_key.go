@@ -0,0 +1,29 @@
+package graph
+
+import (
+	"strings"
+	"unicode"
+
+	"golang.org/x/text/runes"
+	"golang.org/x/text/transform"
+	"golang.org/x/text/unicode/norm"
+)
+
+var dStroke = strings.NewReplacer("đ", "d", "Đ", "d", "ð", "d", "Ð", "d")
+
+// conceptKey folds a term the same way law-crawler/textnorm.py fold() does:
+// lowercase, no diacritics, punctuation turned into spaces, single spaces.
+// It must stay in sync with the name_key values written by the batch job.
+func conceptKey(s string) string {
+	// transform.Chain keeps state, so build one per call.
+	t := transform.Chain(norm.NFD, runes.Remove(runes.In(unicode.Mn)))
+	folded, _, err := transform.String(t, dStroke.Replace(s))
+	if err != nil {
+		folded = s
+	}
+	folded = strings.ToLower(folded)
+	fields := strings.FieldsFunc(folded, func(r rune) bool {
+		return !unicode.IsLetter(r) && !unicode.IsDigit(r) && r != '_'
+	})
+	return strings.Join(fields, " ")
+}
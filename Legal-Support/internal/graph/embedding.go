@@ -24,14 +24,25 @@ type OpenAIEmbeddingProvider struct {
 
 // NewOpenAIEmbeddingProvider builds a provider; returns nil if apiKey is empty.
 func NewOpenAIEmbeddingProvider(apiKey, model string) *OpenAIEmbeddingProvider {
+	return NewOpenAIEmbeddingProviderWithBaseURL(apiKey, model, "")
+}
+
+// NewOpenAIEmbeddingProviderWithBaseURL builds a provider that talks to an
+// OpenAI-compatible endpoint (e.g. the embedding stub of
+// law-crawler/scripts/bench_ingest.py); an empty baseURL means api.openai.com.
+func NewOpenAIEmbeddingProviderWithBaseURL(apiKey, model, baseURL string) *OpenAIEmbeddingProvider {
 	if apiKey == "" {
 		return nil
 	}
 	if model == "" {
 		model = "text-embedding-3-small"
 	}
+	clientConfig := openai.DefaultConfig(apiKey)
+	if baseURL != "" {
+		clientConfig.BaseURL = baseURL
+	}
 	return &OpenAIEmbeddingProvider{
-		client: openai.NewClient(apiKey),
+		client: openai.NewClientWithConfig(clientConfig),
 		model:  model,
 	}
 }
@@ -1,6 +1,7 @@
 package graph
 
 import (
+	"reflect"
 	"testing"
 )
 
@@ -73,6 +74,24 @@ func TestIngestionService_BuildDocRef(t *testing.T) {
 	}
 }
 
+func TestUncoveredTerms(t *testing.T) {
+	candidates := []QueryCandidate{
+		{Type: "subject", Name: "Mũ bảo hiểm"},
+		{Type: "subject", Name: "Xe mô tô"},
+	}
+	terms := []string{"mũ", "bảo", "phạt", "đội", "mô"}
+
+	got := uncoveredTerms(terms, candidates)
+	expected := []string{"phạt", "đội"}
+	if !reflect.DeepEqual(got, expected) {
+		t.Errorf("uncoveredTerms() = %v, want %v", got, expected)
+	}
+
+	if got := uncoveredTerms(terms, nil); !reflect.DeepEqual(got, terms) {
+		t.Errorf("uncoveredTerms() without candidates = %v, want %v", got, terms)
+	}
+}
+
 // Helper functions for tests
 func stringPtr(s string) *string {
 	return &s
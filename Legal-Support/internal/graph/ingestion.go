@@ -36,6 +36,12 @@ type UnitRequest struct {
 	Text       string  `json:"text"`
 	ParentCode *string `json:"parent_code,omitempty"`
 	OrderIndex int     `json:"order_index"`
+
+	// Materialized path below the document (e.g. "00002.00001"), depth and
+	// pre-order position, as computed by law-crawler/structure.py tree_keys
+	Path     *string `json:"path,omitempty"`
+	Depth    *int    `json:"depth,omitempty"`
+	DocOrder *int    `json:"doc_order,omitempty"`
 }
 
 // ConceptRequest represents a concept for ingestion
@@ -131,6 +137,9 @@ func (s *IngestionService) IngestLegalContent(ctx context.Context, req IngestReq
 			Code:       unitReq.Code,
 			Text:       unitReq.Text,
 			OrderIndex: unitReq.OrderIndex,
+			Path:       unitReq.Path,
+			Depth:      unitReq.Depth,
+			DocOrder:   unitReq.DocOrder,
 		}
 
 		// Handle parent relationship
@@ -0,0 +1,236 @@
+package graph
+
+import (
+	"encoding/binary"
+	"encoding/json"
+	"fmt"
+	"os"
+	"path/filepath"
+	"sort"
+	"strings"
+
+	"github.com/google/uuid"
+)
+
+const lexiconVersion = 1
+
+// PhraseLexicon is the read-only phrase automaton built by
+// law-crawler/scripts/build_phrase_lexicon.py: every folded concept name,
+// synonym and keyword and every relation name and keyword, compiled into a
+// word-level Aho-Corasick automaton. The file format is described in
+// law-crawler/phrase_lexicon.py.
+type PhraseLexicon struct {
+	tokens    map[string]uint32
+	transIdx  []uint32
+	transTok  []uint32
+	transNext []uint32
+	fail      []uint32
+	out       []uint32
+	link      []uint32
+	phrases   []lexiconPhrase
+}
+
+type lexiconPhrase struct {
+	Phrase  string         `json:"phrase"`
+	Entries []lexiconEntry `json:"entries"`
+}
+
+type lexiconEntry struct {
+	Kind  string  `json:"kind"` // "concept" or "relation"
+	ID    string  `json:"id"`
+	Name  string  `json:"name"`
+	Type  string  `json:"type"`
+	Match string  `json:"match"` // "exact", "synonym", "keyword"
+	Score float32 `json:"score"`
+}
+
+// LexiconMatch is a lexicon phrase found at tokens [Start, End) of a folded query.
+type LexiconMatch struct {
+	Start  int
+	End    int
+	Phrase string
+	index  int
+}
+
+// LoadPhraseLexicon reads a lexicon directory into memory.
+func LoadPhraseLexicon(dir string) (*PhraseLexicon, error) {
+	// The builder swaps a symlink to a versioned directory; resolve it once so
+	// every file comes from the same build.
+	dir, err := filepath.EvalSymlinks(dir)
+	if err != nil {
+		return nil, err
+	}
+
+	var meta struct {
+		Version int `json:"version"`
+	}
+	if err := readJSONFile(filepath.Join(dir, "meta.json"), &meta); err != nil {
+		return nil, err
+	}
+	if meta.Version != lexiconVersion {
+		return nil, fmt.Errorf("%s: unsupported lexicon version %d", dir, meta.Version)
+	}
+
+	blob, err := os.ReadFile(filepath.Join(dir, "tokens.bin"))
+	if err != nil {
+		return nil, err
+	}
+	offsets, err := readUint32File(filepath.Join(dir, "tokens.idx"))
+	if err != nil {
+		return nil, err
+	}
+	l := &PhraseLexicon{tokens: make(map[string]uint32, len(offsets))}
+	for i := 0; i+1 < len(offsets); i++ {
+		if offsets[i] > offsets[i+1] || int(offsets[i+1]) > len(blob) {
+			return nil, fmt.Errorf("%s: bad token offset %d", dir, i)
+		}
+		l.tokens[string(blob[offsets[i]:offsets[i+1]])] = uint32(i)
+	}
+
+	arrays := []struct {
+		name string
+		dst  *[]uint32
+	}{
+		{"trans.idx", &l.transIdx},
+		{"trans.tok", &l.transTok},
+		{"trans.next", &l.transNext},
+		{"fail.bin", &l.fail},
+		{"out.bin", &l.out},
+		{"link.bin", &l.link},
+	}
+	for _, a := range arrays {
+		values, err := readUint32File(filepath.Join(dir, a.name))
+		if err != nil {
+			return nil, err
+		}
+		*a.dst = values
+	}
+	if err := readJSONFile(filepath.Join(dir, "phrases.json"), &l.phrases); err != nil {
+		return nil, err
+	}
+
+	n := len(l.fail)
+	if n == 0 || len(l.transIdx) != n+1 || len(l.out) != n || len(l.link) != n ||
+		len(l.transTok) != len(l.transNext) || int(l.transIdx[n]) != len(l.transTok) {
+		return nil, fmt.Errorf("%s: inconsistent lexicon arrays", dir)
+	}
+	for _, o := range l.out {
+		if int(o) > len(l.phrases) {
+			return nil, fmt.Errorf("%s: phrase id %d out of range", dir, o)
+		}
+	}
+	return l, nil
+}
+
+// Len returns the number of phrases in the lexicon.
+func (l *PhraseLexicon) Len() int {
+	return len(l.phrases)
+}
+
+func (l *PhraseLexicon) next(state, token uint32) (uint32, bool) {
+	lo, hi := l.transIdx[state], l.transIdx[state+1]
+	toks := l.transTok[lo:hi]
+	i := sort.Search(len(toks), func(i int) bool { return toks[i] >= token })
+	if i < len(toks) && toks[i] == token {
+		return l.transNext[int(lo)+i], true
+	}
+	return 0, false
+}
+
+// Match returns every lexicon phrase in text, overlapping ones included,
+// in one pass over its folded tokens.
+func (l *PhraseLexicon) Match(text string) []LexiconMatch {
+	var matches []LexiconMatch
+	var state uint32
+	for i, tok := range strings.Fields(conceptKey(text)) {
+		t, ok := l.tokens[tok]
+		if !ok { // no phrase contains this token
+			state = 0
+			continue
+		}
+		nxt, found := l.next(state, t)
+		for !found && state != 0 {
+			state = l.fail[state]
+			nxt, found = l.next(state, t)
+		}
+		state = nxt // the root when nothing matched
+
+		hit := state
+		if l.out[hit] == 0 {
+			hit = l.link[hit]
+		}
+		for hit != 0 {
+			idx := int(l.out[hit]) - 1
+			phrase := l.phrases[idx].Phrase
+			n := strings.Count(phrase, " ") + 1
+			matches = append(matches, LexiconMatch{Start: i + 1 - n, End: i + 1, Phrase: phrase, index: idx})
+			hit = l.link[hit]
+		}
+	}
+	return matches
+}
+
+// Candidates returns the best entry of every concept and relation named in
+// text. Concepts come back as "subject" candidates, like the repository
+// lookups; the query engine adds the object copies.
+func (l *PhraseLexicon) Candidates(text string) []QueryCandidate {
+	best := make(map[string]QueryCandidate)
+	for _, m := range l.Match(text) {
+		for _, entry := range l.phrases[m.index].Entries {
+			id, err := uuid.Parse(entry.ID)
+			if err != nil {
+				continue
+			}
+			candidate := QueryCandidate{Name: entry.Name, Score: entry.Score, MatchType: entry.Match}
+			switch entry.Kind {
+			case "concept":
+				candidate.Type = "subject"
+				candidate.ConceptID = &id
+			case "relation":
+				candidate.Type = "relation"
+				candidate.RelationID = &id
+			default:
+				continue
+			}
+			key := entry.Kind + "_" + entry.ID
+			if existing, ok := best[key]; !ok || candidate.Score > existing.Score {
+				best[key] = candidate
+			}
+		}
+	}
+
+	candidates := make([]QueryCandidate, 0, len(best))
+	for _, c := range best {
+		candidates = append(candidates, c)
+	}
+	sort.Slice(candidates, func(i, j int) bool {
+		return candidates[i].Score > candidates[j].Score
+	})
+	return candidates
+}
+
+func readJSONFile(path string, v interface{}) error {
+	data, err := os.ReadFile(path)
+	if err != nil {
+		return err
+	}
+	if err := json.Unmarshal(data, v); err != nil {
+		return fmt.Errorf("%s: %w", path, err)
+	}
+	return nil
+}
+
+func readUint32File(path string) ([]uint32, error) {
+	data, err := os.ReadFile(path)
+	if err != nil {
+		return nil, err
+	}
+	if len(data)%4 != 0 {
+		return nil, fmt.Errorf("%s: size %d is not a multiple of 4", path, len(data))
+	}
+	values := make([]uint32, len(data)/4)
+	for i := range values {
+		values[i] = binary.LittleEndian.Uint32(data[4*i:])
+	}
+	return values, nil
+}
@@ -0,0 +1,248 @@
+package graph
+
+import (
+	"encoding/binary"
+	"encoding/json"
+	"os"
+	"path/filepath"
+	"reflect"
+	"sort"
+	"strconv"
+	"strings"
+	"testing"
+)
+
+const (
+	helmetID = "11111111-1111-1111-1111-111111111111"
+	wearID   = "22222222-2222-2222-2222-222222222222"
+)
+
+// writeTestLexicon writes phrases in the on-disk format of
+// law-crawler/phrase_lexicon.py: a token table, the trie transitions in CSR
+// form sorted by token id, failure and dictionary-suffix links, and the
+// 1-based phrase id ending at every state.
+func writeTestLexicon(t *testing.T, dir string, phrases []lexiconPhrase) {
+	t.Helper()
+
+	tokenIDs := make(map[string]uint32)
+	var tokens []string
+	children := []map[uint32]uint32{{}}
+	out := []uint32{0}
+	for p, phrase := range phrases {
+		var state uint32
+		for _, tok := range strings.Fields(phrase.Phrase) {
+			id, ok := tokenIDs[tok]
+			if !ok {
+				id = uint32(len(tokens))
+				tokenIDs[tok] = id
+				tokens = append(tokens, tok)
+			}
+			nxt, ok := children[state][id]
+			if !ok {
+				nxt = uint32(len(children))
+				children[state][id] = nxt
+				children = append(children, map[uint32]uint32{})
+				out = append(out, 0)
+			}
+			state = nxt
+		}
+		out[state] = uint32(p + 1)
+	}
+
+	n := len(children)
+	fail := make([]uint32, n)
+	link := make([]uint32, n)
+	queue := []uint32{0}
+	for len(queue) > 0 {
+		s := queue[0]
+		queue = queue[1:]
+		for tok, c := range children[s] {
+			if s != 0 {
+				f := fail[s]
+				for {
+					if nxt, ok := children[f][tok]; ok {
+						fail[c] = nxt
+						break
+					}
+					if f == 0 {
+						break
+					}
+					f = fail[f]
+				}
+			}
+			if out[fail[c]] != 0 {
+				link[c] = fail[c]
+			} else {
+				link[c] = link[fail[c]]
+			}
+			queue = append(queue, c)
+		}
+	}
+
+	transIdx := []uint32{0}
+	var transTok, transNext []uint32
+	for _, edges := range children {
+		toks := make([]uint32, 0, len(edges))
+		for tok := range edges {
+			toks = append(toks, tok)
+		}
+		sort.Slice(toks, func(i, j int) bool { return toks[i] < toks[j] })
+		for _, tok := range toks {
+			transTok = append(transTok, tok)
+			transNext = append(transNext, edges[tok])
+		}
+		transIdx = append(transIdx, uint32(len(transTok)))
+	}
+
+	var blob []byte
+	offsets := []uint32{0}
+	for _, tok := range tokens {
+		blob = append(blob, tok...)
+		offsets = append(offsets, uint32(len(blob)))
+	}
+
+	writeFile := func(name string, data []byte) {
+		if err := os.WriteFile(filepath.Join(dir, name), data, 0o644); err != nil {
+			t.Fatal(err)
+		}
+	}
+	writeUint32s := func(name string, values []uint32) {
+		data := make([]byte, 4*len(values))
+		for i, v := range values {
+			binary.LittleEndian.PutUint32(data[4*i:], v)
+		}
+		writeFile(name, data)
+	}
+	writeJSON := func(name string, v interface{}) {
+		data, err := json.Marshal(v)
+		if err != nil {
+			t.Fatal(err)
+		}
+		writeFile(name, data)
+	}
+
+	writeJSON("meta.json", map[string]int{"version": lexiconVersion})
+	writeFile("tokens.bin", blob)
+	writeUint32s("tokens.idx", offsets)
+	writeUint32s("trans.idx", transIdx)
+	writeUint32s("trans.tok", transTok)
+	writeUint32s("trans.next", transNext)
+	writeUint32s("fail.bin", fail)
+	writeUint32s("out.bin", out)
+	writeUint32s("link.bin", link)
+	writeJSON("phrases.json", phrases)
+}
+
+func loadTestLexicon(t *testing.T) *PhraseLexicon {
+	t.Helper()
+	dir := t.TempDir()
+	writeTestLexicon(t, dir, []lexiconPhrase{
+		{Phrase: "mu bao hiem", Entries: []lexiconEntry{
+			{Kind: "concept", ID: helmetID, Name: "Mũ bảo hiểm", Type: "object", Match: "exact", Score: 1},
+		}},
+		{Phrase: "bao hiem", Entries: []lexiconEntry{
+			{Kind: "concept", ID: helmetID, Name: "Mũ bảo hiểm", Type: "object", Match: "keyword", Score: 0.5},
+			{Kind: "concept", ID: "not-a-uuid", Name: "Bảo hiểm", Match: "exact", Score: 1},
+		}},
+		{Phrase: "doi", Entries: []lexiconEntry{
+			{Kind: "relation", ID: wearID, Name: "đội", Match: "exact", Score: 0.9},
+		}},
+	})
+	l, err := LoadPhraseLexicon(dir)
+	if err != nil {
+		t.Fatalf("LoadPhraseLexicon() error = %v", err)
+	}
+	return l
+}
+
+func TestPhraseLexicon_Match(t *testing.T) {
+	l := loadTestLexicon(t)
+	if l.Len() != 3 {
+		t.Fatalf("Len() = %d, want 3", l.Len())
+	}
+
+	tests := []struct {
+		text     string
+		expected []string
+	}{
+		{
+			text:     "Không đội mũ bảo hiểm bị phạt bao nhiêu?",
+			expected: []string{"doi 1-2", "mu bao hiem 2-5", "bao hiem 3-5"},
+		},
+		{
+			text:     "MŨ   BẢO-HIỂM",
+			expected: []string{"mu bao hiem 0-3", "bao hiem 1-3"},
+		},
+		{
+			text:     "mũ xe máy bảo hiểm",
+			expected: []string{"bao hiem 3-5"},
+		},
+		{
+			text:     "vượt đèn đỏ",
+			expected: nil,
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.text, func(t *testing.T) {
+			var got []string
+			for _, m := range l.Match(tt.text) {
+				got = append(got, m.Phrase+" "+strconv.Itoa(m.Start)+"-"+strconv.Itoa(m.End))
+			}
+			if !reflect.DeepEqual(got, tt.expected) {
+				t.Errorf("Match(%q) = %v, want %v", tt.text, got, tt.expected)
+			}
+		})
+	}
+}
+
+func TestPhraseLexicon_Candidates(t *testing.T) {
+	l := loadTestLexicon(t)
+
+	candidates := l.Candidates("Không đội mũ bảo hiểm bị phạt bao nhiêu?")
+	if len(candidates) != 2 {
+		t.Fatalf("Candidates() returned %d candidates, want 2: %+v", len(candidates), candidates)
+	}
+
+	helmet, wear := candidates[0], candidates[1]
+	if helmet.Type != "subject" || helmet.ConceptID == nil || helmet.ConceptID.String() != helmetID {
+		t.Errorf("first candidate = %+v, want the helmet concept as a subject", helmet)
+	}
+	if helmet.Score != 1 || helmet.MatchType != "exact" {
+		t.Errorf("helmet candidate kept score %v (%s), want the exact match", helmet.Score, helmet.MatchType)
+	}
+	if wear.Type != "relation" || wear.RelationID == nil || wear.RelationID.String() != wearID {
+		t.Errorf("second candidate = %+v, want the wear relation", wear)
+	}
+}
+
+func TestLoadPhraseLexicon_Symlink(t *testing.T) {
+	root := t.TempDir()
+	version := filepath.Join(root, "lexicon.v1")
+	if err := os.Mkdir(version, 0o755); err != nil {
+		t.Fatal(err)
+	}
+	writeTestLexicon(t, version, []lexiconPhrase{{Phrase: "doi"}})
+	if err := os.Symlink("lexicon.v1", filepath.Join(root, "lexicon")); err != nil {
+		t.Fatal(err)
+	}
+
+	l, err := LoadPhraseLexicon(filepath.Join(root, "lexicon"))
+	if err != nil {
+		t.Fatalf("LoadPhraseLexicon() through a symlink error = %v", err)
+	}
+	if l.Len() != 1 {
+		t.Errorf("Len() = %d, want 1", l.Len())
+	}
+}
+
+func TestLoadPhraseLexicon_Version(t *testing.T) {
+	dir := t.TempDir()
+	writeTestLexicon(t, dir, []lexiconPhrase{{Phrase: "doi"}})
+	if err := os.WriteFile(filepath.Join(dir, "meta.json"), []byte(`{"version": 99}`), 0o644); err != nil {
+		t.Fatal(err)
+	}
+	if _, err := LoadPhraseLexicon(dir); err == nil {
+		t.Error("LoadPhraseLexicon() accepted an unsupported version")
+	}
+}
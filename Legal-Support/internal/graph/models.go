@@ -28,6 +28,9 @@ type Unit struct {
 	Text       string     `json:"text" db:"text"`
 	ParentID   *uuid.UUID `json:"parent_id,omitempty" db:"parent_id"`
 	OrderIndex int        `json:"order_index" db:"order_index"`
+	Path       *string    `json:"path,omitempty" db:"path"`
+	Depth      *int       `json:"depth,omitempty" db:"depth"`
+	DocOrder   *int       `json:"doc_order,omitempty" db:"doc_order"`
 	CreatedAt  time.Time  `json:"created_at" db:"created_at"`
 }
 
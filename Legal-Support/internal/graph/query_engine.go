@@ -13,6 +13,7 @@ type QueryEngine struct {
 	repo       *Repository
 	qaProvider QAProvider
 	reranker   Reranker
+	lexicon    *PhraseLexicon
 }
 
 // NewQueryEngine creates a new query engine
@@ -24,6 +25,12 @@ func NewQueryEngine(repo *Repository, qa QAProvider, reranker Reranker) *QueryEn
 	}
 }
 
+// SetLexicon makes candidate generation match the query against the phrase
+// lexicon first, which needs no database query.
+func (e *QueryEngine) SetLexicon(lexicon *PhraseLexicon) {
+	e.lexicon = lexicon
+}
+
 // ProcessQuery analyzes a natural language legal query and returns relevant answers
 func (e *QueryEngine) ProcessQuery(ctx context.Context, queryText string, includeDebug bool) (*QueryResult, error) {
 	startTime := time.Now()
@@ -61,8 +68,8 @@ func (e *QueryEngine) ProcessQuery(ctx context.Context, queryText string, includ
 
 	stepStart := time.Now()
 
-	// Step 2: Find candidates for each term
-	allCandidates, err := e.findAllCandidates(ctx, terms)
+	// Step 2: Find candidates for the query variations and their terms
+	allCandidates, err := e.findAllCandidates(ctx, queries, terms)
 	if err != nil {
 		return nil, fmt.Errorf("finding candidates: %w", err)
 	}
@@ -233,37 +240,52 @@ func (e *QueryEngine) extractQueryTerms(queryText string) []string {
 	return terms
 }
 
-// findAllCandidates finds concept and relation candidates for all query terms
-func (e *QueryEngine) findAllCandidates(ctx context.Context, terms []string) ([]QueryCandidate, error) {
-	var allCandidates []QueryCandidate
+// findAllCandidates finds concept and relation candidates for the query.
+// Phrases known to the lexicon are found without touching the database; a
+// kind (concept or relation) the lexicon has nothing for goes to one batched
+// key lookup over all terms, and a kind still without candidates after that
+// gets the fuzzy per-term lookup for the terms no candidate covers yet.
+func (e *QueryEngine) findAllCandidates(ctx context.Context, queries []string, terms []string) ([]QueryCandidate, error) {
+	var found []QueryCandidate
+	if e.lexicon != nil {
+		for _, q := range queries {
+			found = append(found, e.lexicon.Candidates(q)...)
+		}
+	}
 
-	for _, term := range terms {
-		// Find concept candidates (subjects/objects)
-		conceptCandidates, err := e.repo.FindConceptCandidates(ctx, term)
+	if !hasCandidateKind(found, false) || !hasCandidateKind(found, true) {
+		batch, err := e.repo.FindCandidatesByTerms(ctx, terms)
 		if err != nil {
-			return nil, fmt.Errorf("finding concept candidates for '%s': %w", term, err)
+			// Migration 0007 (name_key) missing: keep the per-term path working.
+			fmt.Printf("Batched candidate lookup failed: %v\n", err)
 		}
+		found = append(found, batch...)
+	}
 
-		// Mark as potential subjects and objects
-		for _, candidate := range conceptCandidates {
-			// Add as subject candidate
-			subjectCandidate := candidate
-			subjectCandidate.Type = "subject"
-			allCandidates = append(allCandidates, subjectCandidate)
-
-			// Add as object candidate
-			objectCandidate := candidate
-			objectCandidate.Type = "object"
-			allCandidates = append(allCandidates, objectCandidate)
+	needConcepts, needRelations := !hasCandidateKind(found, false), !hasCandidateKind(found, true)
+	if needConcepts || needRelations {
+		fuzzy, err := e.findFuzzyCandidates(ctx, uncoveredTerms(terms, found), needConcepts, needRelations)
+		if err != nil {
+			return nil, err
 		}
+		found = append(found, fuzzy...)
+	}
 
-		// Find relation candidates
-		relationCandidates, err := e.repo.FindRelationCandidates(ctx, term)
-		if err != nil {
-			return nil, fmt.Errorf("finding relation candidates for '%s': %w", term, err)
+	var allCandidates []QueryCandidate
+	for _, candidate := range found {
+		if candidate.Type == "relation" {
+			allCandidates = append(allCandidates, candidate)
+			continue
 		}
 
-		allCandidates = append(allCandidates, relationCandidates...)
+		// Mark concepts as potential subjects and objects
+		subjectCandidate := candidate
+		subjectCandidate.Type = "subject"
+		allCandidates = append(allCandidates, subjectCandidate)
+
+		objectCandidate := candidate
+		objectCandidate.Type = "object"
+		allCandidates = append(allCandidates, objectCandidate)
 	}
 
 	// Deduplicate and sort by score
@@ -287,6 +309,70 @@ func (e *QueryEngine) findAllCandidates(ctx context.Context, terms []string) ([]
 	return dedupedCandidates, nil
 }
 
+// findFuzzyCandidates looks every term up on its own, with trigram
+// similarity for concepts and substring matches for relations.
+func (e *QueryEngine) findFuzzyCandidates(ctx context.Context, terms []string, concepts, relations bool) ([]QueryCandidate, error) {
+	var candidates []QueryCandidate
+
+	for _, term := range terms {
+		if concepts {
+			conceptCandidates, err := e.repo.FindConceptCandidates(ctx, term)
+			if err != nil {
+				return nil, fmt.Errorf("finding concept candidates for '%s': %w", term, err)
+			}
+			candidates = append(candidates, conceptCandidates...)
+		}
+
+		if relations {
+			relationCandidates, err := e.repo.FindRelationCandidates(ctx, term)
+			if err != nil {
+				return nil, fmt.Errorf("finding relation candidates for '%s': %w", term, err)
+			}
+			candidates = append(candidates, relationCandidates...)
+		}
+	}
+
+	return candidates, nil
+}
+
+// hasCandidateKind reports whether candidates holds a relation (relation=true)
+// or a concept (relation=false).
+func hasCandidateKind(candidates []QueryCandidate, relation bool) bool {
+	for _, c := range candidates {
+		if (c.Type == "relation") == relation {
+			return true
+		}
+	}
+	return false
+}
+
+// uncoveredTerms drops the terms whose folded form already occurs in the
+// folded name of a candidate, so the fuzzy lookup only runs for the rest.
+func uncoveredTerms(terms []string, candidates []QueryCandidate) []string {
+	if len(candidates) == 0 {
+		return terms
+	}
+	names := make([]string, 0, len(candidates))
+	for _, c := range candidates {
+		names = append(names, " "+conceptKey(c.Name)+" ")
+	}
+	var rest []string
+	for _, term := range terms {
+		key := " " + conceptKey(term) + " "
+		covered := false
+		for _, name := range names {
+			if strings.Contains(name, key) {
+				covered = true
+				break
+			}
+		}
+		if !covered {
+			rest = append(rest, term)
+		}
+	}
+	return rest
+}
+
 // buildQueryStars creates star patterns from candidates
 func (e *QueryEngine) buildQueryStars(candidates []QueryCandidate) []QueryStar {
 	// Group candidates by type
@@ -96,6 +96,22 @@ func (r *Repository) UpdateDocument(ctx context.Context, doc *Document) error {
 		Scan(&doc.UpdatedAt)
 }
 
+// FillDocumentMetadata sets number, year and authority where they are still
+// NULL, and the type where it is still the importer's generic fallbackType,
+// leaving values set earlier (or by hand) alone.
+func (r *Repository) FillDocumentMetadata(ctx context.Context, id uuid.UUID, meta DocumentRequest, fallbackType string) error {
+	query := `
+		UPDATE documents
+		SET number = COALESCE(number, $2), year = COALESCE(year, $3), authority = COALESCE(authority, $4),
+		    type = CASE WHEN type = $6 AND $5 <> '' THEN $5 ELSE type END, updated_at = NOW()
+		WHERE id = $1
+		  AND (number IS NULL AND $2::text IS NOT NULL OR year IS NULL AND $3::int IS NOT NULL
+		       OR authority IS NULL AND $4::text IS NOT NULL OR type = $6 AND $5 <> $6)`
+
+	_, err := r.db.Exec(ctx, query, id, meta.Number, meta.Year, meta.Authority, meta.Type, fallbackType)
+	return err
+}
+
 func (r *Repository) GetDocument(ctx context.Context, id uuid.UUID) (*Document, error) {
 	query := `
 		SELECT id, title, type, number, year, authority, status, created_at, updated_at
@@ -207,6 +223,18 @@ func (r *Repository) SearchDocuments(ctx context.Context, search string, filter
 
 // Units
 func (r *Repository) CreateUnit(ctx context.Context, unit *Unit) error {
+	if unit.Path != nil {
+		// Path is relative to the document; units.path (migration 0014) is rooted at d<document id>
+		query := `
+		INSERT INTO units (document_id, level, code, text, parent_id, order_index, path, depth, doc_order)
+		VALUES ($1, $2, $3, $4, $5, $6, text2ltree('d' || replace($1::text, '-', '') || '.' || $7), $8, $9)
+		RETURNING id, created_at`
+
+		return r.db.QueryRow(ctx, query, unit.DocumentID, unit.Level, unit.Code,
+			unit.Text, unit.ParentID, unit.OrderIndex, *unit.Path, unit.Depth, unit.DocOrder).
+			Scan(&unit.ID, &unit.CreatedAt)
+	}
+
 	query := `
 		INSERT INTO units (document_id, level, code, text, parent_id, order_index)
 		VALUES ($1, $2, $3, $4, $5, $6)
@@ -699,6 +727,13 @@ func (r *Repository) FindConceptCandidates(ctx context.Context, term string) ([]
 		return nil, nil
 	}
 
+	// Exact folded-key hits (name_key / folded aliases in keywords) are index
+	// lookups; only fall back to the trigram scan when there is none. An error
+	// here means migration 0007 is not applied yet, so keep the old path.
+	if exact, err := r.findConceptsByKey(ctx, conceptKey(term)); err == nil && len(exact) > 0 {
+		return exact, nil
+	}
+
 	query := `
 		SELECT id, name, concept_type, 
 		       CASE 
@@ -745,6 +780,121 @@ func (r *Repository) FindConceptCandidates(ctx context.Context, term string) ([]
 	return candidates, rows.Err()
 }
 
+// findConceptsByKey looks concepts up by the precomputed name_key and the
+// folded aliases that normalize_concepts.py stores in keywords.
+func (r *Repository) findConceptsByKey(ctx context.Context, key string) ([]QueryCandidate, error) {
+	if key == "" {
+		return nil, nil
+	}
+
+	query := `
+		SELECT id, name, concept_type,
+		       CASE WHEN name_key = $1 THEN 1.0 ELSE 0.9 END::float4 AS score,
+		       CASE WHEN name_key = $1 THEN 'exact' ELSE 'synonym' END AS match_type
+		FROM concepts
+		WHERE name_key = $1 OR keywords @> ARRAY[$1]::text[]
+		ORDER BY score DESC, length(name) ASC, name
+		LIMIT 20`
+
+	rows, err := r.db.Query(ctx, query, key)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	var candidates []QueryCandidate
+	for rows.Next() {
+		var id uuid.UUID
+		var name, conceptType, matchType string
+		var score float32
+
+		if err := rows.Scan(&id, &name, &conceptType, &score, &matchType); err != nil {
+			return nil, err
+		}
+
+		candidates = append(candidates, QueryCandidate{
+			Type:      "subject", // will be set by caller
+			ConceptID: &id,
+			Name:      name,
+			Score:     score,
+			MatchType: matchType,
+		})
+	}
+
+	return candidates, rows.Err()
+}
+
+// FindCandidatesByTerms looks all query terms up at once: concepts by folded
+// name_key / keywords, relations by name or keyword. It is the one-query
+// replacement for calling FindConceptCandidates and FindRelationCandidates
+// per term; concepts come back as "subject" candidates.
+func (r *Repository) FindCandidatesByTerms(ctx context.Context, terms []string) ([]QueryCandidate, error) {
+	keySet := make(map[string]bool)
+	lowerSet := make(map[string]bool)
+	var keys, lowered []string
+	for _, term := range terms {
+		if key := conceptKey(term); key != "" && !keySet[key] {
+			keySet[key] = true
+			keys = append(keys, key)
+		}
+		if low := strings.ToLower(strings.TrimSpace(term)); low != "" && !lowerSet[low] {
+			lowerSet[low] = true
+			lowered = append(lowered, low)
+		}
+	}
+	if len(keys) == 0 {
+		return nil, nil
+	}
+
+	query := `
+		SELECT 'concept' AS kind, id, name,
+		       CASE WHEN name_key = ANY($1) THEN 1.0 ELSE 0.9 END::float4 AS score,
+		       CASE WHEN name_key = ANY($1) THEN 'exact' ELSE 'synonym' END AS match_type
+		FROM concepts
+		WHERE name_key = ANY($1) OR keywords && $1::text[]
+		UNION ALL
+		SELECT 'relation', id, name,
+		       CASE WHEN LOWER(name) = ANY($2) OR REPLACE(LOWER(name), '_', ' ') = ANY($1) THEN 1.0
+		            ELSE 0.9 END::float4,
+		       CASE WHEN LOWER(name) = ANY($2) OR REPLACE(LOWER(name), '_', ' ') = ANY($1) THEN 'exact'
+		            ELSE 'keyword' END
+		FROM relations
+		WHERE LOWER(name) = ANY($2)
+		   OR REPLACE(LOWER(name), '_', ' ') = ANY($1)
+		   OR EXISTS (SELECT 1 FROM unnest(keywords) k WHERE LOWER(k) = ANY($2))
+		ORDER BY score DESC, name
+		LIMIT 200`
+
+	rows, err := r.db.Query(ctx, query, keys, lowered)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	var candidates []QueryCandidate
+	for rows.Next() {
+		var id uuid.UUID
+		var kind, name, matchType string
+		var score float32
+
+		if err := rows.Scan(&kind, &id, &name, &score, &matchType); err != nil {
+			return nil, err
+		}
+
+		candidate := QueryCandidate{Name: name, Score: score, MatchType: matchType}
+		if kind == "relation" {
+			candidate.Type = "relation"
+			candidate.RelationID = &id
+		} else {
+			candidate.Type = "subject" // will be set by caller
+			candidate.ConceptID = &id
+		}
+		candidates = append(candidates, candidate)
+	}
+
+	return candidates, rows.Err()
+}
+
 // Relations
 func (r *Repository) CreateRelation(ctx context.Context, relation *Relation) error {
 	query := `
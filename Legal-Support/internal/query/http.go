@@ -3,6 +3,7 @@ package query
 import (
 	"encoding/json"
 	"fmt"
+	"log"
 	"net/http"
 	"strings"
 
@@ -28,6 +29,14 @@ func NewHTTP(db *pgxpool.Pool, embedder graph.EmbeddingProvider, embeddingModel
 	repo := graph.NewRepository(db)
 	reranker := graph.NewCohereReranker(cfg.RerankAPIKeys, cfg.RerankModel)
 	engine := graph.NewQueryEngine(repo, qa, reranker)
+	if cfg.PhraseLexicon != "" {
+		if lexicon, err := graph.LoadPhraseLexicon(cfg.PhraseLexicon); err != nil {
+			log.Printf("phrase lexicon disabled: %v", err)
+		} else {
+			engine.SetLexicon(lexicon)
+			log.Printf("phrase lexicon: %d phrases from %s", lexicon.Len(), cfg.PhraseLexicon)
+		}
+	}
 	ingest := graph.NewIngestionService(repo, embedder, embeddingModel)
 
 	return &HTTP{
@@ -0,0 +1,152 @@
+"""
+Async fetcher and content-addressed store for Pháp điển attachments.
+
+PDFile links (biểu mẫu, phụ lục) point at the government site. ``fetch_all()``
+downloads them concurrently with aiohttp, at most ``per_host`` requests per
+host, streaming each body to disk while hashing it. Files are stored by the
+SHA-256 of their content:
+
+  <root>/ab/cd/abcd...ef.docx
+
+so the same form linked from several articles (or under several URLs) is
+kept once. A previous fetch's ETag / Last-Modified is sent back as
+If-None-Match / If-Modified-Since, and a 304 keeps the stored file.
+
+  store = ContentStore("attachments")
+  async for result in fetch_all(jobs, store):   # jobs: (url, previous result or None)
+      ...
+"""
+
+import asyncio
+import hashlib
+import mimetypes
+import os
+import uuid
+from urllib.parse import unquote, urlsplit
+
+CHUNK_SIZE = 1 << 16
+
+DONE = "done"
+NOT_MODIFIED = "not_modified"
+ERROR = "error"
+
+
+def url_hash(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def extension(url, content_type=None):
+    """File extension from the URL path, else from the Content-Type."""
+    ext = os.path.splitext(unquote(urlsplit(url).path))[1].lower()
+    if 1 < len(ext) <= 6 and ext[1:].isalnum():
+        return ext
+    if content_type:
+        return mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
+    return ""
+
+
+class ContentStore:
+    """Files named by the SHA-256 of their content under ``root``."""
+
+    def __init__(self, root):
+        self.root = root
+        self._tmp = os.path.join(root, "tmp")
+        os.makedirs(self._tmp, exist_ok=True)
+
+    def relative_path(self, checksum, ext=""):
+        return os.path.join(checksum[:2], checksum[2:4], checksum + ext)
+
+    def temp_file(self):
+        return os.path.join(self._tmp, uuid.uuid4().hex + ".part")
+
+    def commit(self, tmp_path, checksum, ext=""):
+        """Move a finished download into place; returns its path relative to root."""
+        rel = self.relative_path(checksum, ext)
+        dest = os.path.join(self.root, rel)
+        if os.path.exists(dest):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            os.replace(tmp_path, dest)
+        return rel
+
+    def exists(self, rel):
+        return bool(rel) and os.path.exists(os.path.join(self.root, rel))
+
+
+async def fetch_one(session, store, url, previous=None, timeout=60):
+    """Download one URL; returns a result dict (see DONE / NOT_MODIFIED / ERROR)."""
+    import aiohttp
+
+    result = {"url": url, "url_hash": url_hash(url)}
+    headers = {}
+    # Revalidate only when the stored copy is still there.
+    if previous and previous.get("status") in (DONE, NOT_MODIFIED) and store.exists(previous.get("path")):
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+    tmp_path = None
+    try:
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            if resp.status == 304 and headers:
+                for key in ("path", "size", "checksum", "etag", "last_modified"):
+                    result[key] = previous.get(key)
+                result["status"] = NOT_MODIFIED
+                return result
+            if resp.status != 200:
+                result.update(status=ERROR, error=f"HTTP {resp.status}")
+                return result
+
+            digest = hashlib.sha256()
+            size = 0
+            tmp_path = store.temp_file()
+            with open(tmp_path, "wb") as f:
+                async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            checksum = digest.hexdigest()
+            path = store.commit(tmp_path, checksum, extension(url, resp.headers.get("Content-Type")))
+            tmp_path = None
+            result.update(
+                status=DONE, path=path, size=size, checksum=checksum,
+                etag=resp.headers.get("ETag"), last_modified=resp.headers.get("Last-Modified"),
+            )
+            return result
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+        result.update(status=ERROR, error=str(e) or type(e).__name__)
+        return result
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+async def fetch_all(jobs, store, concurrency=16, per_host=4, timeout=60, headers=None):
+    """Yield one result per ``(url, previous)`` job, in completion order."""
+    import aiohttp
+
+    # Like the VBQPPL crawler, skip certificate checks: the government sites'
+    # chains often fail verification.
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host, ssl=False)
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        # The connector queues requests beyond the limits; the semaphore keeps
+        # the number of open files and pending tasks bounded as well.
+        gate = asyncio.Semaphore(concurrency)
+
+        async def run(url, previous):
+            async with gate:
+                return await fetch_one(session, store, url, previous, timeout)
+
+        pending = set()
+        for url, previous in jobs:
+            pending.add(asyncio.ensure_future(run(url, previous)))
+            if len(pending) >= concurrency * 4:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
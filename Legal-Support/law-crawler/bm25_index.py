@@ -0,0 +1,182 @@
+"""
+Compact on-disk BM25 inverted index for offline lexical search.
+
+An index is a directory of flat little-endian arrays that are memory-mapped
+on open, so a cold start only reads ``meta.json`` and the pages a query
+actually touches:
+
+  meta.json     n_docs, avg_len, k1, b, bigrams
+  terms.bin     folded terms, UTF-8, concatenated in byte order
+  terms.idx     uint64[n_terms + 1]  byte offsets into terms.bin
+  postings.idx  uint64[n_terms + 1]  offsets into postings.doc / postings.w
+  postings.doc  uint32[n_postings]   document ordinals, ascending per term
+  postings.w    float32[n_postings]  precomputed BM25 weight (idf * tf part)
+  docs.bin      document ids, UTF-8, concatenated
+  docs.idx      uint64[n_docs + 1]   byte offsets into docs.bin
+
+Tokens are accent folded (textnorm.tokens). Vietnamese words are mostly two
+or three syllables ("giao thông", "người điều khiển"), so with ``bigrams``
+adjacent syllable pairs are indexed as extra terms, which ranks phrase
+matches above scattered syllables.
+
+  index = build_index(rows, "bm25-index/units")   # rows: (doc id, text)
+  BM25Index("bm25-index/units").search("vượt đèn đỏ", k=10)
+"""
+
+import json
+import math
+import os
+from array import array
+
+import numpy as np
+
+from textnorm import tokens
+
+FORMAT_VERSION = 1
+
+
+def terms_of(text, bigrams=True):
+    words = tokens(text)
+    if bigrams:
+        return words + [a + " " + b for a, b in zip(words, words[1:])]
+    return words
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def build_index(rows, path, k1=1.2, b=0.75, bigrams=True):
+    """Build an index from ``(doc_id, text)`` rows; returns the meta dict."""
+    postings = {}  # term -> (array of doc ordinals, array of term frequencies)
+    lengths = array("I")
+    doc_bytes = bytearray()
+    doc_offsets = array("Q", [0])
+
+    for ordinal, (doc_id, text) in enumerate(rows):
+        terms = terms_of(text or "", bigrams)
+        lengths.append(len(terms))
+        doc_bytes += str(doc_id).encode("utf-8")
+        doc_offsets.append(len(doc_bytes))
+
+        counts = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = (array("I"), array("H"))
+            entry[0].append(ordinal)
+            entry[1].append(min(tf, 65535))
+
+    n_docs = len(lengths)
+    lengths_np = np.frombuffer(lengths, dtype=np.uint32).astype(np.float32) if n_docs else np.zeros(0, np.float32)
+    avg_len = float(lengths_np.mean()) if n_docs else 0.0
+    norm = k1 * (1.0 - b + b * lengths_np / max(avg_len, 1.0))
+
+    os.makedirs(path, exist_ok=True)
+    term_bytes = bytearray()
+    term_offsets = array("Q", [0])
+    posting_offsets = array("Q", [0])
+    with open(os.path.join(path, "postings.doc"), "wb") as f_doc, \
+            open(os.path.join(path, "postings.w"), "wb") as f_w:
+        for term in sorted(postings, key=lambda t: t.encode("utf-8")):
+            docs, tfs = postings.pop(term)
+            docs_np = np.frombuffer(docs, dtype=np.uint32)
+            tf = np.frombuffer(tfs, dtype=np.uint16).astype(np.float32)
+            idf = math.log1p((n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            weights = (idf * tf * (k1 + 1.0) / (tf + norm[docs_np])).astype("<f4")
+            f_doc.write(docs_np.astype("<u4").tobytes())
+            f_w.write(weights.tobytes())
+
+            term_bytes += term.encode("utf-8")
+            term_offsets.append(len(term_bytes))
+            posting_offsets.append(posting_offsets[-1] + len(docs))
+
+    _write(os.path.join(path, "terms.bin"), bytes(term_bytes))
+    _write(os.path.join(path, "terms.idx"), np.frombuffer(term_offsets, dtype=np.uint64).astype("<u8").tobytes())
+    _write(os.path.join(path, "postings.idx"), np.frombuffer(posting_offsets, dtype=np.uint64).astype("<u8").tobytes())
+    _write(os.path.join(path, "docs.bin"), bytes(doc_bytes))
+    _write(os.path.join(path, "docs.idx"), np.frombuffer(doc_offsets, dtype=np.uint64).astype("<u8").tobytes())
+
+    meta = {
+        "version": FORMAT_VERSION, "n_docs": n_docs, "n_terms": len(term_offsets) - 1,
+        "n_postings": int(posting_offsets[-1]), "avg_len": avg_len, "k1": k1, "b": b, "bigrams": bigrams,
+    }
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def _map(path, dtype):
+    # np.memmap refuses empty files; an empty index still has to open.
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+class BM25Index:
+    """Read-only, memory-mapped view of an index directory."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported index version {self.meta.get('version')}")
+        self.path = path
+        self.bigrams = self.meta["bigrams"]
+        self.n_docs = self.meta["n_docs"]
+        self._terms = _map(os.path.join(path, "terms.bin"), np.uint8)
+        self._term_idx = _map(os.path.join(path, "terms.idx"), "<u8")
+        self._post_idx = _map(os.path.join(path, "postings.idx"), "<u8")
+        self._post_doc = _map(os.path.join(path, "postings.doc"), "<u4")
+        self._post_w = _map(os.path.join(path, "postings.w"), "<f4")
+        self._docs = _map(os.path.join(path, "docs.bin"), np.uint8)
+        self._doc_idx = _map(os.path.join(path, "docs.idx"), "<u8")
+
+    def _term_at(self, i):
+        return self._terms[self._term_idx[i]:self._term_idx[i + 1]].tobytes()
+
+    def find_term(self, term):
+        """Index of ``term`` in the sorted term table, or -1."""
+        needle = term.encode("utf-8")
+        lo, hi = 0, len(self._term_idx) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term_at(mid) < needle:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._term_idx) - 1 and self._term_at(lo) == needle:
+            return lo
+        return -1
+
+    def postings(self, term):
+        """(doc ordinals, weights) of a folded term; empty arrays when unknown."""
+        i = self.find_term(term)
+        if i < 0:
+            return self._post_doc[:0], self._post_w[:0]
+        start, end = int(self._post_idx[i]), int(self._post_idx[i + 1])
+        return self._post_doc[start:end], self._post_w[start:end]
+
+    def doc_id(self, ordinal):
+        return self._docs[self._doc_idx[ordinal]:self._doc_idx[ordinal + 1]].tobytes().decode("utf-8")
+
+    def search(self, query, k=10):
+        """Top-k ``(doc_id, score)`` for a free-text query."""
+        if not self.n_docs:
+            return []
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        touched = False
+        for term in dict.fromkeys(terms_of(query, self.bigrams)):
+            docs, weights = self.postings(term)
+            if len(docs):
+                scores[docs] += weights  # ordinals are unique within a posting list
+                touched = True
+        if not touched:
+            return []
+        k = min(k, self.n_docs)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.doc_id(int(i)), float(scores[i])) for i in top if scores[i] > 0]
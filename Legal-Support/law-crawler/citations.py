@@ -0,0 +1,81 @@
+"""
+Extraction of cross-references ("khoản 2 Điều 5", "Điều 12 Luật số 23/2008/QH12",
+"Điều 3 Nghị định này") from Vietnamese legal text.
+
+``find_references()`` only looks at the text; resolving a reference to a unit
+is done by ``scripts/resolve_citations.py`` against an index of the corpus.
+"""
+
+import re
+from collections import namedtuple
+
+from textnorm import fold, strip_accents
+
+# Scope of the document a reference points to.
+SCOPE_THIS_ARTICLE = "this_article"  # "khoản 2 Điều này"
+SCOPE_SAME_DOC = "same_doc"          # "Điều 5", "Điều 5 của Luật này"
+SCOPE_NUMBER = "number"              # "Điều 5 Nghị định số 100/2019/NĐ-CP"
+SCOPE_TITLE = "title"                # "Điều 12 Luật Giao thông đường bộ"
+
+Reference = namedtuple("Reference", "start end article clause point scope doc_number doc_title")
+
+DOC_KINDS = (
+    "bộ luật", "luật", "pháp lệnh", "nghị định", "nghị quyết",
+    "thông tư liên tịch", "thông tư", "quyết định", "chỉ thị", "hiến pháp",
+)
+
+DOC_NUMBER_RE = re.compile(r"\b(\d{1,4}/(?:\d{4}/)?[A-ZĐ][A-ZĐ0-9]*(?:-[A-ZĐ0-9]+)*)", re.IGNORECASE)
+
+_REFERENCE_RE = re.compile(
+    r"(?:điểm\s+(?P<point>[a-zđ])\s+)?"
+    r"(?:khoản\s+(?P<clause>\d{1,3})\s+)?"
+    # "Điều 1.1.LQ.12." is a codified (pháp điển) heading, not a reference to Điều 1.
+    r"[đð]iều\s+(?:(?P<this>này)\b|(?P<article>\d{1,4}[a-zđ]?)\b(?![.\w]\w))"
+    r"(?:\s*,?\s*(?:của\s+)?(?P<kind>" + "|".join(DOC_KINDS) + r")\b(?P<rest>(?:(?!\s(?:và|hoặc|điểm|khoản|[đð]iều)\s)[^,.;:()\n]){0,160}))?",
+    re.IGNORECASE,
+)
+_THIS_DOC_RE = re.compile(r"^\s*(?:này|nay)\b", re.IGNORECASE)
+_TITLE_STOP_RE = re.compile(r"\s(?:số|năm|ngày|đã|được|quy định|thì|về việc)(?:\s|$)", re.IGNORECASE)
+
+MAX_TITLE_TOKENS = 16
+
+
+def normalize_doc_number(number):
+    """Comparable form of a document number: "100/2019/nđ-cp" -> "100/2019/ND-CP"."""
+    return re.sub(r"\s+", "", strip_accents(number)).upper()
+
+
+def find_references(text):
+    """Yield every cross-reference found in ``text``."""
+    for m in _REFERENCE_RE.finditer(text):
+        clause = m.group("clause")
+        point = m.group("point").lower() if m.group("point") else None
+        if m.group("this"):
+            if not clause:
+                continue  # bare "Điều này" names the current article itself
+            yield Reference(m.start(), m.end(), None, clause, point, SCOPE_THIS_ARTICLE, None, None)
+            continue
+
+        article = m.group("article").lower()
+        scope, number, title = SCOPE_SAME_DOC, None, None
+        kind = m.group("kind")
+        if kind:
+            rest = m.group("rest") or ""
+            number_match = DOC_NUMBER_RE.search(rest)
+            if _THIS_DOC_RE.match(rest):
+                scope = SCOPE_SAME_DOC
+            elif number_match:
+                scope, number = SCOPE_NUMBER, normalize_doc_number(number_match.group(1))
+            else:
+                stop = _TITLE_STOP_RE.search(rest)
+                words = fold(kind + " " + (rest[:stop.start()] if stop else rest))
+                if words:
+                    scope, title = SCOPE_TITLE, " ".join(words.split()[:MAX_TITLE_TOKENS])
+        yield Reference(m.start(), m.end(), article, clause, point, scope, number, title)
+
+
+def title_candidates(folded_title):
+    """Longest-first token prefixes of a folded title, for matching against known titles."""
+    words = folded_title.split()
+    for n in range(len(words), 1, -1):
+        yield " ".join(words[:n])
@@ -0,0 +1,95 @@
+"""
+Discovery of further VBQPPL documents from a fetched page.
+
+A vbpl.vn full-text page links other documents by ``ItemID=<n>`` and cites
+them in the text as "Luật số 23/2008/QH12", "Nghị định số 100/2019/NĐ-CP".
+``find_citations()`` returns the ItemIDs a page points to, resolving numbered
+citations through the numbers seen in link texts so far.
+
+``ItemIdBitset`` is the seen-set of the discovery crawl: ItemIDs are dense
+integers (a few hundred thousand), so one bit per possible id is far smaller
+than a Python set of strings (~100 KB for 800k ids).
+"""
+
+import re
+
+from citations import DOC_NUMBER_RE, normalize_doc_number
+
+ITEM_ID_RE = re.compile(r"ItemID=(\d+)", re.IGNORECASE)
+NUMBERED_CITATION_RE = re.compile(
+    r"\b(?:bộ luật|luật|pháp lệnh|nghị định|nghị quyết|thông tư liên tịch|thông tư|quyết định)"
+    r"\s+số\s+" + DOC_NUMBER_RE.pattern,
+    re.IGNORECASE,
+)
+
+
+class ItemIdBitset:
+    """Growable bitset over non-negative integer ids."""
+
+    __slots__ = ("_bits", "_count")
+
+    def __init__(self, capacity=1 << 18):
+        self._bits = bytearray((capacity + 7) // 8)
+        self._count = 0
+
+    def __contains__(self, item_id):
+        i = int(item_id)
+        return i >> 3 < len(self._bits) and bool(self._bits[i >> 3] & (1 << (i & 7)))
+
+    def add(self, item_id):
+        """Set the bit; returns True when the id was not seen before."""
+        i = int(item_id)
+        if i >> 3 >= len(self._bits):
+            self._bits.extend(bytes(max((i >> 3) + 1 - len(self._bits), len(self._bits))))
+        mask = 1 << (i & 7)
+        if self._bits[i >> 3] & mask:
+            return False
+        self._bits[i >> 3] |= mask
+        self._count += 1
+        return True
+
+    def update(self, item_ids):
+        for item_id in item_ids:
+            self.add(item_id)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        return len(self._bits)
+
+
+def find_links(html):
+    """(ItemID, anchor text) for every document link in the page HTML."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for a in soup.find_all("a", href=True):
+        m = ITEM_ID_RE.search(a["href"])
+        if m:
+            yield m.group(1), a.get_text(" ", strip=True)
+
+
+def find_citations(html, text, number_index):
+    """Return ({ItemID: times cited}, unresolved numbers) for one page.
+
+    ``number_index`` maps normalized document numbers to ItemIDs and is
+    extended with every numbered link text found on the page.
+    """
+    counts = {}
+    for item_id, anchor in find_links(html):
+        counts[item_id] = counts.get(item_id, 0) + 1
+        m = DOC_NUMBER_RE.search(anchor)
+        if m:
+            number_index.setdefault(normalize_doc_number(m.group(1)), item_id)
+
+    unresolved = set()
+    for m in NUMBERED_CITATION_RE.finditer(text):
+        number = normalize_doc_number(m.group(1))
+        item_id = number_index.get(number)
+        if item_id is None:
+            unresolved.add(number)
+        else:
+            counts[item_id] = counts.get(item_id, 0) + 1
+    return counts, unresolved
@@ -0,0 +1,96 @@
+"""
+Backfill vbpl.noidung_text and the header metadata for documents crawled before those stages.
+
+Usage:
+  python backfill_text.py [--workers 4 --chunk-size 50 --force --meta]
+
+Each worker owns its own DB connection and processes one chunk of ids at a
+time: read the raw HTML, normalize it once and write the marked paragraph list
+back, together with the metadata parsed from its header (vbpl_meta.py). Only
+rows with an empty noidung_text are picked up unless --force is set; --meta
+also picks up rows that have text but no metadata yet, which are parsed from
+the stored text without touching the HTML.
+"""
+
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from sqlalchemy import bindparam, text
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from db import mysql_engine
+from vbpl_meta import META_COLUMNS, ensure_meta_columns, extract_metadata
+from vbpl_text import normalize_html, ensure_text_column
+
+_engine = None
+
+
+def _init_worker():
+    global _engine
+    _engine = mysql_engine(pool_size=1, max_overflow=0)
+
+
+def _process_chunk(task):
+    ids, force = task
+    # The HTML is only read for rows that need (re-)normalizing.
+    select = text(
+        "SELECT id, CASE WHEN :force OR noidung_text IS NULL OR noidung_text = '' THEN noidung END, noidung_text "
+        "FROM vbpl WHERE id IN :ids"
+    ).bindparams(bindparam("ids", expanding=True))
+    update = text("UPDATE vbpl SET noidung_text = :txt, "
+                  + ", ".join(f"{column} = :{column}" for column in META_COLUMNS) + " WHERE id = :id")
+    with _engine.connect() as conn:
+        rows = conn.execute(select, {"ids": ids, "force": force}).fetchall()
+        updates = []
+        for item_id, html, stored in rows:
+            txt = normalize_html(html or "") if html is not None else stored
+            updates.append({"id": item_id, "txt": txt, **extract_metadata(txt)})
+        if updates:
+            conn.execute(update, updates)
+            conn.commit()
+    return len(updates)
+
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill normalized VBQPPL text")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Documents per worker task")
+    parser.add_argument("--force", action="store_true", help="Re-normalize rows that already have text")
+    parser.add_argument("--meta", action="store_true", help="Also parse the metadata of rows that have text but none")
+    args = parser.parse_args(argv)
+
+    engine = mysql_engine()
+    with engine.connect() as conn:
+        ensure_text_column(conn)
+        ensure_meta_columns(conn)
+        query = "SELECT id FROM vbpl"
+        if not args.force:
+            query += " WHERE noidung_text IS NULL OR noidung_text = ''"
+            if args.meta:
+                query += " OR (" + " AND ".join(f"{column} IS NULL" for column in META_COLUMNS) + ")"
+        ids = [row[0] for row in conn.execute(text(query))]
+    engine.dispose()
+
+    print(f"Documents to normalize: {len(ids)}")
+    if not ids:
+        return
+
+    start = time.time()
+    total = 0
+    with Pool(processes=args.workers, initializer=_init_worker) as pool:
+        for done in pool.imap_unordered(_process_chunk, ((chunk, args.force) for chunk in chunked(ids, args.chunk_size))):
+            total += done
+            print(f"  normalized {total}/{len(ids)}")
+    print(f"Done in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Batch embedding providers for the offline jobs.
+
+Providers take a list of texts and return one vector per text, in order. They
+mirror the ones the API uses (internal/graph/embedding.go) and read the same
+env: EMBEDDING_PROVIDER, EMBEDDING_MODEL, EMBEDDING_API_KEY. ``local`` is a
+deterministic hashed bag-of-words stand-in that needs no network; it is only
+meant for tests and local runs, its vectors are not comparable with real ones.
+"""
+
+import hashlib
+import math
+import os
+
+from textnorm import tokens
+
+DIMENSIONS = 768  # unit_embeddings.embedding is vector(768)
+
+
+class LocalProvider:
+    """Feature-hashed unigrams + bigrams, L2-normalized. Same text -> same vector."""
+
+    name = "local"
+
+    def __init__(self, model="local-hash-768", dimensions=DIMENSIONS):
+        self.model = model
+        self.dimensions = dimensions
+
+    def _vector(self, text):
+        vec = [0.0] * self.dimensions
+        words = tokens(text)
+        for feature in words + [a + " " + b for a, b in zip(words, words[1:])]:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            idx = int.from_bytes(digest[:4], "little") % self.dimensions
+            vec[idx] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_batch(self, texts):
+        return [self._vector(t) for t in texts]
+
+
+class OpenAIProvider:
+    name = "openai"
+    url = "https://api.openai.com/v1/embeddings"
+
+    def __init__(self, model, api_key, dimensions=DIMENSIONS, timeout=60):
+        if not api_key:
+            raise ValueError("EMBEDDING_API_KEY is required for the openai provider")
+        self.model = model or "text-embedding-3-small"
+        self.api_key = api_key
+        self.dimensions = dimensions
+        self.timeout = timeout
+
+    def embed_batch(self, texts):
+        import requests
+
+        resp = requests.post(
+            self.url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={"model": self.model, "input": texts, "dimensions": self.dimensions},
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
+        data = sorted(resp.json()["data"], key=lambda d: d["index"])
+        return [d["embedding"] for d in data]
+
+
+class GeminiProvider:
+    name = "gemini"
+
+    def __init__(self, model, api_key, dimensions=DIMENSIONS, timeout=60):
+        if not api_key:
+            raise ValueError("EMBEDDING_API_KEY is required for the gemini provider")
+        self.model = model or "embedding-001"
+        self.api_key = api_key
+        self.dimensions = dimensions
+        self.timeout = timeout
+
+    def embed_batch(self, texts):
+        import requests
+
+        url = (f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}"
+               f":batchEmbedContents?key={self.api_key}")
+        body = {"requests": [{
+            "model": f"models/{self.model}",
+            "content": {"parts": [{"text": t}]},
+            "outputDimensionality": self.dimensions,
+        } for t in texts]}
+        resp = requests.post(url, json=body, timeout=self.timeout)
+        resp.raise_for_status()
+        return [e["values"] for e in resp.json()["embeddings"]]
+
+
+PROVIDERS = {"local": LocalProvider, "openai": OpenAIProvider, "gemini": GeminiProvider}
+
+
+def get_provider(name=None, model=None, api_key=None, dimensions=DIMENSIONS):
+    """Build a provider from arguments, falling back to the API's env variables."""
+    name = (name or os.getenv("EMBEDDING_PROVIDER", "openai")).lower()
+    model = model or os.getenv("EMBEDDING_MODEL", "")
+    api_key = api_key or os.getenv("EMBEDDING_API_KEY", "")
+    if name not in PROVIDERS:
+        raise ValueError(f"unknown embedding provider {name!r} (expected one of {', '.join(PROVIDERS)})")
+    if name == "local":
+        return LocalProvider(model or "local-hash-768", dimensions)
+    return PROVIDERS[name](model, api_key, dimensions)
+
+
+def vector_literal(vec):
+    """pgvector text form, usable in COPY and as a %s::vector parameter."""
+    return "[" + ",".join(f"{v:.7g}" for v in vec) + "]"
@@ -0,0 +1,429 @@
+"""
+Shared crawl frontier: a work queue of VBQPPL ItemIDs that several crawler
+processes or machines can drain without fetching the same document twice.
+
+Every item moves through
+
+  pending --claim--> leased --complete--> done
+                        |--fail-------> pending (attempts < max_attempts)
+                        |--fail-------> dead    (attempts exhausted / permanent)
+                        `--lease expires--> pending / dead
+
+A crawler claims a small batch, holds a lease on it for ``lease_seconds`` and
+completes or fails each item. When a process dies its leases simply expire
+and the items are handed to the next claimer, so a restarted crawl resumes
+where it stopped; items already ``done`` are never handed out again.
+
+Two backends share the interface:
+
+  MySQLFrontier   lease table ``crawl_frontier`` next to ``vbpl``; claims use
+                  SELECT ... FOR UPDATE SKIP LOCKED (MySQL 8), so concurrent
+                  claimers never get the same rows.
+  RedisFrontier   sorted sets + Lua scripts, for a local Redis (redis-py).
+
+``open_frontier()`` picks one from CRAWL_FRONTIER (mysql | redis).
+"""
+
+import os
+import socket
+import time
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+STATES = (PENDING, LEASED, DONE, DEAD)
+
+DEFAULT_LEASE_SECONDS = 600
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+def worker_id():
+    """Lease owner name: host and pid, unique per crawler process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class MySQLFrontier:
+    table = "crawl_frontier"
+
+    def __init__(self, engine, lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.engine = engine
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def ensure_table(self):
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    item_id BIGINT NOT NULL PRIMARY KEY,
+                    state VARCHAR(16) NOT NULL DEFAULT 'pending',
+                    priority INT NOT NULL DEFAULT 0,
+                    attempts INT NOT NULL DEFAULT 0,
+                    depth INT NOT NULL DEFAULT 0,
+                    lease_owner VARCHAR(128) NULL,
+                    lease_until DATETIME NULL,
+                    last_error TEXT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    KEY idx_crawl_frontier_claim (state, priority, item_id),
+                    KEY idx_crawl_frontier_lease (state, lease_until)
+                ) DEFAULT CHARSET=utf8mb4
+            """))
+            has_depth = conn.execute(text(
+                "SELECT COUNT(*) FROM information_schema.columns "
+                "WHERE table_schema = DATABASE() AND table_name = :t AND column_name = 'depth'"
+            ), {"t": self.table}).scalar()
+            if not has_depth:
+                conn.execute(text(f"ALTER TABLE {self.table} ADD COLUMN depth INT NOT NULL DEFAULT 0"))
+
+    def add(self, item_ids, priority=0):
+        """Queue ids that are not known yet; returns how many were new."""
+        from sqlalchemy import text
+
+        rows = [{"id": int(i), "priority": priority} for i in item_ids]
+        if not rows:
+            return 0
+        with self.engine.begin() as conn:
+            result = conn.execute(text(f"INSERT IGNORE INTO {self.table} (item_id, priority) VALUES (:id, :priority)"),
+                                  rows)
+            return result.rowcount
+
+    def cite(self, counts, depth):
+        """Discovery: queue cited ids at ``depth`` and raise the priority of
+        ids still waiting by the number of citations; returns how many were new."""
+        from sqlalchemy import bindparam, text
+
+        rows = [{"id": int(i), "n": n, "depth": depth} for i, n in counts.items()]
+        if not rows:
+            return 0
+        with self.engine.begin() as conn:
+            # Existing ids only get their priority / depth bumped. The rowcount of
+            # INSERT ... ON DUPLICATE KEY UPDATE depends on whether a row changed
+            # (and on CLIENT_FOUND_ROWS), so new rows are counted by INSERT IGNORE.
+            existing = {item_id for (item_id,) in conn.execute(
+                text(f"SELECT item_id FROM {self.table} WHERE item_id IN :ids")
+                .bindparams(bindparam("ids", expanding=True)), {"ids": [r["id"] for r in rows]})}
+            new_rows = [r for r in rows if r["id"] not in existing]
+            old_rows = [r for r in rows if r["id"] in existing]
+            if old_rows:
+                conn.execute(text(f"""
+                    UPDATE {self.table}
+                    SET priority = IF(state = 'pending', priority + :n, priority), depth = LEAST(depth, :depth)
+                    WHERE item_id = :id
+                """), old_rows)
+            if not new_rows:
+                return 0
+            result = conn.execute(text(f"INSERT IGNORE INTO {self.table} (item_id, priority, depth) "
+                                       "VALUES (:id, :n, :depth)"), new_rows)
+            return result.rowcount
+
+    def depths(self, item_ids):
+        from sqlalchemy import bindparam, text
+
+        ids = [int(i) for i in item_ids]
+        if not ids:
+            return {}
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(f"SELECT item_id, depth FROM {self.table} WHERE item_id IN :ids")
+                                .bindparams(bindparam("ids", expanding=True)), {"ids": ids})
+            return {str(item_id): depth for item_id, depth in rows}
+
+    def ids_in_state(self, state):
+        from sqlalchemy import text
+
+        with self.engine.connect() as conn:
+            for (item_id,) in conn.execute(text(f"SELECT item_id FROM {self.table} WHERE state = :s"),
+                                           {"s": state}):
+                yield str(item_id)
+
+    def mark_done(self, item_ids):
+        """Record ids that are already stored (e.g. rows in vbpl) as done."""
+        from sqlalchemy import text
+
+        rows = [{"id": int(i)} for i in item_ids]
+        if not rows:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+                INSERT INTO {self.table} (item_id, state) VALUES (:id, 'done')
+                ON DUPLICATE KEY UPDATE state = 'done', lease_owner = NULL, lease_until = NULL
+            """), rows)
+
+    def claim(self, owner, limit=10):
+        """Lease up to ``limit`` items for ``owner``, highest priority first."""
+        from sqlalchemy import bindparam, text
+
+        with self.engine.begin() as conn:
+            # Expired leases whose attempts are used up go to the dead-letter state.
+            conn.execute(text(f"""
+                UPDATE {self.table} SET state = 'dead', lease_owner = NULL,
+                       last_error = COALESCE(last_error, 'lease expired')
+                WHERE state = 'leased' AND lease_until < NOW() AND attempts >= :max_attempts
+            """), {"max_attempts": self.max_attempts})
+            ids = [row[0] for row in conn.execute(text(f"""
+                SELECT item_id FROM {self.table}
+                WHERE state = 'pending' OR (state = 'leased' AND lease_until < NOW())
+                ORDER BY priority DESC, item_id
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            """), {"limit": limit})]
+            if ids:
+                conn.execute(text(f"""
+                    UPDATE {self.table}
+                    SET state = 'leased', lease_owner = :owner, attempts = attempts + 1,
+                        lease_until = NOW() + INTERVAL :seconds SECOND
+                    WHERE item_id IN :ids
+                """).bindparams(bindparam("ids", expanding=True)),
+                    {"owner": owner, "seconds": self.lease_seconds, "ids": ids})
+        return [str(i) for i in ids]
+
+    def complete(self, owner, item_id):
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+                UPDATE {self.table} SET state = 'done', lease_owner = NULL, lease_until = NULL, last_error = NULL
+                WHERE item_id = :id AND lease_owner = :owner
+            """), {"id": int(item_id), "owner": owner})
+
+    def fail(self, owner, item_id, error, permanent=False):
+        """Give an item back for retry, or dead-letter it when attempts are used up."""
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+                UPDATE {self.table}
+                SET state = CASE WHEN :permanent OR attempts >= :max_attempts THEN 'dead' ELSE 'pending' END,
+                    lease_owner = NULL, lease_until = NULL, last_error = :error
+                WHERE item_id = :id AND lease_owner = :owner
+            """), {"id": int(item_id), "owner": owner, "error": str(error)[:2000],
+                   "permanent": bool(permanent), "max_attempts": self.max_attempts})
+
+    def requeue_dead(self):
+        """Move dead-lettered items back to pending with a fresh attempt budget."""
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            return conn.execute(text(f"UPDATE {self.table} SET state = 'pending', attempts = 0 "
+                                     f"WHERE state = 'dead'")).rowcount
+
+    def stats(self):
+        from sqlalchemy import text
+
+        with self.engine.connect() as conn:
+            counts = dict(conn.execute(text(f"SELECT state, COUNT(*) FROM {self.table} GROUP BY state")).fetchall())
+        return {state: counts.get(state, 0) for state in STATES}
+
+
+# KEYS: pending, leased, attempts, priority, owners, dead
+# ARGV: now, lease_until, limit, max_attempts, owner
+_REDIS_CLAIM = """
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])) do
+  redis.call('ZREM', KEYS[2], id)
+  redis.call('HDEL', KEYS[5], id)
+  if tonumber(redis.call('HGET', KEYS[3], id) or '0') >= tonumber(ARGV[4]) then
+    redis.call('SADD', KEYS[6], id)
+  else
+    redis.call('ZADD', KEYS[1], -tonumber(redis.call('HGET', KEYS[4], id) or '0'), id)
+  end
+end
+local ids = redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[3]) - 1)
+for _, id in ipairs(ids) do
+  redis.call('ZREM', KEYS[1], id)
+  redis.call('ZADD', KEYS[2], ARGV[2], id)
+  redis.call('HINCRBY', KEYS[3], id, 1)
+  redis.call('HSET', KEYS[5], id, ARGV[5])
+end
+return ids
+"""
+
+# KEYS: pending, leased, done, dead, priority, depth ; ARGV: priority, ids...
+_REDIS_ADD = """
+local added = 0
+for i = 2, #ARGV do
+  local id = ARGV[i]
+  if redis.call('SISMEMBER', KEYS[3], id) == 0 and redis.call('SISMEMBER', KEYS[4], id) == 0
+     and not redis.call('ZSCORE', KEYS[2], id) then
+    if redis.call('ZADD', KEYS[1], 'NX', -tonumber(ARGV[1]), id) == 1 then
+      redis.call('HSET', KEYS[5], id, ARGV[1])
+      redis.call('HSETNX', KEYS[6], id, 0)
+      added = added + 1
+    end
+  end
+end
+return added
+"""
+
+# KEYS: pending, leased, done, dead, priority, depth ; ARGV: depth, id, n, id, n, ...
+_REDIS_CITE = """
+local added = 0
+for i = 2, #ARGV, 2 do
+  local id, n = ARGV[i], tonumber(ARGV[i + 1])
+  if redis.call('SISMEMBER', KEYS[3], id) == 0 and redis.call('SISMEMBER', KEYS[4], id) == 0 then
+    if redis.call('ZSCORE', KEYS[1], id) then
+      redis.call('ZINCRBY', KEYS[1], -n, id)
+      redis.call('HINCRBY', KEYS[5], id, n)
+    elseif not redis.call('ZSCORE', KEYS[2], id) then
+      redis.call('ZADD', KEYS[1], -n, id)
+      redis.call('HSET', KEYS[5], id, n)
+      added = added + 1
+    end
+    local d = redis.call('HGET', KEYS[6], id)
+    if not d or tonumber(d) > tonumber(ARGV[1]) then
+      redis.call('HSET', KEYS[6], id, ARGV[1])
+    end
+  end
+end
+return added
+"""
+
+# KEYS: pending, leased, attempts, owners, dead, errors, priority
+# ARGV: id, owner, max_attempts, permanent, error
+_REDIS_FAIL = """
+if redis.call('HGET', KEYS[4], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[4], ARGV[1])
+redis.call('HSET', KEYS[6], ARGV[1], ARGV[5])
+if ARGV[4] == '1' or tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0') >= tonumber(ARGV[3]) then
+  redis.call('SADD', KEYS[5], ARGV[1])
+else
+  redis.call('ZADD', KEYS[1], -tonumber(redis.call('HGET', KEYS[7], ARGV[1]) or '0'), ARGV[1])
+end
+return 1
+"""
+
+# KEYS: pending, attempts, dead, priority
+_REDIS_REQUEUE = """
+local ids = redis.call('SMEMBERS', KEYS[3])
+for _, id in ipairs(ids) do
+  redis.call('SREM', KEYS[3], id)
+  redis.call('HDEL', KEYS[2], id)
+  redis.call('ZADD', KEYS[1], -tonumber(redis.call('HGET', KEYS[4], id) or '0'), id)
+end
+return #ids
+"""
+
+
+class RedisFrontier:
+    """Same contract as MySQLFrontier on top of Redis; claims and failures are Lua scripts."""
+
+    def __init__(self, client, prefix="crawl", lease_seconds=DEFAULT_LEASE_SECONDS,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.r = client
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.keys = {name: f"{prefix}:{name}" for name in
+                     ("pending", "leased", "attempts", "priority", "depth", "owners", "done", "dead", "errors")}
+        self._claim = client.register_script(_REDIS_CLAIM)
+        self._add = client.register_script(_REDIS_ADD)
+        self._fail = client.register_script(_REDIS_FAIL)
+        self._cite = client.register_script(_REDIS_CITE)
+        self._requeue = client.register_script(_REDIS_REQUEUE)
+
+    def ensure_table(self):
+        pass
+
+    def add(self, item_ids, priority=0):
+        k = self.keys
+        ids = [str(i) for i in item_ids]
+        if not ids:
+            return 0
+        return int(self._add(keys=[k["pending"], k["leased"], k["done"], k["dead"], k["priority"], k["depth"]],
+                             args=[priority, *ids]))
+
+    def cite(self, counts, depth):
+        k = self.keys
+        if not counts:
+            return 0
+        args = [depth]
+        for item_id, n in counts.items():
+            args += [str(item_id), n]
+        return int(self._cite(keys=[k["pending"], k["leased"], k["done"], k["dead"], k["priority"], k["depth"]],
+                              args=args))
+
+    def depths(self, item_ids):
+        ids = [str(i) for i in item_ids]
+        if not ids:
+            return {}
+        values = self.r.hmget(self.keys["depth"], ids)
+        return {i: int(v) if v is not None else 0 for i, v in zip(ids, values)}
+
+    def ids_in_state(self, state):
+        k = self.keys
+        if state in (DONE, DEAD):
+            members = self.r.sscan_iter(k[state])
+        else:
+            members = (m for m, _ in self.r.zscan_iter(k[state]))
+        for m in members:
+            yield m.decode() if isinstance(m, bytes) else str(m)
+
+    def mark_done(self, item_ids):
+        ids = [str(i) for i in item_ids]
+        if not ids:
+            return
+        k = self.keys
+        pipe = self.r.pipeline()
+        pipe.zrem(k["pending"], *ids)
+        pipe.zrem(k["leased"], *ids)
+        pipe.srem(k["dead"], *ids)
+        pipe.hdel(k["owners"], *ids)
+        pipe.hdel(k["attempts"], *ids)
+        pipe.hdel(k["errors"], *ids)
+        pipe.sadd(k["done"], *ids)
+        pipe.execute()
+
+    def claim(self, owner, limit=10):
+        k = self.keys
+        now = time.time()
+        ids = self._claim(keys=[k["pending"], k["leased"], k["attempts"], k["priority"], k["owners"], k["dead"]],
+                          args=[now, now + self.lease_seconds, limit, self.max_attempts, owner])
+        return [i.decode() if isinstance(i, bytes) else str(i) for i in ids]
+
+    def complete(self, owner, item_id):
+        k = self.keys
+        item_id = str(item_id)
+        owned = self.r.hget(k["owners"], item_id)
+        if owned is None or (owned.decode() if isinstance(owned, bytes) else owned) != owner:
+            return
+        pipe = self.r.pipeline()
+        pipe.zrem(k["leased"], item_id)
+        pipe.hdel(k["owners"], item_id)
+        pipe.hdel(k["errors"], item_id)
+        pipe.sadd(k["done"], item_id)
+        pipe.execute()
+
+    def fail(self, owner, item_id, error, permanent=False):
+        k = self.keys
+        self._fail(keys=[k["pending"], k["leased"], k["attempts"], k["owners"], k["dead"], k["errors"], k["priority"]],
+                   args=[str(item_id), owner, self.max_attempts, "1" if permanent else "0", str(error)[:2000]])
+
+    def requeue_dead(self):
+        """Move dead-lettered items back to pending with a fresh attempt budget;
+        priority and depth are kept, as in MySQLFrontier."""
+        k = self.keys
+        return int(self._requeue(keys=[k["pending"], k["attempts"], k["dead"], k["priority"]]))
+
+    def stats(self):
+        k = self.keys
+        return {
+            PENDING: self.r.zcard(k["pending"]),
+            LEASED: self.r.zcard(k["leased"]),
+            DONE: self.r.scard(k["done"]),
+            DEAD: self.r.scard(k["dead"]),
+        }
+
+
+def open_frontier(engine=None, backend=None, **kwargs):
+    """Frontier from CRAWL_FRONTIER (mysql, default) or REDIS_URL for redis."""
+    backend = (backend or os.getenv("CRAWL_FRONTIER", "mysql")).lower()
+    if backend == "redis":
+        import redis
+
+        client = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        return RedisFrontier(client, prefix=os.getenv("CRAWL_FRONTIER_PREFIX", "crawl"), **kwargs)
+    if backend == "mysql":
+        if engine is None:
+            raise ValueError("the mysql frontier needs a SQLAlchemy engine")
+        return MySQLFrontier(engine, **kwargs)
+    raise ValueError(f"unknown CRAWL_FRONTIER backend {backend!r}")
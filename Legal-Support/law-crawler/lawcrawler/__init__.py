@@ -0,0 +1,7 @@
+"""
+One command line for the crawler stages and batch jobs: ``python -m lawcrawler <command>``.
+
+Importing this package (or any stage module) has no side effects; see
+``lawcrawler.cli`` for the commands and ``lawcrawler.cli.run`` to call a
+stage from Python.
+"""
@@ -0,0 +1,9 @@
+import sys
+
+from lawcrawler.cli import main
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(1)
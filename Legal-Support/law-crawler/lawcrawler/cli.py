@@ -0,0 +1,105 @@
+"""
+Dispatch ``python -m lawcrawler <command> [args]`` to the stage that implements it.
+
+Usage (from law-crawler/):
+  python -m lawcrawler                     list the commands
+  python -m lawcrawler <command> --help    options of one command
+
+Every stage is a module with ``main(argv=None)`` and no work at import.
+Only the module of the command being run is imported, so pandas,
+SQLAlchemy, bs4 and the database drivers are loaded by the stages that
+need them and listing the commands or a quick ``check`` starts fast.
+Modules in document-crawler/ (not a package) are loaded from their path.
+
+From Python, e.g. a pipeline runner: ``run(["split", "--batch", "50"])``.
+"""
+
+import difflib
+import importlib
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# command -> (module, or .py path relative to law-crawler/; one-line help)
+COMMANDS = {
+    # Pháp điển
+    "convert-phapdien": ("scripts.convert_js_to_json", "Turn jsonData.js into the phap-dien/ JSON files"),
+    "crawl-phapdien": ("main", "Load phap-dien/ into the PD* MySQL tables (drops them first)"),
+    "download-attachments": ("scripts.download_attachments", "Download PDFile attachments"),
+    # VBQPPL
+    "crawl-vbpl": ("document-crawler/main.py", "Crawl vbpl.vn full texts through the shared frontier"),
+    "backfill-text": ("document-crawler/backfill_text.py", "Normalize vbpl.noidung_text of older rows"),
+    "split": ("document-crawler/split_document.py", "Split VBQPPL into vb_chimuc structure rows"),
+    # Legal-Supporter (PostgreSQL)
+    "export": ("scripts.export_legalsupporter", "Send the Pháp điển tables to the ingest API"),
+    "extract-triples": ("scripts.extract_triples", "Extract actor/action/penalty triples from units"),
+    "build-lexicon": ("scripts.build_phrase_lexicon", "Build/update the concept and relation phrase lexicon"),
+    "resolve-citations": ("scripts.resolve_citations", "Resolve cross references into citations"),
+    "normalize-concepts": ("scripts.normalize_concepts", "Fold concept names and merge duplicates"),
+    "score-triples": ("scripts.score_triples", "Score triples by TF-IDF"),
+    "dedupe-texts": ("scripts.dedupe_texts", "Link units to canonical texts by content hash"),
+    "backfill-embeddings": ("scripts.backfill_embeddings", "Embed units without an embedding"),
+    "compact-embeddings": ("scripts.compact_embeddings", "Fill and index compact (halfvec) embedding copies"),
+    "tune-vector-index": ("scripts.tune_vector_index", "Rebuild the embedding ANN index sized to the data"),
+    "backfill-unit-paths": ("scripts.backfill_unit_paths", "Fill units.path/depth/doc_order"),
+    "build-bm25": ("scripts.build_bm25_index", "Build the offline BM25 index"),
+    "eval-retrieval": ("scripts.eval_retrieval", "Recall@k, MRR, nDCG and latency on a labelled question set"),
+    "bench-ingest": ("scripts.bench_ingest", "Units/s and latency of the ingest API on synthetic documents"),
+    # Checks and snapshots
+    "check": ("scripts.check_data", "Row counts in MySQL and Postgres"),
+    "parity": ("scripts.check_parity", "Compare MySQL and Postgres unit by unit"),
+    "db-perf": ("scripts.check_db_perf", "EXPLAIN the API queries and advise indexes"),
+    "snapshot": ("scripts.snapshot_corpus", "Parquet export/import of the MySQL corpus"),
+    "tree-memory": ("scripts.tree_memory", "Peak RSS of the jdAllTree node list: dicts vs NodeStore"),
+}
+
+
+def load(command):
+    """Import the module implementing ``command``."""
+    target = COMMANDS[command][0]
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    if not target.endswith(".py"):
+        return importlib.import_module(target)
+
+    name = "lawcrawler.stage_" + command.replace("-", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, target))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # process pools pickle worker functions by module name
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(argv):
+    """Run one command in this process, e.g. ``run(["check", "--mysql-only"])``."""
+    command, args = argv[0], list(argv[1:])
+    if command not in COMMANDS:
+        raise ValueError(f"unknown command: {command}")
+    return load(command).main(args)
+
+
+def print_commands():
+    print("usage: python -m lawcrawler <command> [options]\n")
+    print("commands:")
+    for command, (_, help_text) in COMMANDS.items():
+        print(f"  {command:<22} {help_text}")
+    print("\n'python -m lawcrawler <command> --help' shows the options of a command.")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print_commands()
+        return
+    command = argv[0]
+    if command not in COMMANDS:
+        close = difflib.get_close_matches(command, COMMANDS, n=1)
+        hint = f" (did you mean {close[0]}?)" if close else ""
+        print(f"lawcrawler: unknown command {command!r}{hint}", file=sys.stderr)
+        sys.exit(2)
+    sys.argv[0] = f"lawcrawler {command}"  # argparse usage lines of the stage
+    run(argv)
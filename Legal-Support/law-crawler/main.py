@@ -1,4 +1,17 @@
 """
+Load the extracted Pháp điển (phap-dien/) into the PD* MySQL tables.
+
+Usage (from law-crawler/):
+  python -m lawcrawler crawl-phapdien [--data phap-dien] [--checkpoint <demuc file>] [--keep-tables]
+
+Config via env:
+  MYSQL_* (see db.py)
+
+By default every PD* table is dropped and recreated first (a full reload);
+--keep-tables appends to the existing tables instead, e.g. together with
+--checkpoint to resume from the đề mục file a previous run stopped at.
+Nothing happens at import, so the stages below can be reused on their own.
+
   Copyright (C) 2023 tghuy
 
   This file is part of VN-Law-Advisor.
@@ -17,200 +30,234 @@
   along with VN-Law-Advisor.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from models.models import *
-from bs4 import BeautifulSoup
-from helper import *
-import os
+import argparse
 import json
+import os
+import sys
 import uuid
 
-# CREATE-DROP Tất cả dữ liệu
-db.execute_sql('SET FOREIGN_KEY_CHECKS=0;')
-db.drop_tables([PDMucLienQuan ,PDTable, PDFile , PDDieu, PDChuong, PDDeMuc, PDChuDe])
-db.execute_sql('SET FOREIGN_KEY_CHECKS=1;')
-db.create_tables([PDMucLienQuan ,PDTable, PDFile, PDDieu, PDChuong , PDDeMuc, PDChuDe])
-
-checkpoint = None
-
-# Đọc Chủ đề
-print("Load Chủ Đề Từ File ...")
-with open("./phap-dien/chude.json", "r", encoding="utf-8") as chude_file:
-    chudes = json.load(chude_file)
-chude_file.close()
-
-print("Insert tất cả chủ đề...")
-try:
-    with db.atomic():
-        PDChuDe.bulk_create([PDChuDe(ten=chude["Text"], stt=chude["STT"], id=chude["Value"]) for chude in chudes])
-    print("Inserted tất cả chủ đề pháp điển!")
-except:
-    pass
-
-# Đọc Đề mục
-print("Load Đề Mục Từ File ...")
-with open("./phap-dien/demuc.json", "r", encoding="utf-8") as demuc_file:
-    demucs = json.load(demuc_file)
-demuc_file.close()
-
-# Map demuc_id -> chude_id
-demuc_to_chude = {d["Value"]: d["ChuDe"] for d in demucs}
-
-print("Insert tất cả chủ đề...")
-try:
-    with db.atomic():
-        PDDeMuc.bulk_create(
-            [PDDeMuc(ten=demuc["Text"], stt=demuc["STT"], id=demuc["Value"], chude_id=demuc["ChuDe"]) for demuc in
-             demucs])
-except:
-    pass
-print("Inserted tất cả đề mục pháp điển!")
-
-print("Load Tree Nodes Từ File ...")
-with open("./phap-dien/treeNode.json", "r", encoding="utf-8") as tree_nodes_file:
-    tree_nodes = json.load(tree_nodes_file)
-tree_nodes_file.close()
-
-print("Insert tất cả nodes...")
-demuc_directory = os.fsencode("./phap-dien/demuc")
-dieus_lienquan = []
-
-count = 0
-if checkpoint:
-    isSkipping = True
-else:
-    isSkipping = False
-for file in os.listdir(demuc_directory):
-    file_name = os.fsdecode(file)
-    demuc_id_val = file_name.split(".")[0]
-    current_chude_id = demuc_to_chude.get(demuc_id_val)
-    with open("./phap-dien/demuc/" + file_name, "r", encoding="utf-8") as demuc_file:
-        count +=1
+from peewee import IntegrityError
+
+from db import db
+from helper import convert_roman_to_num, extract_input
+from models.models import PDChuDe, PDChuong, PDDeMuc, PDDieu, PDFile, PDMucLienQuan, PDTable
+from phapdien_tree import NodeStore
+
+PD_TABLES = [PDMucLienQuan, PDTable, PDFile, PDDieu, PDChuong, PDDeMuc, PDChuDe]
+
+
+def reset_tables():
+    """CREATE-DROP tất cả dữ liệu."""
+    db.execute_sql('SET FOREIGN_KEY_CHECKS=0;')
+    db.drop_tables(PD_TABLES)
+    db.execute_sql('SET FOREIGN_KEY_CHECKS=1;')
+    db.create_tables(PD_TABLES)
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_chudes(data_dir):
+    # Đọc Chủ đề
+    print("Load Chủ Đề Từ File ...")
+    chudes = read_json(os.path.join(data_dir, "chude.json"))
+
+    print("Insert tất cả chủ đề...")
+    try:
+        with db.atomic():
+            PDChuDe.bulk_create([PDChuDe(ten=chude["Text"], stt=chude["STT"], id=chude["Value"]) for chude in chudes])
+        print("Inserted tất cả chủ đề pháp điển!")
+    except:
+        pass
+
+
+def load_demucs(data_dir):
+    """Insert the đề mục; returns {demuc_id: chude_id}."""
+    # Đọc Đề mục
+    print("Load Đề Mục Từ File ...")
+    demucs = read_json(os.path.join(data_dir, "demuc.json"))
+
+    print("Insert tất cả đề mục...")
+    try:
+        with db.atomic():
+            PDDeMuc.bulk_create(
+                [PDDeMuc(ten=demuc["Text"], stt=demuc["STT"], id=demuc["Value"], chude_id=demuc["ChuDe"]) for demuc in
+                 demucs])
+    except:
+        pass
+    print("Inserted tất cả đề mục pháp điển!")
+    # Map demuc_id -> chude_id
+    return {d["Value"]: d["ChuDe"] for d in demucs}
+
+
+def is_chuong(node):
+    return node.ten.startswith("Chương ")
+
+
+def insert_chuongs(demuc_nodes, demuc_id):
+    """Insert the chapters of a đề mục; a fake one is created when it has none."""
+    demuc_chuong = [node for node in demuc_nodes if is_chuong(node)]
+    chuongs_data = []
+    for chuong in demuc_chuong:
+        mapc = chuong.mapc
+        stt = convert_roman_to_num(chuong.chimuc)
+        chuong_data = PDChuong(ten=chuong.ten,
+                               mapc=mapc, chimuc=chuong.chimuc,
+                               stt=stt,
+                               demuc_id=chuong.demuc_id)
+        try:
+            PDChuong.create(ten=chuong.ten,
+                            mapc=mapc, chimuc=chuong.chimuc,
+                            stt=stt,
+                            demuc_id=chuong.demuc_id)
+        except:
+            continue
+        chuongs_data.append(chuong_data)
+
+    # Insert chương
+    print(f'Insert {len(demuc_chuong)} chương của đề mục {demuc_id}')
+    # Tạo một chương giả nếu không có chương
+    if len(chuongs_data) == 0:
+        fake_mapc = str(uuid.uuid4())
+        chuong_data = PDChuong(ten="",
+                               mapc=fake_mapc, chimuc="0",
+                               stt=0,
+                               demuc_id=demuc_id)
+        try:
+            PDChuong.create(ten="", mapc=fake_mapc, chimuc="0", stt=0, demuc_id=demuc_id)
+        except Exception as e:
+            print(f"Error creating fake chapter: {e}")
+
+        chuongs_data.append(chuong_data)
+    return demuc_chuong, chuongs_data
+
+
+def insert_dieus(demuc_html, demuc_dieus, chuongs_data, chude_id, dieus_lienquan):
+    stt = 0
+    for dieu in demuc_dieus:
+        mapc = dieu.mapc
+        # Default to the first chapter; with several, the one whose MAPC prefixes the article's
+        chuong_id = chuongs_data[0].mapc
+        if len(chuongs_data) > 1:
+            for chuong in chuongs_data:
+                if mapc.startswith(chuong.mapc):
+                    chuong_id = chuong.mapc
+                    break
+
+        dieu_html = demuc_html.select(f'a[name="{mapc}"]')[0]
+        ten = dieu_html.nextSibling
+        ghi_chu_html = dieu_html.parent.nextSibling
+        vbqppl = ghi_chu_html.text if ghi_chu_html else None
+        vbqppl_link = ghi_chu_html.select("a")[0]["href"] if ghi_chu_html.select("a") else None
+        noidung_html = dieu_html.parent.find_next("p", {"class": "pNoiDung"})
+        noidung = ""
+        tables = []
+        for content in noidung_html.contents:
+            if content.name == "table":
+                tables.append(str(content))
+                continue
+            noidung += str(content.text.strip()) + "\n"
+
+        try:
+            PDDieu.create(ten=ten, mapc=mapc, chimuc=dieu.chimuc, stt=stt,
+                          noidung=noidung, vbqppl=vbqppl, vbqppl_link=vbqppl_link,
+                          demuc_id=dieu.demuc_id, chuong_id=chuong_id,
+                          chude_id=chude_id)
+        except IntegrityError as e:
+            if e.args[0] != 1062:  # Duplicate entry
+                print(f"Error inserting dieu {mapc}: {e}")
+            continue
+        except Exception as e:
+            print(f"Error inserting dieu {mapc}: {e}")
+            continue
+        for table in tables:
+            PDTable.create(dieu_id=mapc, html=table)
+
+        element = noidung_html.nextSibling
+        # Lấy link các file, biếu mẫu nếu có đính kèm
+        while element and element.name == "a":
+            link = element["href"]
+            try:
+                PDFile.create(dieu_id=mapc, link=link, path="")
+            except:
+                print("Lỗi insert file " + link)
+            element = element.nextSibling
+
+        # Lấy các điều có liên quan, nếu có:
+        if element and element.name == "p" and element["class"] and element["class"][0] == "pChiDan":
+            lienquans_html = element.select("a")
+            for lienquan_html in lienquans_html:
+                if not "onclick" in lienquan_html.attrs or lienquan_html["onclick"] == "":
+                    continue
+                mapc_lienquan = extract_input(lienquan_html["onclick"]).replace("'", "")
+                dieus_lienquan.append({"dieu_id1": mapc, "dieu_id2": mapc_lienquan})
+
+        stt += 1
+
+
+def load_nodes(data_dir, demuc_to_chude, checkpoint=None):
+    """Insert chương/điều (with tables, files and related links) from every đề mục file."""
+    from bs4 import BeautifulSoup
+
+    print("Load Tree Nodes Từ File ...")
+    tree_nodes = NodeStore.load(os.path.join(data_dir, "treeNode.json"))
+    print(f"{len(tree_nodes)} nodes, {tree_nodes.nbytes / 1e6:.1f} MB")
+
+    print("Insert tất cả nodes...")
+    demuc_directory = os.path.join(data_dir, "demuc")
+    dieus_lienquan = []
+    is_skipping = bool(checkpoint)
+    for file_name in os.listdir(demuc_directory):
         if file_name == checkpoint:
-            isSkipping = False
-        if isSkipping:
+            is_skipping = False
+        if is_skipping:
             continue
-        demuc_html = demuc_file.read()
-        demuc_html = BeautifulSoup(demuc_html, "html.parser")
-        demuc_nodes = [node for node in tree_nodes if node["DeMucID"] == file_name.split(".")[0]]
+        demuc_id = file_name.split(".")[0]
+        with open(os.path.join(demuc_directory, file_name), "r", encoding="utf-8") as demuc_file:
+            demuc_html = BeautifulSoup(demuc_file.read(), "html.parser")
+        demuc_nodes = tree_nodes.nodes_of(demuc_id)
         if len(demuc_nodes) == 0:
             print("Không tìm thấy node cho đề mục: " + file_name)
-            demuc_file.close()
             continue
-        demuc_chuong = [node for node in demuc_nodes if node["TEN"].startswith("Chương ")]
-        chuongs_data = []
-        for chuong in demuc_chuong:
-            mapc = chuong["MAPC"]
-            stt = convert_roman_to_num(chuong["ChiMuc"])
-            chuong_data = PDChuong(ten=chuong["TEN"],
-                                   mapc=mapc, chimuc=chuong["ChiMuc"],
-                                   stt = stt,
-                                   demuc_id=chuong["DeMucID"])
-            try:
-                PDChuong.create(ten=chuong["TEN"],
-                                mapc=mapc, chimuc=chuong["ChiMuc"],
-                                stt=stt,
-                                demuc_id=chuong["DeMucID"])
-            except:
-                continue
-            chuongs_data.append(chuong_data)
-
-        # Insert chương
-        print(f'Insert {len(demuc_chuong)} chương của đề mục {file_name}')
-        # Tạo một chương giả nếu không có chương
-        if len(chuongs_data) == 0:
-            fake_mapc = str(uuid.uuid4())
-            chuong_data = PDChuong(ten="",
-                                   mapc= fake_mapc, chimuc="0",
-                                   stt=0,
-                                   demuc_id=file_name.split(".")[0])
-            try:
-                PDChuong.create(ten="", mapc=fake_mapc, chimuc="0", stt=0, demuc_id=file_name.split(".")[0])
-            except Exception as e:
-                print(f"Error creating fake chapter: {e}")
-            
-            chuongs_data.append(chuong_data)
+        demuc_chuong, chuongs_data = insert_chuongs(demuc_nodes, demuc_id)
 
-        demuc_dieus = [node for node in demuc_nodes if node not in demuc_chuong]
+        demuc_dieus = [node for node in demuc_nodes if not is_chuong(node)]
         print(f'Đề mục {file_name} có {len(demuc_chuong)} chương và {len(demuc_dieus)} điều')
-        stt = 0
-        for dieu in demuc_dieus:
-            # Initialize with default or first chapter if available
-            if len(chuongs_data) > 0:
-                dieu["ChuongID"] = chuongs_data[0].mapc
-            
-            if len(chuongs_data) == 1:
-                # Thêm chương giả
-                dieu["ChuongID"] = chuongs_data[0].mapc
-            else:
-                for chuong in chuongs_data:
-                    if dieu["MAPC"].startswith(chuong.mapc):
-                        dieu["ChuongID"] = chuong.mapc
-                        break
-
-            mapc = dieu["MAPC"]
-            dieu_html = demuc_html.select(f'a[name="{mapc}"]')[0]
-            ten = dieu_html.nextSibling
-            ghi_chu_html = dieu_html.parent.nextSibling
-            vbqppl = ghi_chu_html.text if ghi_chu_html else None
-            vbqppl_link = ghi_chu_html.select("a")[0]["href"] if ghi_chu_html.select("a") else None
-            # print(ten, vbqppl, vbqppl_link)
-            noidung_html = dieu_html.parent.find_next("p", {"class": "pNoiDung"})
-            noidung = ""
-            tables = []
-            for content in noidung_html.contents:
-                if content.name == "table":
-                    tables.append(str(content))
-                    continue
-                noidung += str(content.text.strip()) + "\n"
+        insert_dieus(demuc_html, demuc_dieus, chuongs_data, demuc_to_chude.get(demuc_id), dieus_lienquan)
 
-            try:
-                PDDieu.create(ten=ten, mapc=mapc, chimuc=dieu["ChiMuc"], stt=stt,
-                              noidung=noidung, vbqppl=vbqppl, vbqppl_link=vbqppl_link,
-                              demuc_id=dieu["DeMucID"], chuong_id=dieu["ChuongID"],
-                              chude_id=current_chude_id)
-            except IntegrityError as e:
-                if e.args[0] == 1062: # Duplicate entry
-                    # print(f"Duplicate dieu {mapc}, skipping.")
-                    pass
-                else:
-                    print(f"Error inserting dieu {mapc}: {e}")
-                continue
-            except Exception as e:
-                print(f"Error inserting dieu {mapc}: {e}")
-                continue
-            for table in tables:
-                PDTable.create(dieu_id=mapc, html=table)
+    print("Inserted tất cả nodes pháp điển!")
+    return dieus_lienquan
 
-            element = noidung_html.nextSibling
-            # Lấy link các file, biếu mẫu nếu có đính kèm
-            while element and element.name == "a":
 
-                link = element["href"]
-                try:
-                    PDFile.create(dieu_id=dieu["MAPC"], link=link, path="")
-                except:
-                    print("Lỗi insert file " + link)
+def insert_lienquan(dieus_lienquan):
+    for dieu_lienquan in dieus_lienquan:
+        try:
+            PDMucLienQuan.create(dieu_id1=dieu_lienquan["dieu_id1"], dieu_id2=dieu_lienquan["dieu_id2"])
+        except:
+            print(f'Không thể insert liên quan {dieu_lienquan["dieu_id1"]} - {dieu_lienquan["dieu_id2"]}')
+            continue
+        print(f'Inserted liên quan {dieu_lienquan["dieu_id1"]} - {dieu_lienquan["dieu_id2"]}')
 
-                element = element.nextSibling
 
-            # Lấy các điều có liên quan, nếu có:
-            if element and element.name == "p" and element["class"] and element["class"][0] == "pChiDan":
-                lienquans_html = element.select("a")
-                for lienquan_html in lienquans_html:
-                    if not "onclick" in lienquan_html.attrs or lienquan_html["onclick"] == "":
-                        continue
-                    mapc_lienquan = extract_input(lienquan_html["onclick"]).replace("'", "")
-                    dieus_lienquan.append({"dieu_id1": dieu["MAPC"], "dieu_id2": mapc_lienquan})
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the extracted Pháp điển files into MySQL")
+    parser.add_argument("--data", default="phap-dien", help="Directory with chude.json, demuc.json, treeNode.json, demuc/")
+    parser.add_argument("--checkpoint", help="Skip the đề mục files listed before this one")
+    parser.add_argument("--keep-tables", action="store_true", help="Do not drop and recreate the PD* tables")
+    args = parser.parse_args(argv)
 
-            stt += 1
-        demuc_file.close()
+    if not args.keep_tables:
+        reset_tables()
+    load_chudes(args.data)
+    demuc_to_chude = load_demucs(args.data)
+    dieus_lienquan = load_nodes(args.data, demuc_to_chude, args.checkpoint)
+    insert_lienquan(dieus_lienquan)
 
-print("Inserted tất cả nodes pháp điển!")
 
-for dieu_lienquan in dieus_lienquan:
+if __name__ == "__main__":
     try:
-        PDMucLienQuan.create(dieu_id1=dieu_lienquan["dieu_id1"], dieu_id2=dieu_lienquan["dieu_id2"])
-    except:
-        print(f'Không thể insert liên quan {dieu_lienquan["dieu_id1"]} - {dieu_lienquan["dieu_id2"]}')
-    print(f'Inserted liên quan {dieu_lienquan["dieu_id1"]} - {dieu_lienquan["dieu_id2"]}')
-
+        main()
+    except KeyboardInterrupt:
+        sys.exit(1)
@@ -69,6 +69,22 @@ class PDFile(BaseModel):
     dieu_id = ForeignKeyField(PDDieu, backref="files")
     link = TextField()
     path = TextField()
+    size = BigIntegerField(null=True)
+    checksum = CharField(max_length=64, null=True)
+
+
+class PDFileDownload(BaseModel):
+    """One row per distinct attachment URL; kept across re-crawls for conditional requests."""
+    url_hash = CharField(max_length=64, primary_key=True)
+    url = TextField()
+    path = TextField(null=True)
+    size = BigIntegerField(null=True)
+    checksum = CharField(max_length=64, null=True)
+    etag = CharField(max_length=255, null=True)
+    last_modified = CharField(max_length=64, null=True)
+    status = CharField(max_length=16)
+    error = TextField(null=True)
+    fetched_at = DateTimeField(null=True)
 
 
 class PDMucLienQuan(BaseModel):
@@ -0,0 +1,142 @@
+"""
+Compact, read-only store for the Pháp điển node list (jdAllTree, phap-dien/treeNode.json).
+
+The list holds every Chương and Điều of the Bộ pháp điển. ``json.load`` turns
+it into one dict per node, with its own key strings and values, which is
+hundreds of MB for the full tree. ``NodeStore`` keeps the fields
+crawl-phapdien uses in a few flat buffers instead:
+
+- MAPC and TEN of every node in one UTF-8 byte buffer plus an ``array`` of
+  end offsets,
+- ChiMuc and DeMucID as indexes into small interned tables,
+- per đề mục, the indexes of its nodes in file order.
+
+It is built while streaming the JSON (``iter_json_array``), so the parsed
+list never exists as a whole, and it is not modified afterwards. Being a
+handful of large objects instead of millions of small ones, a store loaded
+before a fork is shared by the workers page for page (reading it does not
+touch refcounts inside the buffers), and pickling it to a spawned worker
+copies a few buffers.
+"""
+
+import json
+from array import array
+
+_SEPARATORS = " \t\r\n,"
+_TERMINATORS = _SEPARATORS + "]"
+
+
+def iter_json_array(f, chunk_size=1 << 20):
+    """Yield the items of a top-level JSON array read from text file ``f``, one at a time."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof, started = "", 0, False, False
+    while True:
+        while pos < len(buf) and buf[pos] in _SEPARATORS:
+            pos += 1
+        if pos < len(buf) and not started:
+            if buf[pos] != "[":
+                raise ValueError("expected a JSON array")
+            started = True
+            pos += 1
+            continue
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        item = end = None
+        if pos < len(buf):
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        # An item is complete once a separator follows it; a number cut by the
+        # chunk boundary ("3." of "3.5") would otherwise parse as a shorter one.
+        if end is None or (not eof and (end == len(buf) or buf[end] not in _TERMINATORS)):
+            if eof:
+                raise ValueError("unexpected end of JSON array")
+            chunk = f.read(chunk_size)
+            buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+            continue
+        yield item
+        pos = end
+
+
+class TreeNode:
+    """One jdAllTree node as read back from a ``NodeStore``."""
+
+    __slots__ = ("mapc", "ten", "chimuc", "demuc_id")
+
+    def __init__(self, mapc, ten, chimuc, demuc_id):
+        self.mapc = mapc
+        self.ten = ten
+        self.chimuc = chimuc
+        self.demuc_id = demuc_id
+
+    def __repr__(self):
+        return f"TreeNode({self.mapc!r} {self.ten[:40]!r} chimuc={self.chimuc!r} demuc={self.demuc_id!r})"
+
+
+class NodeStore:
+    """Column store of jdAllTree nodes; see the module docstring."""
+
+    __slots__ = ("_blob", "_ends", "_chimuc", "_demuc", "chimucs", "demuc_ids", "_by_demuc")
+
+    def __init__(self, blob, ends, chimuc, demuc, chimucs, demuc_ids, by_demuc):
+        self._blob = blob          # MAPC and TEN of every node, UTF-8, back to back
+        self._ends = ends          # end offset of field 2*i (MAPC) and 2*i+1 (TEN)
+        self._chimuc = chimuc      # node -> index into chimucs
+        self._demuc = demuc        # node -> index into demuc_ids
+        self.chimucs = chimucs
+        self.demuc_ids = demuc_ids
+        self._by_demuc = by_demuc  # DeMucID -> array of node indexes
+
+    @classmethod
+    def build(cls, nodes):
+        """Build a store from an iterable of jdAllTree dicts."""
+        blob = bytearray()
+        ends = array("Q")
+        chimuc, demuc = array("I"), array("I")
+        chimuc_codes, demuc_codes = {}, {}
+        by_demuc = {}
+        for i, node in enumerate(nodes):
+            blob += (node.get("MAPC") or "").encode("utf-8")
+            ends.append(len(blob))
+            blob += (node.get("TEN") or "").encode("utf-8")
+            ends.append(len(blob))
+            chimuc.append(chimuc_codes.setdefault(str(node.get("ChiMuc") or ""), len(chimuc_codes)))
+            code = demuc_codes.setdefault(str(node.get("DeMucID") or ""), len(demuc_codes))
+            demuc.append(code)
+            by_demuc.setdefault(code, array("I")).append(i)
+        demuc_ids = list(demuc_codes)
+        # The buffer is kept as built; a bytes() copy would double the peak for a moment.
+        return cls(blob, ends, chimuc, demuc, list(chimuc_codes), demuc_ids,
+                   {demuc_ids[code]: indexes for code, indexes in by_demuc.items()})
+
+    @classmethod
+    def load(cls, path):
+        """Stream ``treeNode.json`` into a store."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.build(iter_json_array(f))
+
+    def __len__(self):
+        return len(self._demuc)
+
+    def _field(self, j):
+        start = self._ends[j - 1] if j else 0
+        return self._blob[start:self._ends[j]].decode("utf-8")
+
+    def node(self, i):
+        return TreeNode(self._field(2 * i), self._field(2 * i + 1),
+                        self.chimucs[self._chimuc[i]], self.demuc_ids[self._demuc[i]])
+
+    def __iter__(self):
+        return (self.node(i) for i in range(len(self)))
+
+    def nodes_of(self, demuc_id):
+        """Nodes of one đề mục, in file order."""
+        return [self.node(i) for i in self._by_demuc.get(demuc_id, ())]
+
+    @property
+    def nbytes(self):
+        """Size of the buffers (the interned tables are not counted)."""
+        arrays = [self._ends, self._chimuc, self._demuc, *self._by_demuc.values()]
+        return len(self._blob) + sum(a.itemsize * len(a) for a in arrays)
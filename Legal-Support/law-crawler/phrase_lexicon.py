@@ -0,0 +1,253 @@
+"""
+Phrase lexicon: every known concept / relation phrase, matched in one pass.
+
+The query engine used to look each 1-4 word n-gram of a question up in
+Postgres. The lexicon compiles the accent-folded names, synonyms and
+keywords of all concepts and relations into a word-level Aho-Corasick
+automaton, so finding every known phrase in a question is a single scan over
+its tokens and candidate generation needs no database query. The API loads
+the same directory (internal/graph/lexicon.go, PHRASE_LEXICON).
+
+A lexicon is a directory of little-endian uint32 arrays plus two JSON files:
+
+  meta.json     version, counts, build time and the source watermark
+  tokens.bin    folded tokens, UTF-8, concatenated in byte order
+  tokens.idx    uint32[n_tokens + 1]  byte offsets into tokens.bin
+  trans.idx     uint32[n_states + 1]  offsets into trans.tok / trans.next
+  trans.tok     uint32[n_trans]       token ids, ascending per state
+  trans.next    uint32[n_trans]       target states
+  fail.bin      uint32[n_states]      failure links
+  out.bin       uint32[n_states]      phrase id + 1 ending at the state, or 0
+  link.bin      uint32[n_states]      nearest state on the failure chain with an output, or 0
+  phrases.json  [{"phrase", "entries": [{"kind", "id", "name", "type", "match", "score"}]}]
+
+State 0 is the root; phrase ids index phrases.json. Tokens are those of
+``textnorm.tokens`` (the Go side folds with conceptKey, which matches it).
+
+  build_lexicon(entries, "phrase-lexicon")   # entries: see lexicon_entries()
+  PhraseLexicon("phrase-lexicon").candidates("Vượt đèn đỏ bị phạt bao nhiêu?")
+"""
+
+import json
+import os
+import sys
+import time
+from array import array
+from collections import deque
+
+from textnorm import fold, tokens
+
+FORMAT_VERSION = 1
+
+# Scores as in Repository.FindConceptCandidates / FindRelationCandidates.
+MATCH_SCORES = {"exact": 1.0, "synonym": 0.9, "keyword": 0.9}
+
+
+def lexicon_entries(kind, row_id, name, row_type, exact=(), synonyms=(), keywords=()):
+    """``(phrase, entry)`` pairs of one concept or relation; phrases are folded."""
+    entry = {"kind": kind, "id": row_id, "name": name, "type": row_type}
+    seen = set()
+    for match, values in (("exact", exact), ("synonym", synonyms), ("keyword", keywords)):
+        for value in values:
+            phrase = fold(value)
+            if len(phrase) < 2 or phrase in seen:
+                continue
+            seen.add(phrase)
+            yield phrase, {**entry, "match": match, "score": MATCH_SCORES[match]}
+
+
+def _entry_order(entry):
+    return -entry["score"], len(entry["name"]), entry["name"]
+
+
+def compile_automaton(phrases):
+    """Aho-Corasick over token-id sequences -> (goto dicts, fail, out, link)."""
+    goto, out = [{}], [0]
+    for pid, toks in enumerate(phrases):
+        state = 0
+        for t in toks:
+            nxt = goto[state].get(t)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][t] = nxt
+                goto.append({})
+                out.append(0)
+            state = nxt
+        out[state] = pid + 1
+
+    fail, link = [0] * len(goto), [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for t, nxt in goto[state].items():
+            f = fail[state]
+            while f and t not in goto[f]:
+                f = fail[f]
+            target = goto[f].get(t, 0) if state else 0
+            fail[nxt] = target
+            link[nxt] = fail[nxt] if out[fail[nxt]] else link[fail[nxt]]
+            queue.append(nxt)
+    return goto, fail, out, link
+
+
+def _write_u32(path, values):
+    data = array("I", values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    with open(path, "wb") as f:
+        f.write(data.tobytes())
+
+
+def build_lexicon(entries, path, watermark=None):
+    """Build a lexicon from ``(phrase, entry)`` pairs; returns the meta dict."""
+    by_phrase = {}
+    for phrase, entry in entries:
+        bucket = by_phrase.setdefault(phrase, {})
+        key = (entry["kind"], entry["id"])
+        if key not in bucket or entry["score"] > bucket[key]["score"]:
+            bucket[key] = entry
+
+    phrase_list = sorted(by_phrase)
+    vocab = sorted({t for p in phrase_list for t in p.split()}, key=lambda t: t.encode("utf-8"))
+    token_ids = {t: i for i, t in enumerate(vocab)}
+    goto, fail, out, link = compile_automaton([[token_ids[t] for t in p.split()] for p in phrase_list])
+
+    os.makedirs(path, exist_ok=True)
+    token_bytes, token_offsets = bytearray(), [0]
+    for t in vocab:
+        token_bytes += t.encode("utf-8")
+        token_offsets.append(len(token_bytes))
+    with open(os.path.join(path, "tokens.bin"), "wb") as f:
+        f.write(bytes(token_bytes))
+    _write_u32(os.path.join(path, "tokens.idx"), token_offsets)
+
+    trans_idx, trans_tok, trans_next = [0], [], []
+    for edges in goto:
+        for t in sorted(edges):
+            trans_tok.append(t)
+            trans_next.append(edges[t])
+        trans_idx.append(len(trans_tok))
+    _write_u32(os.path.join(path, "trans.idx"), trans_idx)
+    _write_u32(os.path.join(path, "trans.tok"), trans_tok)
+    _write_u32(os.path.join(path, "trans.next"), trans_next)
+    _write_u32(os.path.join(path, "fail.bin"), fail)
+    _write_u32(os.path.join(path, "out.bin"), out)
+    _write_u32(os.path.join(path, "link.bin"), link)
+
+    with open(os.path.join(path, "phrases.json"), "w", encoding="utf-8") as f:
+        json.dump([{"phrase": p, "entries": sorted(by_phrase[p].values(), key=_entry_order)} for p in phrase_list],
+                  f, ensure_ascii=False, separators=(",", ":"))
+
+    meta = {
+        "version": FORMAT_VERSION, "n_phrases": len(phrase_list), "n_tokens": len(vocab),
+        "n_states": len(goto), "n_trans": len(trans_tok),
+        "n_entries": sum(len(v) for v in by_phrase.values()),
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "watermark": watermark or {},
+    }
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def _read_u32(path):
+    data = array("I")
+    with open(path, "rb") as f:
+        data.frombytes(f.read())
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+def read_phrases(path):
+    """``(phrase, entry)`` pairs stored in a lexicon, for rebuilding it with more."""
+    with open(os.path.join(path, "phrases.json"), encoding="utf-8") as f:
+        for item in json.load(f):
+            for entry in item["entries"]:
+                yield item["phrase"], entry
+
+
+class PhraseMatch:
+    """A lexicon phrase found at tokens ``[start, end)`` of the folded question."""
+
+    __slots__ = ("start", "end", "phrase", "entries")
+
+    def __init__(self, start, end, phrase, entries):
+        self.start = start
+        self.end = end
+        self.phrase = phrase
+        self.entries = entries
+
+    def __repr__(self):
+        return f"PhraseMatch({self.start}:{self.end} {self.phrase!r} {len(self.entries)} entries)"
+
+
+class PhraseLexicon:
+    """Read-only lexicon loaded from a directory; see the module docstring."""
+
+    def __init__(self, path):
+        # Resolve a versioned lexicon's symlink once so every file comes from the same build.
+        path = os.path.realpath(path)
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported lexicon version {self.meta.get('version')}")
+        self.path = path
+        with open(os.path.join(path, "tokens.bin"), "rb") as f:
+            blob = f.read()
+        offsets = _read_u32(os.path.join(path, "tokens.idx"))
+        self._token_ids = {blob[offsets[i]:offsets[i + 1]].decode("utf-8"): i for i in range(len(offsets) - 1)}
+        self._trans_idx = _read_u32(os.path.join(path, "trans.idx"))
+        self._trans_tok = _read_u32(os.path.join(path, "trans.tok"))
+        self._trans_next = _read_u32(os.path.join(path, "trans.next"))
+        self._fail = _read_u32(os.path.join(path, "fail.bin"))
+        self._out = _read_u32(os.path.join(path, "out.bin"))
+        self._link = _read_u32(os.path.join(path, "link.bin"))
+        with open(os.path.join(path, "phrases.json"), encoding="utf-8") as f:
+            self._phrases = json.load(f)
+
+    def __len__(self):
+        return len(self._phrases)
+
+    def _next(self, state, token):
+        lo, hi = self._trans_idx[state], self._trans_idx[state + 1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._trans_tok[mid] < token:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._trans_idx[state + 1] and self._trans_tok[lo] == token:
+            return self._trans_next[lo]
+        return -1
+
+    def match(self, text):
+        """Every lexicon phrase occurring in ``text``, overlapping ones included, by end position."""
+        matches = []
+        state = 0
+        for i, tok in enumerate(tokens(text)):
+            t = self._token_ids.get(tok)
+            if t is None:  # no phrase contains this token
+                state = 0
+                continue
+            nxt = self._next(state, t)
+            while nxt < 0 and state:
+                state = self._fail[state]
+                nxt = self._next(state, t)
+            state = max(nxt, 0)
+            hit = state if self._out[state] else self._link[state]
+            while hit:
+                item = self._phrases[self._out[hit] - 1]
+                matches.append(PhraseMatch(i + 1 - item["phrase"].count(" ") - 1, i + 1,
+                                           item["phrase"], item["entries"]))
+                hit = self._link[hit]
+        return matches
+
+    def candidates(self, text):
+        """Best entry per concept / relation found in ``text``, highest score first."""
+        best = {}
+        for m in self.match(text):
+            for entry in m.entries:
+                key = (entry["kind"], entry["id"])
+                if key not in best or entry["score"] > best[key]["score"]:
+                    best[key] = entry
+        return sorted(best.values(), key=_entry_order)
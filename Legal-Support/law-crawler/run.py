@@ -1,9 +1,10 @@
 import os
 import shutil
 import zipfile
-import subprocess
 import sys
 
+from lawcrawler.cli import run
+
 def clean_previous_data():
     print("Cleaning previous data...")
     if os.path.exists("phap-dien"):
@@ -26,13 +27,10 @@ def extract_zip():
         zip_ref.extractall(".")
     print("Extraction complete.")
 
-def run_script(script_path):
-    print(f"Running {script_path}...")
-    result = subprocess.run([sys.executable, script_path], capture_output=False)
-    if result.returncode != 0:
-        print(f"Error running {script_path}")
-        sys.exit(result.returncode)
-    print(f"Finished {script_path}")
+def run_stage(*argv):
+    print(f"Running {argv[0]}...")
+    run(list(argv))
+    print(f"Finished {argv[0]}")
 
 def main():
     print("Starting full recrawl process...")
@@ -44,11 +42,10 @@ def main():
     extract_zip()
     
     # Step 3: Convert JS to JSON and prepare structure
-    # convert_js_to_json.py is now in scripts/
-    run_script(os.path.join("scripts", "convert_js_to_json.py"))
+    run_stage("convert-phapdien")
     
     # Step 4: Run main ingestion
-    run_script("main.py")
+    run_stage("crawl-phapdien")
     
     print("Recrawl process completed successfully!")
 
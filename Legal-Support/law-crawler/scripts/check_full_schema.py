@@ -1,18 +1,9 @@
-import pymysql
+from pymysql.cursors import DictCursor
 
-conn = pymysql.connect(
-    host="localhost",
-    port=3307,
-    user="root",
-    password="123456789",
-    database="law",
-    cursorclass=pymysql.cursors.DictCursor
-)
+from db import mysql_connection
 
-try:
-    with conn.cursor() as cursor:
+with mysql_connection() as conn:
+    with conn.cursor(DictCursor) as cursor:
         cursor.execute("SHOW CREATE TABLE pddieu;")
         result = cursor.fetchone()
         print(result['Create Table'])
-finally:
-    conn.close()
@@ -1,24 +1,15 @@
-import pymysql
+from pymysql.cursors import DictCursor
 
-def check_pddieu():
-    conn = pymysql.connect(
-        host="localhost",
-        port=3307,
-        user="root",
-        password="123456789",
-        database="law",
-        cursorclass=pymysql.cursors.DictCursor
-    )
-    cursor = conn.cursor()
-    
-    print("\nSearching for '%biển%' in vbqppl column:")
-    cursor.execute("SELECT DISTINCT vbqppl FROM pddieu WHERE vbqppl LIKE '%biển%' LIMIT 20")
-    rows = cursor.fetchall()
-    print(f"Found {len(rows)} distinct titles:")
-    for row in rows:
-        print(f"Title: {row['vbqppl']}")
+from db import mysql_connection
 
-    conn.close()
+def check_pddieu():
+    with mysql_connection() as conn, conn.cursor(DictCursor) as cursor:
+        print("\nSearching for '%biển%' in vbqppl column:")
+        cursor.execute("SELECT DISTINCT vbqppl FROM pddieu WHERE vbqppl LIKE '%biển%' LIMIT 20")
+        rows = cursor.fetchall()
+        print(f"Found {len(rows)} distinct titles:")
+        for row in rows:
+            print(f"Title: {row['vbqppl']}")
 
 if __name__ == "__main__":
     check_pddieu()
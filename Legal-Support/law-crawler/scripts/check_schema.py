@@ -1,16 +1,9 @@
-import pymysql
+from pymysql.cursors import DictCursor
 
-conn = pymysql.connect(
-    host="localhost",
-    port=3307,
-    user="root",
-    password="123456789",
-    database="law",
-    cursorclass=pymysql.cursors.DictCursor
-)
+from db import mysql_connection
 
-try:
-    with conn.cursor() as cursor:
+with mysql_connection() as conn:
+    with conn.cursor(DictCursor) as cursor:
         cursor.execute("DESCRIBE pddieu;")
         result = cursor.fetchall()
         for row in result:
@@ -22,5 +15,3 @@ try:
         for row in result:
             if row['Field'] == 'mapc':
                 print(f"Column 'pdchuong.mapc' type: {row['Type']}")
-finally:
-    conn.close()
@@ -1,25 +1,23 @@
+"""
+Turn the jsonData.js of the Pháp điển zip into the phap-dien/ JSON files.
+
+Usage (from law-crawler/, after unzipping BoPhapDienDienTu.zip here):
+  python -m lawcrawler convert-phapdien [--js jsonData.js] [--out phap-dien]
+
+Writes chude.json (jdChuDe), demuc.json (jdDeMuc) and treeNode.json
+(jdAllTree) and moves the extracted demuc/ folder under --out, which is the
+layout crawl-phapdien reads.
+"""
+
+import argparse
 import json
 import os
 import shutil
+import sys
 
-# Create phap-dien directory
-if not os.path.exists("phap-dien"):
-    os.makedirs("phap-dien")
+# jsonData.js variable -> file written under --out
+VARIABLES = {"jdChuDe": "chude.json", "jdDeMuc": "demuc.json", "jdAllTree": "treeNode.json"}
 
-# Move demuc folder if it exists in current dir
-if os.path.exists("demuc"):
-    if os.path.exists("phap-dien/demuc"):
-        shutil.rmtree("phap-dien/demuc")
-    shutil.move("demuc", "phap-dien/demuc")
-    print("Moved demuc folder to phap-dien/demuc")
-
-# Parse jsonData.js
-with open("jsonData.js", "r", encoding="utf-8") as f:
-    content = f.read()
-
-# Extract variables
-# We can use string manipulation or regex since the format is simple: var name = [...];
-import re
 
 def extract_var(name, content):
     pattern = r'var ' + name + r' = (\[.*?\]);'
@@ -69,20 +67,42 @@ def extract_var(name, content):
         print(f"Error parsing JSON for {name}: {e}")
         return None
 
-jdChuDe = extract_var("jdChuDe", content)
-if jdChuDe:
-    with open("phap-dien/chude.json", "w", encoding="utf-8") as f:
-        json.dump(jdChuDe, f, ensure_ascii=False, indent=2)
-    print("Saved phap-dien/chude.json")
 
-jdDeMuc = extract_var("jdDeMuc", content)
-if jdDeMuc:
-    with open("phap-dien/demuc.json", "w", encoding="utf-8") as f:
-        json.dump(jdDeMuc, f, ensure_ascii=False, indent=2)
-    print("Saved phap-dien/demuc.json")
+def move_demuc(out):
+    # Move demuc folder if it exists in current dir
+    if os.path.exists("demuc"):
+        target = os.path.join(out, "demuc")
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        shutil.move("demuc", target)
+        print(f"Moved demuc folder to {target}")
+
 
-jdAllTree = extract_var("jdAllTree", content)
-if jdAllTree:
-    with open("phap-dien/treeNode.json", "w", encoding="utf-8") as f:
-        json.dump(jdAllTree, f, ensure_ascii=False, indent=2)
-    print("Saved phap-dien/treeNode.json")
+def convert(js_path, out):
+    os.makedirs(out, exist_ok=True)
+    move_demuc(out)
+
+    with open(js_path, "r", encoding="utf-8") as f:
+        content = f.read()
+    for name, file_name in VARIABLES.items():
+        data = extract_var(name, content)
+        if data:
+            path = os.path.join(out, file_name)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            print(f"Saved {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert jsonData.js into the phap-dien JSON files")
+    parser.add_argument("--js", default="jsonData.js", help="jsonData.js from the Pháp điển zip")
+    parser.add_argument("--out", default="phap-dien", help="Output directory")
+    args = parser.parse_args(argv)
+    convert(args.js, args.out)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(1)
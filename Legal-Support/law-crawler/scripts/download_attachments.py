@@ -0,0 +1,161 @@
+"""
+Download the attachments linked from PDFile and record where they are stored.
+
+Usage (from law-crawler/):
+  python -m scripts.download_attachments [--store attachments] [--base-url https://phapdien.moj.gov.vn/]
+                                         [--concurrency 16] [--per-host 4] [--refresh] [--limit N]
+
+Config via env:
+  MYSQL_* (see db.py)
+  ATTACHMENT_DIR (default: attachments), ATTACHMENT_BASE_URL for relative links
+
+Links are resolved against --base-url and deduplicated by URL hash: each
+distinct URL is fetched once (see attachments.py) and its result kept in
+``pdfiledownload``, which main.py does not drop, so a re-crawl of Pháp điển
+only needs this job to fill ``PDFile.path/size/checksum`` again.
+
+By default only URLs never downloaded (or that failed) are fetched.
+--refresh also revalidates the downloaded ones with conditional requests;
+unchanged files answer 304 and are not transferred again. To try it against
+a local stub: ``python -m http.server 8000`` in a directory holding the files
+and ``--base-url http://127.0.0.1:8000/`` for relative links.
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+import time
+from urllib.parse import urljoin
+
+from attachments import DONE, ERROR, NOT_MODIFIED, ContentStore, fetch_all, url_hash
+from db import db
+from models.models import PDFile, PDFileDownload
+
+WRITE_BATCH = 100
+
+
+def ensure_schema():
+    """Create pdfiledownload and add the PDFile columns to older tables."""
+    db.create_tables([PDFileDownload], safe=True)
+    columns = {c.name for c in db.get_columns("pdfile")}
+    if "size" not in columns:
+        db.execute_sql("ALTER TABLE pdfile ADD COLUMN size BIGINT NULL")
+    if "checksum" not in columns:
+        db.execute_sql("ALTER TABLE pdfile ADD COLUMN checksum VARCHAR(64) NULL")
+
+
+def load_links(base_url):
+    """{url hash: (absolute url, [PDFile.link values resolving to it])}."""
+    urls = {}
+    for (link,) in PDFile.select(PDFile.link).distinct().tuples().iterator():
+        if not link:
+            continue
+        url = urljoin(base_url, link.strip())
+        entry = urls.setdefault(url_hash(url), (url, []))
+        entry[1].append(link)
+    return urls
+
+
+def load_previous():
+    return {row["url_hash"]: row for row in PDFileDownload.select().dicts().iterator()}
+
+
+def write_results(results, links):
+    now = datetime.datetime.now()
+    with db.atomic():
+        for r in results:
+            PDFileDownload.insert(
+                url_hash=r["url_hash"], url=r["url"], path=r.get("path"), size=r.get("size"),
+                checksum=r.get("checksum"), etag=r.get("etag"), last_modified=r.get("last_modified"),
+                status=r["status"], error=r.get("error"), fetched_at=now,
+            ).on_conflict_replace().execute()
+            if r["status"] != ERROR:
+                link_files(links[r["url_hash"]][1], r)
+
+
+def link_files(raw_links, result):
+    (PDFile
+     .update(path=result["path"], size=result["size"], checksum=result["checksum"])
+     .where(PDFile.link.in_(raw_links))
+     .execute())
+
+
+def sync_unchanged(urls, previous, fetched):
+    """Fill PDFile rows (e.g. after a re-crawl) from downloads not fetched in this run."""
+    linked = 0
+    with db.atomic():
+        for h, (url, raw_links) in urls.items():
+            row = previous.get(h)
+            if h in fetched or not row or row["status"] == ERROR:
+                continue
+            linked += (PDFile
+                       .update(path=row["path"], size=row["size"], checksum=row["checksum"])
+                       .where(PDFile.link.in_(raw_links), (PDFile.path == "") | PDFile.path.is_null())
+                       .execute())
+    return linked
+
+
+async def download(jobs, store, links, args):
+    counts = {DONE: 0, NOT_MODIFIED: 0, ERROR: 0}
+    transferred = 0
+    batch = []
+    async for result in fetch_all(jobs, store, args.concurrency, args.per_host, args.timeout):
+        counts[result["status"]] += 1
+        if result["status"] == DONE:
+            transferred += result["size"]
+        elif result["status"] == ERROR:
+            print(f"  {result['url']}: {result['error']}")
+        batch.append(result)
+        if len(batch) >= WRITE_BATCH:
+            write_results(batch, links)
+            batch = []
+            print(f"  {sum(counts.values())}/{len(jobs)} ...")
+    if batch:
+        write_results(batch, links)
+    return counts, transferred
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download PDFile attachments into a content-addressed store")
+    parser.add_argument("--store", default=os.getenv("ATTACHMENT_DIR", "attachments"), help="Store root directory")
+    parser.add_argument("--base-url", default=os.getenv("ATTACHMENT_BASE_URL", "https://phapdien.moj.gov.vn/"),
+                        help="Base for relative links")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight overall")
+    parser.add_argument("--per-host", type=int, default=4, help="Requests in flight per host")
+    parser.add_argument("--timeout", type=int, default=60, help="Seconds per download")
+    parser.add_argument("--refresh", action="store_true", help="Revalidate downloaded URLs too (conditional GET)")
+    parser.add_argument("--limit", type=int, default=0, help="Fetch at most N URLs (0 = all)")
+    args = parser.parse_args(argv)
+
+    db.connect(reuse_if_open=True)
+    ensure_schema()
+    store = ContentStore(args.store)
+    urls = load_links(args.base_url)
+    previous = load_previous()
+
+    jobs = []
+    for h, (url, _) in urls.items():
+        row = previous.get(h)
+        if row is None or row["status"] == ERROR or not store.exists(row["path"]):
+            jobs.append((url, None))
+        elif args.refresh:
+            jobs.append((url, row))
+    if args.limit:
+        jobs = jobs[:args.limit]
+    print(f"{len(urls)} distinct attachment URLs, {len(previous)} fetched before, {len(jobs)} to request")
+
+    started = time.time()
+    counts, transferred = asyncio.run(download(jobs, store, urls, args))
+    linked = sync_unchanged(urls, previous, {url_hash(url) for url, _ in jobs})
+    elapsed = time.time() - started
+    print(f"Downloaded {counts[DONE]} ({transferred / 1e6:.1f} MB), not modified {counts[NOT_MODIFIED]}, "
+          f"failed {counts[ERROR]} in {elapsed:.1f}s; {linked} PDFile rows filled from earlier downloads")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(1)
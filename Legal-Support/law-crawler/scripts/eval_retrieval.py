@@ -0,0 +1,284 @@
+"""
+Score retrieval settings on a labelled question set: recall@k, MRR, nDCG and latency.
+
+Usage (from law-crawler/):
+  python -m scripts.eval_retrieval --questions eval/questions.jsonl \\
+      --config query --config rag:top_k=5 --config rag:top_k=10 \\
+      --config bm25:path=bm25-index/units [--k 1,3,5,10] [--repeat 3] [--warmup 5] \\
+      [--min-recall 0.8 --bar-k 5] [--report eval-report.json]
+
+Config via env:
+  LEGAL_SUPPORTER_URL (default: http://localhost:8080) for the query / rag targets
+
+The question set is JSONL, one labelled question per line:
+
+  {"id": "q1", "question": "Vượt đèn đỏ bị phạt bao nhiêu?", "expected": ["<unit uuid>", "ref:Điều 7"]}
+
+A label matches a result when it equals one of the result's ids (unit_id,
+document_id, code, or the BM25 document id), or, written ``ref:<text>``,
+when the folded text occurs in its doc_ref / document_title. Every label
+counts once, at the first result that matches it; relevance is binary.
+
+Each ``--config`` is ``<target>[:key=value,...]``:
+
+  query   POST /api/v1/query; keys are sent in the body (e.g. debug=1)
+  rag     POST /api/v1/query/rag; keys are sent in the body (top_k, doc_type,
+          level, year_from, year_to, answer), lists as a|b
+  bm25    a local index (scripts.build_bm25_index); keys: path, top_k
+
+The questions run in the same order for every config, --repeat times, after
+--warmup unscored calls. Metrics come from the first run; latency from all
+of them. With --min-recall, the report names the config with the lowest p90
+latency whose recall@--bar-k reaches the bar, i.e. the cheapest one that is
+good enough.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+from textnorm import fold
+
+LEGAL_SUPPORTER_URL = os.getenv("LEGAL_SUPPORTER_URL", "http://localhost:8080").rstrip("/")
+
+ID_FIELDS = ("unit_id", "document_id", "code", "id")
+REF_FIELDS = ("doc_ref", "document_title", "title")
+
+
+def parse_value(value):
+    if "|" in value:
+        return [parse_value(v) for v in value.split("|")]
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def parse_config(spec):
+    """``"rag:top_k=5,answer=false"`` -> ``("rag", {"top_k": 5, "answer": False})``."""
+    target, _, rest = spec.partition(":")
+    options = {}
+    for pair in filter(None, rest.split(",")):
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"{spec}: expected key=value, got {pair!r}")
+        options[key.strip()] = parse_value(value.strip())
+    if target not in TARGETS:
+        raise ValueError(f"{spec}: unknown target {target!r} (one of {', '.join(TARGETS)})")
+    return target, options
+
+
+def load_questions(path):
+    questions = []
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            q = json.loads(line)
+            questions.append({"id": str(q.get("id") or n), "question": q["question"],
+                              "expected": [str(e) for e in q.get("expected") or []]})
+    return questions
+
+
+# --- targets: each returns a searcher(question, k) -> list of result dicts ---
+
+def http_searcher(endpoint, body_of, items_key):
+    import requests
+
+    session = requests.Session()  # keep-alive, so latency is the server's and not the handshake
+
+    def search(question, k):
+        resp = session.post(LEGAL_SUPPORTER_URL + endpoint, json=body_of(question, k), timeout=120)
+        resp.raise_for_status()
+        return (resp.json().get(items_key) or [])[:k]
+
+    return search
+
+
+def query_target(options):
+    return http_searcher("/api/v1/query", lambda q, k: {"text": q, **options}, "answers")
+
+
+def rag_target(options):
+    return http_searcher("/api/v1/query/rag", lambda q, k: {"question": q, "top_k": k, **options}, "items")
+
+
+def bm25_target(options):
+    from bm25_index import BM25Index
+
+    index = BM25Index(options.get("path", "bm25-index/units"))
+    top_k = options.get("top_k")
+
+    def search(question, k):
+        return [{"id": doc_id, "score": score} for doc_id, score in index.search(question, top_k or k)][:k]
+
+    return search
+
+
+TARGETS = {"query": query_target, "rag": rag_target, "bm25": bm25_target}
+
+
+# --- metrics ---
+
+def label_matches(label, result):
+    if label.startswith("ref:"):
+        needle = fold(label[4:])
+        return any(needle in fold(str(result.get(f) or "")) for f in REF_FIELDS)
+    return any(result.get(f) is not None and str(result[f]) == label for f in ID_FIELDS)
+
+
+def relevant_ranks(expected, results):
+    """1-based ranks of results that match a not yet matched label."""
+    remaining = list(expected)
+    ranks = []
+    for rank, result in enumerate(results, 1):
+        hit = next((label for label in remaining if label_matches(label, result)), None)
+        if hit is not None:
+            remaining.remove(hit)
+            ranks.append(rank)
+    return ranks
+
+
+def score_question(expected, results, ks):
+    ranks = relevant_ranks(expected, results)
+    scores = {"mrr": 1.0 / ranks[0] if ranks else 0.0}
+    for k in ks:
+        hits = [r for r in ranks if r <= k]
+        dcg = sum(1.0 / math.log2(r + 1) for r in hits)
+        idcg = sum(1.0 / math.log2(r + 1) for r in range(1, min(len(expected), k) + 1))
+        scores[f"recall@{k}"] = len(hits) / len(expected)
+        scores[f"ndcg@{k}"] = dcg / idcg
+    return scores, ranks
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return float("nan")
+    i = (len(sorted_values) - 1) * p / 100
+    lo, hi = math.floor(i), math.ceil(i)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (i - lo)
+
+
+def latency_summary(latencies_ms):
+    values = sorted(latencies_ms)
+    return {
+        "calls": len(values),
+        "mean_ms": sum(values) / len(values) if values else float("nan"),
+        "p50_ms": percentile(values, 50),
+        "p90_ms": percentile(values, 90),
+        "p99_ms": percentile(values, 99),
+        "max_ms": values[-1] if values else float("nan"),
+    }
+
+
+def evaluate(spec, questions, ks, repeat=1, warmup=0):
+    target, options = parse_config(spec)
+    search = TARGETS[target](dict(options))
+    depth = max(ks)
+
+    for q in questions[:warmup]:
+        try:
+            search(q["question"], depth)
+        except Exception:
+            pass
+
+    latencies, per_question, errors = [], [], 0
+    for run in range(repeat):
+        for q in questions:
+            started = time.perf_counter()
+            try:
+                results = search(q["question"], depth)
+            except Exception as e:
+                errors += 1
+                if run == 0 and q["expected"]:
+                    # A failed call scores like an empty result, so flaky settings do not look better.
+                    scores, _ = score_question(q["expected"], [], ks)
+                    per_question.append({"id": q["id"], "error": str(e), **scores})
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            if run == 0 and q["expected"]:
+                scores, ranks = score_question(q["expected"], results, ks)
+                per_question.append({"id": q["id"], "ranks": ranks, "returned": len(results), **scores})
+
+    metric_names = ["mrr"] + [f"{m}@{k}" for m in ("recall", "ndcg") for k in ks]
+    metrics = {m: sum(p[m] for p in per_question) / len(per_question) if per_question else float("nan")
+               for m in metric_names}
+    return {"config": spec, "target": target, "options": options, "questions": len(questions),
+            "scored": len(per_question), "errors": errors, "metrics": metrics,
+            "latency": latency_summary(latencies), "per_question": per_question}
+
+
+def cheapest(reports, min_recall, bar_k):
+    """Config with the lowest p90 latency whose recall@bar_k reaches ``min_recall``."""
+    passing = [r for r in reports if r["scored"] and r["metrics"].get(f"recall@{bar_k}", 0) >= min_recall]
+    return min(passing, key=lambda r: (r["latency"]["p90_ms"], r["latency"]["mean_ms"]), default=None)
+
+
+def print_table(reports, ks):
+    cols = [f"recall@{k}" for k in ks] + ["mrr"] + [f"ndcg@{k}" for k in ks]
+    width = max(len(r["config"]) for r in reports)
+    print(f"{'config':<{width}}  " + " ".join(f"{c:>9}" for c in cols)
+          + f" {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    for r in reports:
+        lat = r["latency"]
+        print(f"{r['config']:<{width}}  " + " ".join(f"{r['metrics'][c]:>9.3f}" for c in cols)
+              + f" {lat['p50_ms']:>8.1f} {lat['p90_ms']:>8.1f} {lat['p99_ms']:>8.1f} {r['errors']:>6}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recall@k, MRR, nDCG and latency of retrieval settings")
+    parser.add_argument("--questions", required=True, help="Labelled question set (JSONL)")
+    parser.add_argument("--config", action="append", required=True,
+                        help="target[:key=value,...]; repeat for every setting to compare")
+    parser.add_argument("--k", default="1,3,5,10", help="Cutoffs for recall@k and nDCG@k")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs over the question set per config")
+    parser.add_argument("--warmup", type=int, default=3, help="Unscored calls per config before timing")
+    parser.add_argument("--min-recall", type=float, help="Quality bar: pick the cheapest config reaching it")
+    parser.add_argument("--bar-k", type=int, default=5, help="k of the recall@k the bar applies to")
+    parser.add_argument("--report", help="Write the full report (per question too) as JSON")
+    args = parser.parse_args(argv)
+
+    ks = sorted({int(k) for k in args.k.split(",") if k.strip()})
+    if args.min_recall is not None and args.bar_k not in ks:
+        ks = sorted(set(ks) | {args.bar_k})
+    for spec in args.config:
+        parse_config(spec)  # fail on a typo before spending time on the others
+    questions = load_questions(args.questions)
+    labelled = sum(1 for q in questions if q["expected"])
+    print(f"{len(questions)} questions ({labelled} labelled), {len(args.config)} configs")
+
+    reports = []
+    for spec in args.config:
+        started = time.time()
+        reports.append(evaluate(spec, questions, ks, repeat=args.repeat, warmup=args.warmup))
+        print(f"  {spec}: {time.time() - started:.1f}s")
+    print()
+    print_table(reports, ks)
+
+    best = None
+    if args.min_recall is not None:
+        best = cheapest(reports, args.min_recall, args.bar_k)
+        print()
+        if best:
+            print(f"cheapest config with recall@{args.bar_k} >= {args.min_recall}: {best['config']} "
+                  f"(p90 {best['latency']['p90_ms']:.1f} ms)")
+        else:
+            print(f"no config reaches recall@{args.bar_k} >= {args.min_recall}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"questions": args.questions, "k": ks, "min_recall": args.min_recall, "bar_k": args.bar_k,
+                       "cheapest": best["config"] if best else None, "configs": reports},
+                      f, ensure_ascii=False, indent=2)
+        print(f"report written to {args.report}")
+    return reports
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(1)
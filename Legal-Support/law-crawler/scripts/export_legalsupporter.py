@@ -5,30 +5,73 @@ Steps:
 1) Run the existing crawlers to populate the MySQL tables (PDChuDe/PDDeMuc/PDChuong/PDDieu...).
 2) Set LEGAL_SUPPORTER_URL to the running backend (default http://localhost:8080).
 3) Optionally set DEMUC_IDS as a comma-separated list to limit export (e.g. "1,2,10").
-4) Run:  python export_legalsupporter.py
+4) Optionally set LEGAL_SUPPORTER_SPLIT_CLAUSES=false to send whole articles
+   instead of article -> clause -> point units.
+5) Run (from law-crawler/):  python -m lawcrawler export [--demuc-ids 1,2,10]
 
 The script will POST /api/v1/query/ingest with document + units payloads that
 match Legal-Supporter’s schema. It keeps parent-child links using codes, so
 chapters must be sent before their articles within each document payload.
+Every unit also carries its materialized path, depth and document order
+(units.path / depth / doc_order, migration 0014).
 """
 
+import argparse
 import os
 import sys
+
 import requests
 
 from models.models import PDChuDe, PDDeMuc, PDChuong, PDDieu
+from structure import parse, own_text, path_string, tree_keys
 
 
 BACKEND_URL = os.getenv("LEGAL_SUPPORTER_URL", "http://localhost:8080").rstrip("/")
 AUTO_EMBED = os.getenv("LEGAL_SUPPORTER_AUTO_EMBED", "false").lower() == "true"
 DEMUC_IDS = os.getenv("DEMUC_IDS")  # comma-separated demuc ids to export
+SPLIT_CLAUSES = os.getenv("LEGAL_SUPPORTER_SPLIT_CLAUSES", "true").lower() == "true"
+
+
+def article_units(dieu: PDDieu, parent_code: str, order_index: int):
+    """Return the article unit followed by its clause/point units.
+
+    Clause codes extend the article MAPC (``<mapc>_k2``, ``<mapc>_k2_a``) so
+    they stay unique across the whole export and parents precede children.
+    """
+    noidung = dieu.noidung or ""
+    nodes = parse(noidung, inside_article=True) if SPLIT_CLAUSES else []
+    lead_in = noidung[:nodes[0].start] if nodes else noidung
+    units = [{
+        "level": "article",
+        "code": dieu.mapc,
+        "parent_code": parent_code,
+        "text": ((dieu.ten or "") + "\n" + lead_in).strip(),
+        "order_index": order_index,
+    }]
+
+    codes = []
+    child_counts = {}
+    for node in nodes:
+        parent = codes[node.parent] if node.parent >= 0 else dieu.mapc
+        prefix = "k" if node.level == "clause" else ""
+        code = f"{parent}_{prefix}{node.label}"
+        codes.append(code)
+        child_counts[parent] = child_counts.get(parent, 0) + 1
+        units.append({
+            "level": node.level,
+            "code": code,
+            "parent_code": parent,
+            "text": own_text(noidung, node),
+            "order_index": child_counts[parent] - 1,
+        })
+    return units
 
 
 def build_units_for_demuc(demuc_id: str):
     """Return a list of units (chapters + articles) for the given DeMuc.
 
     - Chapter unit codes use the existing MAPC so that article parent_code can point to them.
-    - Article unit codes use the PDDieu MAPC.
+    - Article unit codes use the PDDieu MAPC; clauses and points follow their article.
     - order_index preserves the original stt where available.
     """
     units = []
@@ -64,15 +107,7 @@ def build_units_for_demuc(demuc_id: str):
                  .where(PDDieu.chuong_id == ch.mapc)
                  .order_by(PDDieu.stt))
         for idx, dieu in enumerate(dieus):
-            code = dieu.mapc
-            body = (dieu.ten or "") + "\n" + (dieu.noidung or "")
-            units.append({
-                "level": "article",
-                "code": code,
-                "parent_code": ch_code,
-                "text": body.strip(),
-                "order_index": dieu.stt if dieu.stt is not None else idx,
-            })
+            units.extend(article_units(dieu, ch_code, dieu.stt if dieu.stt is not None else idx))
 
     # Articles that did not get chapters (fallback)
     if synthetic_parent_code:
@@ -81,19 +116,22 @@ def build_units_for_demuc(demuc_id: str):
                  .where(PDDieu.demuc_id == demuc_id)
                  .order_by(PDDieu.stt))
         for idx, dieu in enumerate(dieus):
-            code = dieu.mapc
-            body = (dieu.ten or "") + "\n" + (dieu.noidung or "")
-            units.append({
-                "level": "article",
-                "code": code,
-                "parent_code": synthetic_parent_code,
-                "text": body.strip(),
-                "order_index": dieu.stt if dieu.stt is not None else idx,
-            })
+            units.extend(article_units(dieu, synthetic_parent_code, dieu.stt if dieu.stt is not None else idx))
 
+    add_tree_keys(units)
     return units
 
 
+def add_tree_keys(units):
+    """Set path/depth/doc_order on every unit, ordered like the API orders siblings."""
+    keys = tree_keys([(u["code"], u.get("parent_code"), u["order_index"]) for u in units])
+    for u in units:
+        labels, depth, doc_order = keys[u["code"]]
+        u["path"] = path_string(labels)
+        u["depth"] = depth
+        u["doc_order"] = doc_order
+
+
 def ingest_demuc(demuc: PDDeMuc, chude_title: str | None):
     units = build_units_for_demuc(demuc.id)
     if not units:
@@ -123,10 +161,14 @@ def ingest_demuc(demuc: PDDeMuc, chude_title: str | None):
         print(f"[fail] DeMuc {demuc.id}: {exc}")
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the Pháp điển tables to Legal-Supporter via the ingest API")
+    parser.add_argument("--demuc-ids", default=DEMUC_IDS, help="Comma-separated đề mục ids (default: $DEMUC_IDS)")
+    args = parser.parse_args(argv)
+
     selected_ids = None
-    if DEMUC_IDS:
-        selected_ids = [x.strip() for x in DEMUC_IDS.split(',') if x.strip()]
+    if args.demuc_ids:
+        selected_ids = [x.strip() for x in args.demuc_ids.split(',') if x.strip()]
 
     query = PDDeMuc.select()
     if selected_ids:
@@ -138,6 +180,7 @@ def main():
 
     print(f"Target backend: {BACKEND_URL}")
     print(f"Auto-embed: {AUTO_EMBED}")
+    print(f"Split clauses/points: {SPLIT_CLAUSES}")
     if selected_ids:
         print(f"Filtering DeMuc IDs: {selected_ids}")
 
@@ -0,0 +1,80 @@
+"""
+Export the crawled MySQL corpus to a Parquet snapshot, or load one back.
+
+Usage (from law-crawler/):
+  python -m scripts.snapshot_corpus --export snapshots/2024-06 [--row-group 10000] [--tables pddieu,vbpl]
+  python -m scripts.snapshot_corpus --import snapshots/2024-06 [--replace] [--batch 5000] [--tables ...]
+  python -m scripts.snapshot_corpus --info snapshots/2024-06
+
+Config via env:
+  MYSQL_* (see db.py)
+
+Covers the Pháp điển tables (PDChuDe ... PDMucLienQuan) plus vbpl and
+vb_chimuc; see snapshot.py for the format. Setting up a dev or staging
+database is then ``docker compose up -d`` and one --import instead of a
+full crawl. Missing tables are created from the statement stored in the
+manifest; --replace truncates existing ones first, otherwise rows are
+appended. build_bm25_index --snapshot reads a snapshot without MySQL.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+from db import db
+from snapshot import TABLES, export_snapshot, import_snapshot, read_manifest
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def print_info(path):
+    manifest = read_manifest(path)
+    print(f"Snapshot {path} ({manifest['created_at']}, row groups of {manifest['row_group_size']})")
+    for table, entry in manifest["tables"].items():
+        size = os.path.getsize(os.path.join(path, entry["file"]))
+        print(f"  {table:<15} {entry['rows']:>10} rows  {size / 1e6:10.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parquet snapshot export/import of the MySQL corpus")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--export", metavar="DIR", help="Write a snapshot into DIR")
+    mode.add_argument("--import", dest="import_dir", metavar="DIR", help="Load the snapshot in DIR")
+    mode.add_argument("--info", metavar="DIR", help="Print the tables and sizes of a snapshot")
+    parser.add_argument("--tables", help="Comma-separated subset of: " + ",".join(TABLES))
+    parser.add_argument("--row-group", type=int, default=10000, help="Rows per Parquet row group (export)")
+    parser.add_argument("--batch", type=int, default=5000, help="Rows per INSERT batch (import)")
+    parser.add_argument("--replace", action="store_true", help="Truncate existing tables before loading")
+    args = parser.parse_args(argv)
+
+    if args.info:
+        print_info(args.info)
+        return
+
+    tables = [t.strip().lower() for t in args.tables.split(",")] if args.tables else None
+    unknown = set(tables or []) - set(TABLES)
+    if unknown:
+        parser.error(f"unknown tables: {', '.join(sorted(unknown))}")
+
+    db.connect(reuse_if_open=True)
+    conn = db.connection()
+    started = time.time()
+    if args.export:
+        manifest = export_snapshot(conn, args.export, tables or TABLES, args.row_group)
+        total = sum(e["rows"] for e in manifest["tables"].values())
+        print(f"Exported {total} rows to {args.export}")
+    else:
+        import_snapshot(conn, args.import_dir, tables, args.replace, args.batch)
+        print(f"Imported {args.import_dir}")
+    print(f"Took {time.time() - started:.1f}s, peak RSS {peak_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(1)
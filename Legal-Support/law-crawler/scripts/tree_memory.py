@@ -0,0 +1,138 @@
+"""
+Compare the memory of the jdAllTree node list as parsed dicts and as a NodeStore.
+
+Usage (from law-crawler/):
+  python -m scripts.tree_memory [--tree phap-dien/treeNode.json] [--workers 4]
+  python -m scripts.tree_memory --synthetic 80000 [--workers 4]
+
+Each representation is loaded in a fresh interpreter, which reports its
+load time and peak RSS. With --workers it then forks that many workers that
+each read every node once (as crawl-phapdien does) and reports how much of
+the parent's memory each worker had to copy (Private_Dirty, Linux only).
+--synthetic writes a tree of that many nodes shaped like jdAllTree (12-60
+character MAPC, Chương/Điều titles, ~300 đề mục) to a temporary file, for
+when the real phap-dien/ is not at hand.
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+
+MODES = ("dicts", "store")
+
+_nodes = None
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def private_dirty_mb():
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Private_Dirty:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def write_synthetic(path, count, demucs=300, seed=1):
+    rng = random.Random(seed)
+    demuc_ids = [f"{rng.getrandbits(128):032x}" for _ in range(demucs)]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(count):
+            demuc = demuc_ids[i * demucs // count]
+            if i % 25 == 0:
+                node = {"MAPC": f"{rng.getrandbits(40):012d}"[:12], "TEN": f"Chương {i // 25 % 20 + 1}. Quy định chung",
+                        "ChiMuc": "IVX"[i % 3], "DeMucID": demuc}
+            else:
+                node = {"MAPC": f"{rng.getrandbits(160):048d}"[:rng.randint(24, 60)],
+                        "TEN": f"Điều {i % 200 + 1}.{i % 9 + 1}.LQ.{i % 97}. "
+                               + "Phạm vi điều chỉnh và đối tượng áp dụng của văn bản"[:rng.randint(20, 50)],
+                        "ChiMuc": str(i % 200 + 1), "DeMucID": demuc}
+            f.write(("," if i else "") + json.dumps(node, ensure_ascii=False))
+        f.write("]")
+
+
+def _read_all(_):
+    before = private_dirty_mb()
+    n = 0
+    if isinstance(_nodes, list):
+        for node in _nodes:
+            n += len(node["TEN"]) + len(node["MAPC"]) + len(node["DeMucID"])
+    else:
+        for node in _nodes:
+            n += len(node.ten) + len(node.mapc) + len(node.demuc_id)
+    return private_dirty_mb() - before
+
+
+def measure(mode, path, workers):
+    """Runs in the child interpreter; prints one JSON line."""
+    global _nodes
+    started = time.time()
+    if mode == "dicts":
+        with open(path, "r", encoding="utf-8") as f:
+            _nodes = json.load(f)
+    else:
+        from phapdien_tree import NodeStore
+        _nodes = NodeStore.load(path)
+    result = {"mode": mode, "nodes": len(_nodes), "load_s": time.time() - started, "peak_rss_mb": peak_rss_mb()}
+    if workers:
+        with get_context("fork").Pool(workers) as pool:
+            copied = pool.map(_read_all, range(workers))
+        result["copied_per_worker_mb"] = sum(copied) / len(copied)
+    print(json.dumps(result))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Peak RSS of the jdAllTree node list: dicts vs NodeStore")
+    parser.add_argument("--tree", default="phap-dien/treeNode.json", help="treeNode.json to load")
+    parser.add_argument("--synthetic", type=int, default=0, help="Measure a generated tree of N nodes instead")
+    parser.add_argument("--workers", type=int, default=0, help="Forked readers per representation")
+    parser.add_argument("--measure", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        measure(args.measure, args.tree, args.workers)
+        return
+
+    path = args.tree
+    tmp = None
+    if args.synthetic:
+        tmp = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
+        tmp.close()
+        path = tmp.name
+        write_synthetic(path, args.synthetic)
+    try:
+        print(f"{path}: {os.path.getsize(path) / 1e6:.1f} MB")
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, "-m", "scripts.tree_memory", "--measure", mode, "--tree", path,
+                 "--workers", str(args.workers)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            line = f"  {mode:<6} {r['nodes']} nodes, load {r['load_s']:.2f}s, peak RSS {r['peak_rss_mb']:.0f} MB"
+            if "copied_per_worker_mb" in r:
+                line += f", {r['copied_per_worker_mb']:.1f} MB copied per forked worker"
+            print(line)
+    finally:
+        if tmp:
+            os.unlink(tmp.name)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(1)
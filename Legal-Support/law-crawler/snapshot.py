@@ -0,0 +1,179 @@
+"""
+Columnar (Parquet) snapshots of the crawled MySQL corpus.
+
+A snapshot is a directory with one zstd-compressed Parquet file per table
+and a ``manifest.json`` (row counts, column types and the table's
+``SHOW CREATE TABLE``). Rows are streamed through an unbuffered cursor and
+written one row group at a time; loading reads one row group at a time and
+inserts it with a multi-row ``executemany``. Memory stays around one row
+group in both directions, whatever the table size.
+
+Other tools can read a snapshot without a database:
+
+  for mapc, ten, noidung in iter_rows("snapshots/2024-06", "pddieu", ["mapc", "ten", "noidung"]):
+      ...
+"""
+
+import datetime
+import json
+import os
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+# Parents first, so a load with foreign key checks on would also work.
+TABLES = [
+    "pdchude", "pddemuc", "pdchuong", "pddieu", "pdtable", "pdfile", "pdmuclienquan",
+    "vbpl", "vb_chimuc",
+]
+
+
+def arrow_type(data_type):
+    """Arrow type for an information_schema DATA_TYPE."""
+    import pyarrow as pa
+
+    data_type = data_type.lower()
+    if data_type in ("tinyint", "smallint", "mediumint", "int", "integer", "bigint", "year"):
+        return pa.int64()
+    if data_type in ("float", "double", "real"):
+        return pa.float64()
+    if data_type in ("datetime", "timestamp"):
+        return pa.timestamp("us")
+    if data_type == "date":
+        return pa.date32()
+    if data_type.endswith("blob") or data_type in ("binary", "varbinary"):
+        return pa.binary()
+    return pa.string()  # text types, varchar, decimal, json, enum
+
+
+def table_columns(conn, table):
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = %s ORDER BY ordinal_position",
+            (table,),
+        )
+        return [(name, data_type) for name, data_type in cur.fetchall()]
+
+
+def create_statement(conn, table):
+    with conn.cursor() as cur:
+        cur.execute(f"SHOW CREATE TABLE `{table}`")
+        return cur.fetchone()[1]
+
+
+def export_table(conn, table, path, row_group_size=10000):
+    """Stream one table into a Parquet file; returns its manifest entry."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pymysql
+
+    columns = table_columns(conn, table)
+    schema = pa.schema([(name, arrow_type(data_type)) for name, data_type in columns])
+    entry = {
+        "file": os.path.basename(path),
+        "columns": columns,
+        "create": create_statement(conn, table),
+        "rows": 0,
+    }
+    select = ", ".join(f"`{name}`" for name, _ in columns)
+    cur = conn.cursor(pymysql.cursors.SSCursor)
+    try:
+        cur.execute(f"SELECT {select} FROM `{table}`")
+        with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+            while True:
+                rows = cur.fetchmany(row_group_size)
+                if not rows:
+                    break
+                arrays = [pa.array(col, type=field.type) for col, field in zip(zip(*rows), schema)]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema), row_group_size=row_group_size)
+                entry["rows"] += len(rows)
+    finally:
+        cur.close()
+    return entry
+
+
+def export_snapshot(conn, out, tables=TABLES, row_group_size=10000, log=print):
+    os.makedirs(out, exist_ok=True)
+    manifest = {
+        "version": FORMAT_VERSION,
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "row_group_size": row_group_size,
+        "tables": {},
+    }
+    for table in tables:
+        if not table_exists(conn, table):
+            log(f"  {table}: missing, skipped")
+            continue
+        entry = export_table(conn, table, os.path.join(out, table + ".parquet"), row_group_size)
+        manifest["tables"][table] = entry
+        log(f"  {table}: {entry['rows']} rows")
+    with open(os.path.join(out, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported snapshot version {manifest.get('version')}")
+    return manifest
+
+
+def iter_batches(path, table, columns=None, batch_size=10000):
+    """Yield lists of row tuples from a snapshot table, one batch at a time."""
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(os.path.join(path, table + ".parquet"))
+    for batch in pf.iter_batches(batch_size=batch_size, columns=columns):
+        yield list(zip(*(col.to_pylist() for col in batch.columns)))
+
+
+def iter_rows(path, table, columns=None, batch_size=10000):
+    for rows in iter_batches(path, table, columns, batch_size):
+        yield from rows
+
+
+def table_exists(conn, table):
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT 1 FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+            (table,),
+        )
+        return cur.fetchone() is not None
+
+
+def import_table(conn, path, table, entry, replace=False, batch_size=5000):
+    """Load one snapshot table; creates it from the manifest when missing."""
+    with conn.cursor() as cur:
+        if not table_exists(conn, table):
+            cur.execute(entry["create"])
+        elif replace:
+            cur.execute(f"TRUNCATE TABLE `{table}`")
+        names = [name for name, _ in entry["columns"]]
+        insert = (f"INSERT INTO `{table}` ({', '.join(f'`{n}`' for n in names)}) "
+                  f"VALUES ({', '.join(['%s'] * len(names))})")
+        loaded = 0
+        for rows in iter_batches(path, table, names, batch_size):
+            cur.executemany(insert, rows)  # pymysql rewrites this into multi-row INSERTs
+            conn.commit()
+            loaded += len(rows)
+    return loaded
+
+
+def import_snapshot(conn, path, tables=None, replace=False, batch_size=5000, log=print):
+    manifest = read_manifest(path)
+    with conn.cursor() as cur:
+        cur.execute("SET FOREIGN_KEY_CHECKS=0")
+    try:
+        for table in TABLES:
+            entry = manifest["tables"].get(table)
+            if entry is None or (tables and table not in tables):
+                continue
+            loaded = import_table(conn, path, table, entry, replace, batch_size)
+            log(f"  {table}: {loaded} rows")
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("SET FOREIGN_KEY_CHECKS=1")
+    return manifest
@@ -0,0 +1,212 @@
+"""
+Single-pass structure parser for Vietnamese legal text.
+
+``parse()`` scans a text once with one compiled regular expression and returns
+the Phần → Chương → Mục → Điều → Khoản → Điểm nodes in document order. Nodes
+only carry character offsets into the source string, so no segment text is
+copied until a caller asks for it with ``node_text()`` / ``own_text()``.
+
+The source may be plain text (PDDieu.noidung) or the marked ``noidung_text``
+written by the VBQPPL crawler; marker prefixes are skipped by the pattern and
+removed again by ``own_text()``.
+
+Level names match ``units.level`` in Legal-Supporter.
+"""
+
+import re
+
+PART = "part"
+CHAPTER = "chapter"
+SECTION = "section"
+ARTICLE = "article"
+CLAUSE = "clause"
+POINT = "point"
+
+LEVELS = (PART, CHAPTER, SECTION, ARTICLE, CLAUSE, POINT)
+RANK = {level: rank for rank, level in enumerate(LEVELS)}
+
+# Points follow the Vietnamese alphabet: no f, j, w, z and "đ" after "d".
+POINT_LETTERS = "abcdđeghiklmnopqrstuvxy"
+_NEXT_POINT = {a: b for a, b in zip(POINT_LETTERS, POINT_LETTERS[1:])}
+
+_STRUCTURE_RE = re.compile(
+    r"^(?:[A-Z]*\t)?[ \t]*(?:"
+    r"(?P<part>phần\s+(?P<part_no>thứ\s+[^\s.:]+|[ivxlc]+\b|\d+\b))"
+    r"|(?P<chapter>chương\s+(?P<chapter_no>[ivxlc]+|\d+)\b)"
+    r"|(?P<section>mục\s+(?P<section_no>\d+|[ivxlc]+)\b)"
+    r"|(?P<article>[đð]iều\s+(?P<article_no>\d+[a-zđ]?)\b)"
+    r"|(?P<clause_no>\d{1,3})\.\s"
+    r"|(?P<point_no>[a-zđ])\)\s"
+    r")",
+    re.IGNORECASE | re.MULTILINE,
+)
+_MARKER_PREFIX_RE = re.compile(r"^[A-Z]*\t", re.MULTILINE)
+
+
+class Node:
+    """A structural node. ``start``/``end`` delimit the whole subtree and
+    ``own_end`` is where the first child starts (``end`` for leaves)."""
+
+    __slots__ = ("level", "label", "start", "own_end", "end", "parent")
+
+    def __init__(self, level, label, start, parent):
+        self.level = level
+        self.label = label
+        self.start = start
+        self.own_end = -1
+        self.end = -1
+        self.parent = parent
+
+    def __repr__(self):
+        return f"Node({self.level} {self.label!r} [{self.start}:{self.own_end}:{self.end}] parent={self.parent})"
+
+
+def parse(text, inside_article=False):
+    """Return the structure nodes of ``text`` in document order.
+
+    ``parent`` is the index of the parent node or -1. Khoản and Điểm are only
+    recognised inside an Điều and only when their numbering continues the
+    previous sibling (1, 2, 3 / a, b, c), which keeps numbered lists in
+    preambles and tables from being mistaken for clauses. Pass
+    ``inside_article=True`` when the text is the body of a single article
+    (e.g. PDDieu.noidung) so top-level clauses are accepted.
+    """
+    nodes = []
+    stack = []  # indexes of open nodes, outermost first
+    # Per open article/clause: last clause number and last point letter seen.
+    last_clause = {-1: 0} if inside_article else {}
+    last_point = {-1: None} if inside_article else {}
+
+    def open_node(level, label, start):
+        rank = RANK[level]
+        while stack and RANK[nodes[stack[-1]].level] >= rank:
+            _close(nodes, stack.pop(), start)
+        parent = stack[-1] if stack else -1
+        if parent >= 0 and nodes[parent].own_end < 0:
+            nodes[parent].own_end = start
+        nodes.append(Node(level, label, start, parent))
+        stack.append(len(nodes) - 1)
+        return len(nodes) - 1
+
+    def current(level):
+        for idx in reversed(stack):
+            if nodes[idx].level == level:
+                return idx
+        return -1 if inside_article and level == ARTICLE else None
+
+    for m in _STRUCTURE_RE.finditer(text):
+        start = m.start()
+        if m.group("part"):
+            open_node(PART, m.group("part_no"), start)
+        elif m.group("chapter"):
+            open_node(CHAPTER, m.group("chapter_no").upper(), start)
+        elif m.group("section"):
+            open_node(SECTION, m.group("section_no"), start)
+        elif m.group("article"):
+            idx = open_node(ARTICLE, m.group("article_no"), start)
+            last_clause[idx] = 0
+            last_point[idx] = None
+        elif m.group("clause_no"):
+            article = current(ARTICLE)
+            number = int(m.group("clause_no"))
+            if article is None or number != last_clause[article] + 1:
+                continue
+            while stack and stack[-1] != article:
+                _close(nodes, stack.pop(), start)
+            idx = open_node(CLAUSE, str(number), start)
+            last_clause[article] = number
+            last_point[idx] = None
+        else:
+            letter = m.group("point_no").lower()
+            owner = current(CLAUSE)
+            if owner is None:
+                owner = current(ARTICLE)
+            if owner is None:
+                continue
+            previous = last_point[owner]
+            expected = "a" if previous is None else _NEXT_POINT.get(previous)
+            if letter != expected:
+                continue
+            while stack and stack[-1] != owner:
+                _close(nodes, stack.pop(), start)
+            open_node(POINT, letter, start)
+            last_point[owner] = letter
+
+    while stack:
+        _close(nodes, stack.pop(), len(text))
+    return nodes
+
+
+def _close(nodes, idx, end):
+    node = nodes[idx]
+    node.end = end
+    if node.own_end < 0:
+        node.own_end = end
+
+
+def node_text(text, node):
+    """Text of the whole subtree, markers removed."""
+    return strip_markers(text[node.start:node.end]).strip()
+
+
+def own_text(text, node):
+    """Heading and lead-in of a node up to its first child, markers removed."""
+    return strip_markers(text[node.start:node.own_end]).strip()
+
+
+def strip_markers(text):
+    return _MARKER_PREFIX_RE.sub("", text)
+
+
+def path_labels(nodes, idx):
+    """Labels from the outermost ancestor down to ``nodes[idx]``."""
+    labels = []
+    while idx >= 0:
+        labels.append(nodes[idx].label)
+        idx = nodes[idx].parent
+    return labels[::-1]
+
+
+PATH_LABEL_WIDTH = 5
+
+
+def tree_keys(items):
+    """Materialized-path keys for a flat tree given as ``(key, parent_key, order)``.
+
+    Returns ``{key: (labels, depth, doc_order)}``. ``labels`` are the
+    zero-padded sibling ranks from the root down, so sorting the joined path
+    (``path_string``) is document order and a subtree shares its root's
+    prefix; ``depth`` is 0 for roots and ``doc_order`` the pre-order
+    position. Siblings are ranked by ``order`` then input position, the way
+    Legal-Supporter orders units by ``order_index, created_at``. A parent
+    missing from ``items`` makes the node a root; nodes on a parent cycle
+    are left out.
+    """
+    keys = {key for key, _, _ in items}
+    children = {}
+    for pos, (key, parent, order) in enumerate(items):
+        if parent not in keys or parent == key:
+            parent = None
+        children.setdefault(parent, []).append((order or 0, pos, key))
+
+    result = {}
+    stack = [(None, ())]
+    while stack:
+        key, labels = stack.pop()
+        if key is not None:
+            result[key] = (labels, len(labels) - 1, len(result))
+        kids = sorted(children.get(key, ()))
+        for rank in range(len(kids) - 1, -1, -1):
+            stack.append((kids[rank][2], labels + (f"{rank + 1:0{PATH_LABEL_WIDTH}d}",)))
+    return result
+
+
+def path_string(labels, prefix=None):
+    """Dotted path (ltree syntax) for ``labels``, optionally under ``prefix``."""
+    path = ".".join(labels)
+    return f"{prefix}.{path}" if prefix else path
+
+
+def document_label(document_id):
+    """Root label of a document's unit paths in Legal-Supporter (``units.path``)."""
+    return "d" + str(document_id).replace("-", "")
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The crawler modules are flat files at the law-crawler root (see lawcrawler/cli.py).
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,111 @@
+import asyncio
+import os
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from attachments import DONE, ERROR, NOT_MODIFIED, ContentStore, extension, fetch_all
+
+FORM = b"PK\x03\x04 mau so 01" * 1000
+
+
+class Site:
+    """Attachment host that records conditional headers and concurrent requests."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.requests = []
+
+    async def handle(self, request):
+        self.requests.append((request.path, request.headers.get("If-None-Match")))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            name = request.match_info["name"]
+            if name.startswith("missing"):
+                raise web.HTTPNotFound()
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            body = FORM if name.startswith("form") else name.encode() * 100
+            return web.Response(body=body, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        finally:
+            self.active -= 1
+
+
+def fetch(site, store, jobs, **kwargs):
+    async def run():
+        app = web.Application()
+        app.router.add_get("/files/{name}", site.handle)
+        async with TestServer(app) as server:
+            return [r async for r in fetch_all(
+                [(str(server.make_url(path)), previous) for path, previous in jobs], store, **kwargs)]
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ContentStore(str(tmp_path / "attachments"))
+
+
+def stored_files(store):
+    return sorted(os.path.join(d, f) for d, _, files in os.walk(store.root) for f in files
+                  if not d.endswith("tmp"))
+
+
+def test_same_content_is_stored_once(store):
+    results = fetch(Site(), store, [("/files/form-a.docx", None), ("/files/form-b.docx", None),
+                                    ("/files/other.docx", None)])
+    by_url = {r["url"].rsplit("/", 1)[1]: r for r in results}
+    assert {r["status"] for r in results} == {DONE}
+    assert by_url["form-a.docx"]["path"] == by_url["form-b.docx"]["path"]
+    assert by_url["form-a.docx"]["url_hash"] != by_url["form-b.docx"]["url_hash"]
+    assert by_url["form-a.docx"]["size"] == len(FORM)
+    assert len(stored_files(store)) == 2
+    assert os.listdir(os.path.join(store.root, "tmp")) == []
+
+
+def test_per_host_limit(store):
+    site = Site(delay=0.05)
+    results = fetch(site, store, [(f"/files/f{i}.pdf", None) for i in range(12)], concurrency=8, per_host=3)
+    assert len(results) == 12
+    assert site.peak == 3
+
+
+def test_not_modified_keeps_stored_file(store):
+    site = Site()
+    (first,) = fetch(site, store, [("/files/form.docx", None)])
+    (second,) = fetch(site, store, [("/files/form.docx", first)])
+    assert site.requests[-1] == ("/files/form.docx", '"v1"')
+    assert second["status"] == NOT_MODIFIED
+    assert (second["path"], second["checksum"]) == (first["path"], first["checksum"])
+
+
+def test_missing_stored_file_is_downloaded_again(store):
+    site = Site()
+    (first,) = fetch(site, store, [("/files/form.docx", None)])
+    os.remove(os.path.join(store.root, first["path"]))
+    (second,) = fetch(site, store, [("/files/form.docx", first)])
+    assert site.requests[-1] == ("/files/form.docx", None)  # no conditional request
+    assert second["status"] == DONE
+    assert store.exists(second["path"])
+
+
+def test_http_error(store):
+    (result,) = fetch(Site(), store, [("/files/missing.pdf", None)])
+    assert result["status"] == ERROR
+    assert result["error"] == "HTTP 404"
+    assert "path" not in result
+
+
+@pytest.mark.parametrize("url, content_type, expected", [
+    ("https://host/files/Mau%2001.DOCX", None, ".docx"),
+    ("https://host/download?id=5", "application/pdf; charset=binary", ".pdf"),
+    ("https://host/download", None, ""),
+    ("https://host/a.b/file", None, ""),
+])
+def test_extension(url, content_type, expected):
+    assert extension(url, content_type) == expected
@@ -0,0 +1,73 @@
+import math
+
+import numpy as np
+import pytest
+
+from bm25_index import BM25Index, build_index, terms_of
+
+CORPUS = [
+    ("d1", "Người điều khiển xe vượt đèn đỏ bị phạt tiền"),
+    ("d2", "Đèn tín hiệu màu đỏ; xe phải dừng lại trước vạch"),
+    ("d3", "Không đội mũ bảo hiểm khi điều khiển xe mô tô"),
+    ("d4", "Hồ sơ đăng ký kinh doanh"),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    meta = build_index(CORPUS, str(tmp_path / "units"))
+    assert meta["n_docs"] == 4
+    return BM25Index(str(tmp_path / "units"))
+
+
+def test_terms_of_adds_folded_bigrams():
+    assert terms_of("Vượt đèn đỏ") == ["vuot", "den", "do", "vuot den", "den do"]
+    assert terms_of("Vượt đèn đỏ", bigrams=False) == ["vuot", "den", "do"]
+
+
+def test_load_is_memory_mapped(index):
+    assert isinstance(index._post_doc, np.memmap)
+    assert isinstance(index._post_w, np.memmap)
+    assert [index.doc_id(i) for i in range(index.n_docs)] == ["d1", "d2", "d3", "d4"]
+    assert index.find_term("den do") >= 0
+    assert index.find_term("khong co") == -1
+
+
+def test_phrase_match_ranks_first(index):
+    results = index.search("vượt đèn đỏ", k=10)
+    assert [doc_id for doc_id, _ in results] == ["d1", "d2"]
+    assert results[0][1] > results[1][1] > 0
+
+    assert [doc_id for doc_id, _ in index.search("điều khiển xe", k=10)][:2] == ["d1", "d3"]
+    assert [doc_id for doc_id, _ in index.search("điều khiển xe", k=1)] == ["d1"]
+    assert index.search("thuế thu nhập") == []
+
+
+def test_weight_matches_bm25(index):
+    # "kinh" appears once in d4 only: idf * (k1 + 1) / (1 + k1 * (1 - b + b * len / avg_len)).
+    k1, b = index.meta["k1"], index.meta["b"]
+    n_docs, avg_len = index.meta["n_docs"], index.meta["avg_len"]
+    length = len(terms_of(CORPUS[3][1]))
+    idf = math.log1p((n_docs - 1 + 0.5) / (1 + 0.5))
+    expected = idf * (k1 + 1) / (1 + k1 * (1 - b + b * length / avg_len))
+
+    docs, weights = index.postings("kinh")
+    assert list(docs) == [3]
+    assert weights[0] == pytest.approx(expected, rel=1e-6)
+    assert index.search("kinh")[0] == ("d4", pytest.approx(expected, rel=1e-6))
+
+
+def test_empty_index(tmp_path):
+    meta = build_index([], str(tmp_path / "empty"))
+    assert meta["n_docs"] == 0 and meta["n_terms"] == 0
+
+    index = BM25Index(str(tmp_path / "empty"))
+    assert index.find_term("den") == -1
+    assert index.search("vượt đèn đỏ") == []
+
+
+def test_rejects_unknown_version(tmp_path):
+    build_index(CORPUS, str(tmp_path / "units"))
+    (tmp_path / "units" / "meta.json").write_text('{"version": 99}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        BM25Index(str(tmp_path / "units"))
@@ -0,0 +1,48 @@
+import pytest
+
+from citations import (SCOPE_NUMBER, SCOPE_SAME_DOC, SCOPE_THIS_ARTICLE, SCOPE_TITLE, find_references,
+                       normalize_doc_number, title_candidates)
+
+
+def refs(text):
+    return [(r.point, r.clause, r.article, r.scope, r.doc_number or r.doc_title) for r in find_references(text)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("theo quy định tại Điều 5", [(None, None, "5", SCOPE_SAME_DOC, None)]),
+    ("khoản 2 Điều 12a của Luật này", [(None, "2", "12a", SCOPE_SAME_DOC, None)]),
+    ("điểm đ khoản 3 Điều 7", [("đ", "3", "7", SCOPE_SAME_DOC, None)]),
+    ("quy định tại khoản 1 Điều này", [(None, "1", None, SCOPE_THIS_ARTICLE, None)]),
+    ("áp dụng Điều này", []),
+    ("Điều 5 Nghị định số 100/2019/nđ-cp", [(None, None, "5", SCOPE_NUMBER, "100/2019/ND-CP")]),
+    ("Điều 12 Luật Giao thông đường bộ năm 2008",
+     [(None, None, "12", SCOPE_TITLE, "luat giao thong duong bo")]),
+    ("Điều 3 và Điều 4 Luật số 23/2008/QH12",
+     [(None, None, "3", SCOPE_SAME_DOC, None), (None, None, "4", SCOPE_NUMBER, "23/2008/QH12")]),
+    ("tại Điều 12.", [(None, None, "12", SCOPE_SAME_DOC, None)]),
+    # A codified heading is not a reference to its first number.
+    ("Điều 1.1.LQ.12. Phạm vi điều chỉnh", []),
+    ("Điều 3.2.NĐ.1. Giải thích từ ngữ theo Điều 4", [(None, None, "4", SCOPE_SAME_DOC, None)]),
+])
+def test_find_references(text, expected):
+    assert refs(text) == expected
+
+
+def test_reference_span():
+    text = "Vi phạm khoản 2 Điều 5 thì bị phạt"
+    (ref,) = find_references(text)
+    assert text[ref.start:ref.end] == "khoản 2 Điều 5"
+
+
+@pytest.mark.parametrize("number, expected", [
+    ("100/2019/nđ-cp", "100/2019/ND-CP"),
+    ("23/2008/ QH12", "23/2008/QH12"),
+])
+def test_normalize_doc_number(number, expected):
+    assert normalize_doc_number(number) == expected
+
+
+def test_title_candidates():
+    assert list(title_candidates("luat giao thong duong bo")) == [
+        "luat giao thong duong bo", "luat giao thong duong", "luat giao thong", "luat giao",
+    ]
@@ -0,0 +1,41 @@
+import pytest
+
+from scripts.dedupe_texts import article_body, chimuc_articles
+from textnorm import content_hash
+
+# (id_vb, id, chi_muc_cha, noi_dung, cap) as split_document writes them.
+CHIMUC = [
+    (1, 10, None, "Chương I\nQUY ĐỊNH CHUNG", "chapter"),
+    (1, 11, 10, "Điều 1. Phạm vi điều chỉnh\nLuật này quy định:", "article"),
+    (1, 12, 11, "1. Quy tắc giao thông;", "clause"),
+    (1, 13, 12, "a) Đường bộ;", "point"),
+    (1, 14, 11, "2. Xử lý vi phạm.", "clause"),
+    (1, 15, 10, "Điều 2. Đối tượng áp dụng", "article"),
+    (2, 20, None, "Điều 1. Phạm vi\nVăn bản khác.", "article"),
+]
+
+
+def test_chimuc_articles_rebuilds_subtrees():
+    assert list(chimuc_articles(CHIMUC)) == [
+        "Điều 1. Phạm vi điều chỉnh\nLuật này quy định:\n1. Quy tắc giao thông;\na) Đường bộ;\n2. Xử lý vi phạm.",
+        "Điều 2. Đối tượng áp dụng",
+        "Điều 1. Phạm vi\nVăn bản khác.",
+    ]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Điều 1.1.LQ.1. Phạm vi điều chỉnh\nLuật này quy định:", "Luật này quy định:"),
+    ("Điều 5a. Sửa đổi", ""),
+    ("Luật này quy định:", "Luật này quy định:"),
+    ("Theo Điều 5 Luật này.", "Theo Điều 5 Luật này."),
+    (None, ""),
+])
+def test_article_body(text, expected):
+    assert article_body(text) == expected
+
+
+def test_same_article_hashes_equal_across_sources():
+    pddieu = "Điều 1.1.LQ.1. Phạm vi điều chỉnh\nLuật này quy định:\n1. Quy tắc giao thông;\n" \
+             "a) Đường bộ;\n2. Xử lý vi phạm."
+    chimuc = next(chimuc_articles(CHIMUC))
+    assert content_hash(article_body(pddieu)) == content_hash(article_body(chimuc))
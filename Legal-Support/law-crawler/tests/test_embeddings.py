@@ -0,0 +1,101 @@
+import math
+import threading
+
+import pytest
+
+from embeddings import LocalProvider, get_provider, vector_literal
+from scripts import backfill_embeddings
+from scripts.backfill_embeddings import embed_batches, embed_with_retry
+
+
+def test_local_provider_is_deterministic_and_normalized():
+    provider = LocalProvider(dimensions=64)
+    a, b, c = provider.embed_batch(["Người điều khiển xe mô tô", "người  điều khiển XE MÔ TÔ", "vượt đèn đỏ"])
+    assert len(a) == 64
+    assert a == b  # same folded tokens, same vector
+    assert a != c
+    assert math.isclose(math.sqrt(sum(v * v for v in a)), 1.0)
+
+
+def test_local_provider_empty_text():
+    assert LocalProvider(dimensions=8).embed_batch([""]) == [[0.0] * 8]
+
+
+def test_get_provider_local(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "local")
+    provider = get_provider(dimensions=16)
+    assert isinstance(provider, LocalProvider)
+    assert (provider.model, provider.dimensions) == ("local-hash-768", 16)
+    with pytest.raises(ValueError):
+        get_provider("nope")
+
+
+def test_vector_literal():
+    assert vector_literal([0.5, -1.0, 1e-9]) == "[0.5,-1,1e-09]"
+
+
+class CountingProvider(LocalProvider):
+    def __init__(self, dimensions=8):
+        super().__init__(dimensions=dimensions)
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def embed_batch(self, texts):
+        with self._lock:
+            self.batches.append(list(texts))
+        return super().embed_batch(texts)
+
+
+@pytest.mark.parametrize("batch_size, concurrency", [(1, 1), (3, 2), (4, 8), (100, 4)])
+def test_embed_batches(batch_size, concurrency):
+    texts = {f"h{i}": f"điều {i} khoản {i % 3}" for i in range(10)}
+    provider = CountingProvider()
+
+    results = list(embed_batches(provider, texts, sorted(texts), batch_size, concurrency))
+
+    assert all(len(batch) <= batch_size for batch in provider.batches)
+    assert len(provider.batches) == math.ceil(len(texts) / batch_size)
+    embedded = {h: v for batch, vectors in results for h, v in zip(batch, vectors)}
+    assert embedded.keys() == texts.keys()
+    reference = LocalProvider(dimensions=8)
+    for h, vector in embedded.items():
+        assert vector == reference.embed_batch([texts[h]])[0]
+
+
+def test_embed_batches_nothing_to_do():
+    assert list(embed_batches(CountingProvider(), {}, [], 64, 4)) == []
+
+
+class FlakyProvider(LocalProvider):
+    def __init__(self, failures, vectors=None):
+        super().__init__(dimensions=4)
+        self.failures = failures
+        self.vectors = vectors
+        self.calls = 0
+
+    def embed_batch(self, texts):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("rate limited")
+        return self.vectors if self.vectors is not None else super().embed_batch(texts)
+
+
+def test_embed_with_retry_recovers(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(backfill_embeddings.time, "sleep", sleeps.append)
+    provider = FlakyProvider(failures=2)
+    assert len(embed_with_retry(provider, ["a", "b"])) == 2
+    assert provider.calls == 3
+    assert sleeps == [1, 2]
+
+
+@pytest.mark.parametrize("provider, error", [
+    (FlakyProvider(failures=10), ConnectionError),
+    (FlakyProvider(failures=0, vectors=[[0.0] * 4]), ValueError),         # one vector for two texts
+    (FlakyProvider(failures=0, vectors=[[0.0] * 3, [0.0] * 3]), ValueError),  # wrong dimensions
+])
+def test_embed_with_retry_gives_up(monkeypatch, provider, error):
+    monkeypatch.setattr(backfill_embeddings.time, "sleep", lambda s: None)
+    with pytest.raises(error):
+        embed_with_retry(provider, ["a", "b"])
+    assert provider.calls == backfill_embeddings.MAX_RETRIES
@@ -0,0 +1,134 @@
+import fakeredis
+import pytest
+
+from frontier import DEAD, DONE, LEASED, PENDING, RedisFrontier
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis()
+
+
+def make_frontier(client, **kwargs):
+    return RedisFrontier(client, prefix="test", **kwargs)
+
+
+def test_claim_orders_by_priority_and_leases_items(client):
+    f = make_frontier(client)
+    assert f.add([3, 1, 2]) == 3
+    assert f.add([9], priority=10) == 1
+    assert f.add([1, 9]) == 0
+
+    assert f.claim("a", limit=2) == ["9", "1"]
+    assert f.claim("b", limit=10) == ["2", "3"]
+    assert f.claim("c") == []
+    assert f.stats() == {PENDING: 0, LEASED: 4, DONE: 0, DEAD: 0}
+
+
+def test_complete_only_by_lease_owner(client):
+    f = make_frontier(client)
+    f.add([1])
+    f.claim("a")
+
+    f.complete("b", 1)
+    assert f.stats()[LEASED] == 1
+    f.complete("a", 1)
+    assert f.stats() == {PENDING: 0, LEASED: 0, DONE: 1, DEAD: 0}
+    assert f.add([1]) == 0
+
+
+def test_expired_lease_is_handed_to_next_claimer(client):
+    f = make_frontier(client, lease_seconds=-1)
+    f.add([1])
+    assert f.claim("a") == ["1"]
+
+    assert f.claim("b") == ["1"]
+    f.complete("a", 1)
+    assert f.stats()[LEASED] == 1
+    f.complete("b", 1)
+    assert f.stats()[DONE] == 1
+
+
+def test_expired_lease_goes_dead_when_attempts_are_used_up(client):
+    f = make_frontier(client, lease_seconds=-1, max_attempts=2)
+    f.add([1])
+    assert f.claim("a") == ["1"]
+    assert f.claim("a") == ["1"]
+
+    assert f.claim("a") == []
+    assert f.stats() == {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 1}
+
+
+def test_fail_retries_until_dead(client):
+    f = make_frontier(client, max_attempts=3)
+    f.add([1])
+    for _ in range(2):
+        assert f.claim("a") == ["1"]
+        f.fail("a", 1, "timeout")
+        assert f.stats()[PENDING] == 1
+
+    assert f.claim("a") == ["1"]
+    f.fail("a", 1, "timeout")
+    assert f.stats() == {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 1}
+    assert client.hget("test:errors", "1") == b"timeout"
+
+
+def test_permanent_fail_and_foreign_owner(client):
+    f = make_frontier(client)
+    f.add([1])
+    f.claim("a")
+
+    f.fail("b", 1, "not mine", permanent=True)
+    assert f.stats()[LEASED] == 1
+    f.fail("a", 1, "404", permanent=True)
+    assert list(f.ids_in_state(DEAD)) == ["1"]
+
+
+def test_requeue_dead_keeps_priority_and_depth(client):
+    f = make_frontier(client, max_attempts=1)
+    f.add([1])
+    f.cite({2: 3}, depth=1)
+    assert f.claim("a", limit=2) == ["2", "1"]
+    f.fail("a", 2, "timeout")
+    f.fail("a", 1, "timeout")
+    assert f.stats()[DEAD] == 2
+
+    assert f.requeue_dead() == 2
+    assert f.stats() == {PENDING: 2, LEASED: 0, DONE: 0, DEAD: 0}
+    assert f.depths([1, 2]) == {"1": 0, "2": 1}
+    assert f.claim("a", limit=2) == ["2", "1"]
+    assert client.hget("test:attempts", "2") == b"1"
+    assert f.requeue_dead() == 0
+
+
+def test_cite_bumps_pending_priority_and_keeps_smallest_depth(client):
+    f = make_frontier(client)
+    f.add([1, 2])
+    assert f.cite({2: 2, 5: 1}, depth=2) == 1
+    assert f.cite({5: 3}, depth=1) == 0
+
+    assert f.claim("a", limit=3) == ["5", "2", "1"]
+    assert f.depths([1, 2, 5]) == {"1": 0, "2": 0, "5": 1}
+
+
+def test_cite_skips_done_and_leased_items(client):
+    f = make_frontier(client)
+    f.add([1, 2])
+    f.mark_done([1])
+    f.claim("a", limit=1)
+
+    assert f.cite({1: 5, 2: 5}, depth=1) == 0
+    assert f.stats() == {PENDING: 0, LEASED: 1, DONE: 1, DEAD: 0}
+
+
+def test_mark_done_clears_lease_bookkeeping(client):
+    f = make_frontier(client)
+    f.add([1, 2])
+    f.claim("a", limit=2)
+    f.fail("a", 2, "timeout")
+
+    f.mark_done([1, 2])
+    assert f.stats() == {PENDING: 0, LEASED: 0, DONE: 2, DEAD: 0}
+    for key in ("owners", "attempts", "errors"):
+        assert client.hlen(f"test:{key}") == 0
+    assert f.claim("a") == []
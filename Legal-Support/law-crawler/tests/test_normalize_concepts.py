@@ -0,0 +1,52 @@
+from scripts.normalize_concepts import apply_updates, plan
+
+
+class RecordingCursor:
+    """Enough of a psycopg2 cursor for execute_values: records the statements, values rendered with repr()."""
+
+    class connection:
+        encoding = "UTF8"
+
+    def __init__(self):
+        self.statements = []
+
+    def mogrify(self, template, args):
+        return (template % tuple(repr(a) for a in args)).encode()
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql.decode() if isinstance(sql, bytes) else sql)
+
+
+ROWS = [
+    # id, name, synonyms, keywords, name_key, triple count
+    ("11111111-1111-1111-1111-111111111111", "Người điều khiển", [], [], None, 5),
+    ("22222222-2222-2222-2222-222222222222", "nguoi dieu khien", [], [], None, 1),
+    ("33333333-3333-3333-3333-333333333333", "Xe mô tô", ["xe máy"], [], "xe mo to", 2),
+]
+
+
+def test_plan():
+    updates, merges = plan(ROWS, full=False)
+    assert merges == [(ROWS[1][0], ROWS[0][0])]
+    assert updates == [(ROWS[0][0], "nguoi dieu khien", ["nguoi dieu khien"], ["nguoi dieu khien"])]
+
+    updates, _ = plan(ROWS, full=True)
+    assert updates[-1] == (ROWS[2][0], "xe mo to", ["xe máy"], ["xe mo to", "xe may"])
+
+
+def test_apply_updates_writes_in_pages():
+    updates, _ = plan(ROWS, full=True)
+    cur = RecordingCursor()
+    apply_updates(cur, updates * 700)  # 1400 rows: two statements of at most 1000
+    assert len(cur.statements) == 2
+    assert cur.statements[0].count("::uuid") == 1000
+    sql = cur.statements[0]
+    assert "UPDATE concepts c" in sql
+    assert "('11111111-1111-1111-1111-111111111111'::uuid, 'nguoi dieu khien', " \
+           "['nguoi dieu khien']::text[], ['nguoi dieu khien']::text[])" in sql
+
+
+def test_apply_updates_nothing_to_do():
+    cur = RecordingCursor()
+    apply_updates(cur, [])
+    assert cur.statements == []
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from phrase_lexicon import PhraseLexicon, build_lexicon, lexicon_entries, read_phrases
+
+HELMET = "11111111-1111-1111-1111-111111111111"
+MOTORBIKE = "22222222-2222-2222-2222-222222222222"
+WEAR = "33333333-3333-3333-3333-333333333333"
+
+
+@pytest.fixture
+def lexicon(tmp_path):
+    entries = [
+        *lexicon_entries("concept", HELMET, "Mũ bảo hiểm", "object",
+                         exact=["Mũ bảo hiểm"], keywords=["bảo hiểm", "mũ bảo hiểm"]),
+        *lexicon_entries("concept", MOTORBIKE, "Xe mô tô", "subject",
+                         exact=["Xe mô tô"], synonyms=["xe máy", "mô tô"]),
+        *lexicon_entries("relation", WEAR, "đội", None, exact=["đội", "đội mũ"]),
+    ]
+    path = str(tmp_path / "lexicon")
+    meta = build_lexicon(entries, path, watermark={"concepts": 2})
+    assert meta["n_phrases"] == 7
+    return PhraseLexicon(path)
+
+
+def test_lexicon_entries_fold_and_dedupe():
+    pairs = list(lexicon_entries("concept", "id", "Mũ", "object", exact=["Mũ bảo hiểm"],
+                                 synonyms=["MŨ BẢO HIỂM", "x"], keywords=["bảo-hiểm"]))
+    assert [(p, e["match"], e["score"]) for p, e in pairs] == [
+        ("mu bao hiem", "exact", 1.0),
+        ("bao hiem", "keyword", 0.9),
+    ]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Không đội mũ bảo hiểm khi đi xe máy", [
+        ("doi", 1, 2), ("doi mu", 1, 3), ("mu bao hiem", 2, 5), ("bao hiem", 3, 5), ("xe may", 7, 9),
+    ]),
+    ("Người điều khiển XE MÔ TÔ", [("mo to", 4, 6), ("xe mo to", 3, 6)]),
+    ("vượt đèn đỏ", []),
+])
+def test_match(lexicon, text, expected):
+    assert sorted((m.phrase, m.start, m.end) for m in lexicon.match(text)) == sorted(expected)
+
+
+def test_candidates(lexicon):
+    candidates = lexicon.candidates("Không đội mũ bảo hiểm khi đi xe máy")
+    assert [(c["id"], c["match"], c["score"]) for c in candidates] == [
+        (WEAR, "exact", 1.0),
+        (HELMET, "exact", 1.0),
+        (MOTORBIKE, "synonym", 0.9),
+    ]
+
+
+def test_rebuild_from_phrases(lexicon, tmp_path):
+    path = str(tmp_path / "rebuilt")
+    extra = lexicon_entries("concept", "44444444-4444-4444-4444-444444444444", "Đèn đỏ", "object", exact=["đèn đỏ"])
+    build_lexicon([*read_phrases(lexicon.path), *extra], path)
+    rebuilt = PhraseLexicon(path)
+    assert len(rebuilt) == len(lexicon) + 1
+    assert [m.phrase for m in rebuilt.match("vượt đèn đỏ")] == ["den do"]
+
+
+def test_version_check(lexicon):
+    with open(f"{lexicon.path}/meta.json", "w") as f:
+        f.write('{"version": 99}')
+    with pytest.raises(ValueError):
+        PhraseLexicon(lexicon.path)
+
+
+def test_swap_in_keeps_a_complete_lexicon(tmp_path):
+    from scripts.build_phrase_lexicon import _swap_in
+
+    path = str(tmp_path / "phrase-lexicon")
+    build_lexicon(lexicon_entries("relation", WEAR, "đội", None, exact=["đội"]), path)  # pre-symlink layout
+
+    versions = []
+    for n in range(3):
+        entries = lexicon_entries("concept", HELMET, "Mũ bảo hiểm", "object", exact=["mũ bảo hiểm"])
+        _swap_in(entries, path, marks={"build": n})
+        versions.append(os.readlink(path))
+        assert PhraseLexicon(path).meta["watermark"] == {"build": n}
+
+    assert sorted(os.listdir(tmp_path)) == sorted(["phrase-lexicon", *versions[-2:]])
+    assert PhraseLexicon(path).path == str(tmp_path / versions[-1])
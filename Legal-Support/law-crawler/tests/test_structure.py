@@ -0,0 +1,98 @@
+import pytest
+
+from structure import own_text, node_text, parse, path_labels, path_string, tree_keys
+
+LAW = """Chương I
+QUY ĐỊNH CHUNG
+Điều 1. Phạm vi điều chỉnh
+Luật này quy định về:
+1. Quy tắc giao thông;
+a) Đường bộ;
+b) Đường sắt.
+2. Xử lý vi phạm.
+Điều 2. Đối tượng áp dụng
+Chương II
+QUY TẮC GIAO THÔNG
+Mục 1. Chung
+Điều 3. Nguyên tắc
+1. Tuân thủ quy tắc.
+3. Số này không liền mạch nên không phải khoản.
+"""
+
+
+def outline(text, **kwargs):
+    nodes = parse(text, **kwargs)
+    return [(n.level, n.label, ".".join(path_labels(nodes, i))) for i, n in enumerate(nodes)]
+
+
+def test_parse_law():
+    assert outline(LAW) == [
+        ("chapter", "I", "I"),
+        ("article", "1", "I.1"),
+        ("clause", "1", "I.1.1"),
+        ("point", "a", "I.1.1.a"),
+        ("point", "b", "I.1.1.b"),
+        ("clause", "2", "I.1.2"),
+        ("article", "2", "I.2"),
+        ("chapter", "II", "II"),
+        ("section", "1", "II.1"),
+        ("article", "3", "II.1.3"),
+        ("clause", "1", "II.1.3.1"),
+    ]
+
+
+def test_parse_text_offsets():
+    nodes = parse(LAW)
+    article = nodes[1]
+    assert own_text(LAW, article) == "Điều 1. Phạm vi điều chỉnh\nLuật này quy định về:"
+    assert node_text(LAW, nodes[2]) == "1. Quy tắc giao thông;\na) Đường bộ;\nb) Đường sắt."
+    assert node_text(LAW, nodes[-1]).endswith("không phải khoản.")
+
+
+@pytest.mark.parametrize("text, inside_article, expected", [
+    # Numbered lists outside an article are not clauses.
+    ("1. Một\n2. Hai\n", False, []),
+    ("1. Một\n2. Hai\n", True, [("clause", "1", "1"), ("clause", "2", "2")]),
+    # Points follow the Vietnamese alphabet: đ after d, no f.
+    ("a) A\nb) B\nc) C\nd) D\nđ) Đ\ne) E\n", True,
+     [("point", x, x) for x in ("a", "b", "c", "d", "đ", "e")]),
+    ("a) A\nc) C\n", True, [("point", "a", "a")]),
+    # Marked noidung_text (vbpl_text) parses the same way.
+    ("DIEU\tĐiều 5a. Sửa đổi\nKHOAN\t1. Nội dung\n", False,
+     [("article", "5a", "5a"), ("clause", "1", "5a.1")]),
+    ("PHAN\tPhần thứ nhất\nCHUONG\tChương IV\n", False,
+     [("part", "thứ nhất", "thứ nhất"), ("chapter", "IV", "thứ nhất.IV")]),
+])
+def test_parse_cases(text, inside_article, expected):
+    assert outline(text, inside_article=inside_article) == expected
+
+
+def test_marked_text_strips_markers():
+    text = "DIEU\tĐiều 1. Tên\n\tĐoạn dẫn\nKHOAN\t1. Khoản\n"
+    nodes = parse(text)
+    assert own_text(text, nodes[0]) == "Điều 1. Tên\nĐoạn dẫn"
+
+
+def test_tree_keys():
+    items = [
+        ("c1", None, 1),
+        ("a2", "c1", 2),
+        ("a1", "c1", 1),
+        ("k1", "a1", 0),
+        ("orphan", "missing", 5),
+        ("c0", None, 0),
+        ("x", "y", 0),  # parent cycle
+        ("y", "x", 0),
+    ]
+    keys = tree_keys(items)
+    assert keys == {
+        "c0": (("00001",), 0, 0),
+        "c1": (("00002",), 0, 1),
+        "a1": (("00002", "00001"), 1, 2),
+        "k1": (("00002", "00001", "00001"), 2, 3),
+        "a2": (("00002", "00002"), 1, 4),
+        "orphan": (("00003",), 0, 5),
+    }
+    assert path_string(keys["k1"][0], "d1") == "d1.00002.00001.00001"
+    ordered = sorted(keys, key=lambda k: path_string(keys[k][0]))
+    assert ordered == sorted(keys, key=lambda k: keys[k][2])
@@ -0,0 +1,76 @@
+import datetime
+
+import pytest
+
+from vbpl_meta import canonical_authority, extract_metadata, header_paragraphs, implied_by_number
+from vbpl_text import classify
+
+
+def marked(*paragraphs):
+    return "\n".join(f"{classify(p)}\t{p}" for p in paragraphs)
+
+
+LAW = marked(
+    "QUỐC HỘI",
+    "CỘNG HÒA XÃ HỘI CHỦ NGHĨA VIỆT NAM",
+    "Độc lập - Tự do - Hạnh phúc",
+    "Luật số: 23/2008/QH12",
+    "Hà Nội, ngày 13 tháng 11 năm 2008",
+    "LUẬT",
+    "GIAO THÔNG ĐƯỜNG BỘ",
+    "Căn cứ Hiến pháp nước Cộng hòa xã hội chủ nghĩa Việt Nam năm 1992 ngày 15 tháng 4 năm 1992;",
+    "Chương I",
+    "Điều 1. Phạm vi điều chỉnh",
+)
+
+
+@pytest.mark.parametrize("text, expected", [
+    (LAW, ("23/2008/QH12", datetime.date(2008, 11, 13), "Luật", "Quốc hội")),
+    # Both header cells flattened into one paragraph; authority normalized.
+    (marked("CHÍNH PHỦ CỘNG HÒA XÃ HỘI CHỦ NGHĨA VIỆT NAM Độc lập - Tự do - Hạnh phúc",
+            "Số: 100/2019/NĐ-CP Hà Nội, ngày 30 tháng 12 năm 2019",
+            "NGHỊ ĐỊNH",
+            "QUY ĐỊNH XỬ PHẠT VI PHẠM HÀNH CHÍNH"),
+     ("100/2019/NĐ-CP", datetime.date(2019, 12, 30), "Nghị định", "Chính phủ")),
+    # Longest type wins; authority not in the list keeps the header spelling.
+    (marked("BỘ CÔNG AN - BỘ GIAO THÔNG VẬN TẢI",
+            "Số: 01/2016/TTLT-BCA-BGTVT",
+            "THÔNG TƯ LIÊN TỊCH",
+            "Điều 1. Phạm vi"),
+     ("01/2016/TTLT-BCA-BGTVT", None, "Thông tư liên tịch", "BỘ CÔNG AN - BỘ GIAO THÔNG VẬN TẢI")),
+    # No header type or authority: both implied by the number.
+    (marked("Số: 81/2015/QĐ-TTg", "ngày 31 tháng 2 năm 2015", "Điều 1. Sửa đổi"),
+     ("81/2015/QĐ-TTG", None, "Quyết định", "Thủ tướng Chính phủ")),
+    ("", (None, None, None, None)),
+])
+def test_extract_metadata(text, expected):
+    meta = extract_metadata(text)
+    assert (meta["so_hieu"], meta["ngay_ban_hanh"], meta["loai_van_ban"], meta["co_quan_ban_hanh"]) == expected
+
+
+def test_header_stops_before_preamble():
+    header = header_paragraphs(LAW)
+    assert header[0] == "QUỐC HỘI"
+    assert header[-1] == "GIAO THÔNG ĐƯỜNG BỘ"
+
+
+@pytest.mark.parametrize("number, expected", [
+    ("23/2008/QH12", (None, "Quốc hội")),
+    ("02/2020/PL-UBTVQH14", ("Pháp lệnh", "Ủy ban Thường vụ Quốc hội")),
+    ("12/2021/TT-BGTVT", ("Thông tư", None)),
+    ("5/L-CTN", ("Lệnh", "Chủ tịch nước")),
+    ("abc", (None, None)),
+    (None, (None, None)),
+])
+def test_implied_by_number(number, expected):
+    assert implied_by_number(number) == expected
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("QUỐC HỘI", "Quốc hội"),
+    ("UỶ BAN THƯỜNG VỤ QUỐC HỘI", "Ủy ban Thường vụ Quốc hội"),
+    ("BỘ LAO ĐỘNG – THƯƠNG BINH VÀ XÃ HỘI", "Bộ Lao động - Thương binh và Xã hội"),
+    ("ỦY BAN NHÂN DÂN  TỈNH BÌNH DƯƠNG", "ỦY BAN NHÂN DÂN TỈNH BÌNH DƯƠNG"),
+])
+def test_canonical_authority(name, expected):
+    assert canonical_authority(name) == expected
@@ -0,0 +1,45 @@
+"""
+Accent folding and key normalization shared by the batch jobs.
+
+Vietnamese text in the corpus shows up with and without diacritics (mojibake,
+ASCII-only user queries), in NFC and NFD forms, and with stray whitespace and
+punctuation. ``fold()`` maps all of those onto one comparable key.
+"""
+
+import hashlib
+import re
+import unicodedata
+
+_FOLD_TABLE = str.maketrans({"đ": "d", "Đ": "d", "ð": "d", "Ð": "d"})
+_NON_WORD_RE = re.compile(r"[^\w]+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def strip_accents(text):
+    text = unicodedata.normalize("NFD", text.translate(_FOLD_TABLE))
+    return "".join(c for c in text if unicodedata.category(c) != "Mn")
+
+
+def fold(text):
+    """Lowercase, strip accents, turn punctuation into spaces and collapse whitespace."""
+    if not text:
+        return ""
+    text = strip_accents(text).lower()
+    return _SPACE_RE.sub(" ", _NON_WORD_RE.sub(" ", text)).strip()
+
+
+def tokens(text):
+    """Folded word tokens of ``text``."""
+    return fold(text).split()
+
+
+def normalize_text(text):
+    """NFC text with collapsed whitespace; the form that gets hashed and embedded."""
+    if not text:
+        return ""
+    return _SPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def content_hash(text):
+    """Hex SHA-256 of ``normalize_text(text)``; identical texts share one hash."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
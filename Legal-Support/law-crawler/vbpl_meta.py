@@ -0,0 +1,218 @@
+"""
+Document metadata of a VBQPPL page: số hiệu, ngày ban hành, loại văn bản, cơ quan ban hành.
+
+Every full text starts with the same header block, whatever the HTML looks
+like once it is flattened into paragraphs (see vbpl_text.py):
+
+    QUỐC HỘI                                  <- cơ quan ban hành
+    CỘNG HÒA XÃ HỘI CHỦ NGHĨA VIỆT NAM
+    Độc lập - Tự do - Hạnh phúc
+    Luật số: 23/2008/QH12                     <- số hiệu
+    Hà Nội, ngày 13 tháng 11 năm 2008         <- ngày ban hành
+    LUẬT                                      <- loại văn bản
+    GIAO THÔNG ĐƯỜNG BỘ
+
+``extract_metadata()`` reads the paragraphs before the preamble ("Căn cứ
+...") or the first part / chapter / section / article and returns the four fields, None where the header does
+not say. When the header has no type or authority line, the ones implied by
+the number ("/NĐ-CP" is a decree of the Government) are used instead. Known
+authorities are stored in one spelling (AUTHORITIES) whichever way the header
+writes them.
+
+The crawler stores the fields in ``vbpl`` (columns below) next to
+``noidung_text``; cmd/import-vbpl sends them as the document's number, year,
+type and authority.
+"""
+
+import datetime
+import re
+
+from citations import DOC_NUMBER_RE, normalize_doc_number
+from textnorm import fold
+from vbpl_text import MARKER_ARTICLE, MARKER_CHAPTER, MARKER_PART, MARKER_SECTION, read_paragraphs
+
+# vbpl column -> SQL type; ensure_meta_columns() adds the missing ones.
+META_COLUMNS = {
+    "so_hieu": "VARCHAR(64)",
+    "ngay_ban_hanh": "DATE",
+    "loai_van_ban": "VARCHAR(64)",
+    "co_quan_ban_hanh": "VARCHAR(255)",
+}
+
+HEADER_PARAGRAPHS = 40
+_BODY_MARKERS = (MARKER_PART, MARKER_CHAPTER, MARKER_SECTION, MARKER_ARTICLE)
+
+# Folded title line -> type, longest first so "thong tu lien tich" wins over "thong tu".
+DOC_TYPES = (
+    ("thong tu lien tich", "Thông tư liên tịch"),
+    ("nghi quyet lien tich", "Nghị quyết liên tịch"),
+    ("van ban hop nhat", "Văn bản hợp nhất"),
+    ("hien phap", "Hiến pháp"),
+    ("bo luat", "Bộ luật"),
+    ("luat", "Luật"),
+    ("phap lenh", "Pháp lệnh"),
+    ("nghi dinh", "Nghị định"),
+    ("nghi quyet", "Nghị quyết"),
+    ("thong tu", "Thông tư"),
+    ("quyet dinh", "Quyết định"),
+    ("chi thi", "Chỉ thị"),
+    ("lenh", "Lệnh"),
+)
+
+# Number suffix (lower case, accents stripped) -> (type, authority) implied by it.
+NUMBER_CODES = (
+    (re.compile(r"/ttlt-"), "Thông tư liên tịch", None),
+    (re.compile(r"/nqlt-"), "Nghị quyết liên tịch", None),
+    (re.compile(r"/vbhn-"), "Văn bản hợp nhất", None),
+    (re.compile(r"/pl-ubtvqh\d*$"), "Pháp lệnh", "Ủy ban Thường vụ Quốc hội"),
+    (re.compile(r"/nq-ubtvqh\d*$"), "Nghị quyết", "Ủy ban Thường vụ Quốc hội"),
+    (re.compile(r"/qh\d*$"), None, "Quốc hội"),
+    (re.compile(r"/nd-cp$"), "Nghị định", "Chính phủ"),
+    (re.compile(r"/nq-cp$"), "Nghị quyết", "Chính phủ"),
+    (re.compile(r"/qd-ttg$"), "Quyết định", "Thủ tướng Chính phủ"),
+    (re.compile(r"/ct-ttg$"), "Chỉ thị", "Thủ tướng Chính phủ"),
+    (re.compile(r"/tt-"), "Thông tư", None),
+    (re.compile(r"/qd-"), "Quyết định", None),
+    (re.compile(r"/nq-"), "Nghị quyết", None),
+    (re.compile(r"/ct-"), "Chỉ thị", None),
+    (re.compile(r"/l-ctn$"), "Lệnh", "Chủ tịch nước"),
+)
+
+# Folded name -> spelling stored for the authority, so "CHÍNH PHỦ" in a header
+# and "/NĐ-CP" in a number give the same value. Other authorities keep the
+# header's own (upper-case) spelling.
+AUTHORITIES = {fold(name): name for name in (
+    *(authority for _, _, authority in NUMBER_CODES if authority),
+    "Văn phòng Chính phủ",
+    "Thanh tra Chính phủ",
+    "Bộ Công an",
+    "Bộ Công Thương",
+    "Bộ Giao thông vận tải",
+    "Bộ Giáo dục và Đào tạo",
+    "Bộ Kế hoạch và Đầu tư",
+    "Bộ Khoa học và Công nghệ",
+    "Bộ Lao động - Thương binh và Xã hội",
+    "Bộ Ngoại giao",
+    "Bộ Nội vụ",
+    "Bộ Nông nghiệp và Phát triển nông thôn",
+    "Bộ Quốc phòng",
+    "Bộ Tài chính",
+    "Bộ Tài nguyên và Môi trường",
+    "Bộ Thông tin và Truyền thông",
+    "Bộ Tư pháp",
+    "Bộ Văn hóa, Thể thao và Du lịch",
+    "Bộ Xây dựng",
+    "Bộ Y tế",
+    "Ngân hàng Nhà nước Việt Nam",
+    "Tòa án nhân dân tối cao",
+    "Viện kiểm sát nhân dân tối cao",
+    "Kiểm toán nhà nước",
+)}
+
+_NUMBER_RE = re.compile(r"\bsố(?:\s+hiệu)?\s*[:.]?\s*" + DOC_NUMBER_RE.pattern, re.IGNORECASE)
+_DATE_RE = re.compile(r"\bngày\s+(\d{1,2})\s+tháng\s+(\d{1,2})\s+năm\s+(\d{4})", re.IGNORECASE)
+_MOTTO_RE = re.compile(r"cộng\s+hòa\s+xã\s+hội|cộng\s+hoà\s+xã\s+hội|độc\s+lập\s*[-–]\s*tự\s+do", re.IGNORECASE)
+_RULE_RE = re.compile(r"^[\s\-–—_=.*]+$")
+
+
+def header_paragraphs(marked_text, limit=HEADER_PARAGRAPHS):
+    """Paragraphs before the preamble or the body (first part / chapter / section / article)."""
+    header = []
+    for marker, paragraph in read_paragraphs(marked_text or ""):
+        # The preamble cites other documents by number and date; stop before it.
+        if marker in _BODY_MARKERS or len(header) >= limit or fold(paragraph).startswith("can cu"):
+            break
+        header.append(paragraph)
+    return header
+
+
+def _is_upper(text):
+    letters = [c for c in text if c.isalpha()]
+    return bool(letters) and all(c.isupper() for c in letters)
+
+
+def _doc_type(paragraph):
+    words = fold(paragraph)
+    for key, name in DOC_TYPES:
+        if words == key or words.startswith(key + " "):
+            return name
+    return None
+
+
+def _issue_date(paragraphs):
+    for paragraph in paragraphs:
+        for m in _DATE_RE.finditer(paragraph):
+            day, month, year = (int(g) for g in m.groups())
+            try:
+                return datetime.date(year, month, day)
+            except ValueError:
+                continue
+    return None
+
+
+def _authority(paragraphs):
+    """First upper-case line of the header that is neither the national motto nor a title."""
+    for paragraph in paragraphs:
+        motto = _MOTTO_RE.search(paragraph)
+        if motto:
+            # Both header cells flattened into one paragraph: the authority comes first.
+            paragraph = paragraph[:motto.start()].strip()
+        if not paragraph or _RULE_RE.match(paragraph) or len(paragraph) > 160:
+            continue
+        if _NUMBER_RE.search(paragraph) or _DATE_RE.search(paragraph):
+            break  # past the authority cell
+        if _is_upper(paragraph) and not _doc_type(paragraph):
+            return canonical_authority(paragraph.strip(" -–—_"))
+    return None
+
+
+def canonical_authority(name):
+    """The AUTHORITIES spelling of ``name`` (any case or accent form), else ``name`` with collapsed spaces."""
+    return AUTHORITIES.get(fold(name), " ".join(name.split()))
+
+
+def implied_by_number(number):
+    """(type, authority) implied by the number's suffix, each possibly None."""
+    key = normalize_doc_number(number or "").lower()
+    for pattern, doc_type, authority in NUMBER_CODES:
+        if pattern.search(key):
+            return doc_type, authority
+    return None, None
+
+
+def extract_metadata(marked_text):
+    """``{"so_hieu", "ngay_ban_hanh", "loai_van_ban", "co_quan_ban_hanh"}`` of a ``noidung_text`` value."""
+    header = header_paragraphs(marked_text)
+
+    number = None
+    for paragraph in header:
+        m = _NUMBER_RE.search(paragraph)
+        if m:
+            number = re.sub(r"\s+", "", m.group(1)).upper()
+            break
+
+    doc_type = next((t for t in map(_doc_type, filter(_is_upper, header)) if t), None)
+    authority = _authority(header)
+    implied_type, implied_authority = implied_by_number(number)
+    return {
+        "so_hieu": number,
+        "ngay_ban_hanh": _issue_date(header),
+        "loai_van_ban": doc_type or implied_type,
+        "co_quan_ban_hanh": authority or implied_authority,
+    }
+
+
+def ensure_meta_columns(conn):
+    """Add the metadata columns to ``vbpl`` if the table predates them."""
+    from sqlalchemy import text
+
+    columns = {row[0] for row in conn.execute(text(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = 'vbpl'"
+    ))}
+    # A missing table is created with the columns by the first to_sql() call.
+    missing = [name for name in META_COLUMNS if columns and name not in columns]
+    if missing:
+        conn.execute(text("ALTER TABLE vbpl " + ", ".join(
+            f"ADD COLUMN {name} {META_COLUMNS[name]} NULL" for name in missing)))
+        conn.commit()
@@ -0,0 +1,104 @@
+"""
+Normalize VBQPPL HTML into a marked plain-text paragraph list.
+
+The crawler stores the raw ``#toanvancontent`` HTML in ``vbpl.noidung``. Every
+downstream stage (splitter, importer, debug tools) only needs the paragraphs,
+so the HTML is parsed once here and the result is stored in
+``vbpl.noidung_text``:
+
+    <MARKER>\\t<paragraph text>
+
+one paragraph per line. MARKER is one of PHAN, CHUONG, MUC, DIEU, KHOAN, DIEM
+or empty for an ordinary paragraph, so a reader that does not care about the
+structure can simply drop everything up to the first tab.
+"""
+
+import re
+import unicodedata
+
+MARKER_PART = "PHAN"
+MARKER_CHAPTER = "CHUONG"
+MARKER_SECTION = "MUC"
+MARKER_ARTICLE = "DIEU"
+MARKER_CLAUSE = "KHOAN"
+MARKER_POINT = "DIEM"
+MARKER_TEXT = ""
+
+MARKERS = (MARKER_PART, MARKER_CHAPTER, MARKER_SECTION, MARKER_ARTICLE, MARKER_CLAUSE, MARKER_POINT)
+
+# "Đ" is sometimes typed as the Icelandic "Ð" in older documents.
+_D = "[ĐÐđð]"
+_MARKER_PATTERNS = (
+    (MARKER_PART, re.compile(r"^phần\s+(?:thứ\s+\S+|[ivxlc]+\b|\d+\b)", re.IGNORECASE)),
+    (MARKER_CHAPTER, re.compile(r"^chương\s+(?:[ivxlc]+|\d+)\b", re.IGNORECASE)),
+    (MARKER_SECTION, re.compile(r"^mục\s+(?:\d+|[ivxlc]+)\b", re.IGNORECASE)),
+    (MARKER_ARTICLE, re.compile(r"^" + _D + r"iều\s+\d+", re.IGNORECASE)),
+    (MARKER_CLAUSE, re.compile(r"^\d{1,3}\.\s")),
+    (MARKER_POINT, re.compile(r"^[a-zđ]\)\s")),
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def clean_paragraph(text):
+    """Collapse whitespace (including NBSP and tabs) and NFC-normalize."""
+    text = unicodedata.normalize("NFC", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def classify(paragraph):
+    """Return the structural marker for a cleaned paragraph."""
+    for marker, pattern in _MARKER_PATTERNS:
+        if pattern.match(paragraph):
+            return marker
+    return MARKER_TEXT
+
+
+def extract_paragraphs(html):
+    """Parse the stored HTML once and return the non-empty paragraph texts."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    root = soup.find("div", id="toanvancontent") or soup
+    paragraphs = [clean_paragraph(p.get_text(" ")) for p in root.find_all("p")]
+    if not any(paragraphs):
+        # Some documents are a single block without <p> tags.
+        paragraphs = [clean_paragraph(line) for line in root.get_text("\n").split("\n")]
+    return [p for p in paragraphs if p]
+
+
+def normalize_html(html):
+    """Convert raw VBQPPL HTML into the marked ``noidung_text`` format."""
+    if not html:
+        return ""
+    return "\n".join(f"{classify(p)}\t{p}" for p in extract_paragraphs(html))
+
+
+def read_paragraphs(marked_text):
+    """Yield ``(marker, paragraph)`` tuples from a ``noidung_text`` value."""
+    for line in marked_text.splitlines():
+        marker, sep, paragraph = line.partition("\t")
+        if not sep:
+            # Tolerate unmarked plain text.
+            marker, paragraph = MARKER_TEXT, marker
+        if paragraph:
+            yield marker, paragraph
+
+
+def plain_text(marked_text):
+    """Drop the markers and return one paragraph per line."""
+    return "\n".join(p for _, p in read_paragraphs(marked_text))
+
+
+def ensure_text_column(conn):
+    """Add ``vbpl.noidung_text`` if the table predates the normalization stage."""
+    from sqlalchemy import text
+
+    columns = {row[0] for row in conn.execute(text(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = 'vbpl'"
+    ))}
+    # A missing table is created with the column by the first to_sql() call.
+    if columns and "noidung_text" not in columns:
+        conn.execute(text("ALTER TABLE vbpl ADD COLUMN noidung_text LONGTEXT NULL"))
+        conn.commit()
@@ -0,0 +1,13 @@
+-- Precomputed citations: one edge per (source, target) and per-unit scan state
+CREATE UNIQUE INDEX IF NOT EXISTS idx_citations_source_target ON citations(source_unit_id, target_unit_id);
+
+-- Units already scanned by the citation resolver; unresolved > 0 marks units
+-- worth re-scanning once new documents are imported.
+CREATE TABLE IF NOT EXISTS citation_scans (
+  unit_id UUID PRIMARY KEY REFERENCES units(id) ON DELETE CASCADE,
+  resolved INTEGER NOT NULL DEFAULT 0,
+  unresolved INTEGER NOT NULL DEFAULT 0,
+  scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_citation_scans_unresolved ON citation_scans(scanned_at) WHERE unresolved > 0;
@@ -0,0 +1,5 @@
+-- Accent-folded, whitespace-normalized concept key for exact candidate lookup.
+-- Filled by law-crawler/scripts/normalize_concepts.py and by extract_triples.py.
+ALTER TABLE concepts ADD COLUMN IF NOT EXISTS name_key TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_concepts_name_key ON concepts(name_key);
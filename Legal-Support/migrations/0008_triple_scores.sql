@@ -0,0 +1,3 @@
+-- When score_triples.py last computed triples.tfidf; NULL = not scored yet
+ALTER TABLE triples ADD COLUMN IF NOT EXISTS tfidf_scored_at TIMESTAMP;
+CREATE INDEX IF NOT EXISTS idx_triples_tfidf_unscored ON triples(unit_id) WHERE tfidf_scored_at IS NULL;
@@ -0,0 +1,8 @@
+-- Embeddings keyed by text content, shared by every unit with the same text
+CREATE TABLE IF NOT EXISTS embedding_cache (
+  content_hash TEXT NOT NULL,
+  model TEXT NOT NULL,
+  embedding vector(768) NOT NULL,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (content_hash, model)
+);
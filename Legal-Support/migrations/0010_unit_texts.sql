@@ -0,0 +1,10 @@
+-- One row per distinct normalized unit text (see law-crawler/scripts/dedupe_texts.py)
+CREATE TABLE IF NOT EXISTS unit_texts (
+  content_hash TEXT PRIMARY KEY,
+  text TEXT NOT NULL,
+  unit_count INT NOT NULL DEFAULT 0,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE units ADD COLUMN IF NOT EXISTS content_hash TEXT REFERENCES unit_texts(content_hash);
+CREATE INDEX IF NOT EXISTS idx_units_content_hash ON units(content_hash);
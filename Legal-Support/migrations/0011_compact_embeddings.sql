@@ -0,0 +1,4 @@
+-- Compact copies of unit_embeddings.embedding for first-pass search; the full
+-- vector(768) stays for re-ranking (see law-crawler/scripts/compact_embeddings.py)
+ALTER TABLE unit_embeddings ADD COLUMN IF NOT EXISTS embedding_half halfvec(768);
+ALTER TABLE unit_embeddings ADD COLUMN IF NOT EXISTS embedding_bit bit(768);
@@ -0,0 +1,16 @@
+-- EXPLAIN (ANALYZE, BUFFERS) results of the query-shape harness
+-- (law-crawler/scripts/check_db_perf.py), kept per label to spot plan regressions
+CREATE TABLE IF NOT EXISTS query_plan_runs(
+  id BIGSERIAL PRIMARY KEY,
+  label TEXT NOT NULL,
+  shape TEXT NOT NULL,
+  params JSONB,
+  execution_ms REAL NOT NULL,
+  planning_ms REAL NOT NULL,
+  shared_hit BIGINT DEFAULT 0,
+  shared_read BIGINT DEFAULT 0,
+  seq_scans TEXT[] DEFAULT '{}',
+  plan JSONB,
+  run_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_query_plan_runs_shape ON query_plan_runs(shape, run_at);
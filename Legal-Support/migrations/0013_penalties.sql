@@ -0,0 +1,25 @@
+-- Structured penalty ranges extracted by scripts/extract_triples.py, so fine
+-- lookups ("mức phạt từ 2 triệu") are range scans instead of matching the
+-- "min-max" names of penalty concepts
+CREATE TABLE IF NOT EXISTS penalties(
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  unit_id UUID NOT NULL REFERENCES units(id) ON DELETE CASCADE,
+  actor_id UUID REFERENCES concepts(id) ON DELETE SET NULL,
+  action_id UUID REFERENCES concepts(id) ON DELETE SET NULL,
+  kind TEXT NOT NULL DEFAULT 'fine',  -- fine, license_suspension
+  min_amount BIGINT NOT NULL,
+  max_amount BIGINT NOT NULL,
+  currency TEXT,                      -- VND for fines, NULL for durations
+  unit TEXT NOT NULL,                 -- đồng, tháng
+  amount_range int8range GENERATED ALWAYS AS (int8range(min_amount, max_amount, '[]')) STORED,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  CHECK (min_amount <= max_amount)
+);
+
+-- One row per (unit, action, range); NULL actions compare equal here so re-runs stay idempotent
+CREATE UNIQUE INDEX IF NOT EXISTS idx_penalties_unique
+  ON penalties(unit_id, COALESCE(action_id, '00000000-0000-0000-0000-000000000000'::uuid), kind, min_amount, max_amount);
+CREATE INDEX IF NOT EXISTS idx_penalties_kind_min ON penalties(kind, min_amount, max_amount);
+CREATE INDEX IF NOT EXISTS idx_penalties_kind_max ON penalties(kind, max_amount);
+CREATE INDEX IF NOT EXISTS idx_penalties_range ON penalties USING gist(amount_range);
+CREATE INDEX IF NOT EXISTS idx_penalties_action ON penalties(action_id);
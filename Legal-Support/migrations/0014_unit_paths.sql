@@ -0,0 +1,13 @@
+-- Materialized unit paths: d<document id>.<sibling rank>... written by the
+-- Python loaders (law-crawler/structure.py tree_keys) and backfilled by
+-- law-crawler/scripts/backfill_unit_paths.py. A chapter with everything
+-- under it is "path <@ chapter.path", an article's breadcrumb is
+-- "path @> article.path", and ORDER BY path / doc_order is document order.
+CREATE EXTENSION IF NOT EXISTS ltree;
+
+ALTER TABLE units ADD COLUMN IF NOT EXISTS path ltree;
+ALTER TABLE units ADD COLUMN IF NOT EXISTS depth SMALLINT;
+ALTER TABLE units ADD COLUMN IF NOT EXISTS doc_order INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_units_path_gist ON units USING gist(path);
+CREATE INDEX IF NOT EXISTS idx_units_document_doc_order ON units(document_id, doc_order);
@@ -0,0 +1,28 @@
+-- Keep the compact copies of 0011 in step with unit_embeddings.embedding.
+-- They are filled by law-crawler/scripts/compact_embeddings.py --backfill (or
+-- backfill_embeddings.py --compact); a later rewrite of the vector (the API's
+-- re-embed, a model change, backfill_embeddings without --compact) would leave
+-- them holding the old one. The trigger recomputes every copy that is in use
+-- (not NULL) whenever the vector changes; copies never filled stay NULL.
+CREATE OR REPLACE FUNCTION refresh_compact_embeddings() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'INSERT' OR NEW.embedding IS DISTINCT FROM OLD.embedding THEN
+    IF NEW.embedding_half IS NOT NULL THEN
+      NEW.embedding_half := NEW.embedding::halfvec(768);
+    END IF;
+    IF NEW.embedding_bit IS NOT NULL THEN
+      NEW.embedding_bit := binary_quantize(NEW.embedding)::bit(768);
+    END IF;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_unit_embeddings_compact ON unit_embeddings;
+CREATE TRIGGER trg_unit_embeddings_compact
+  BEFORE INSERT OR UPDATE ON unit_embeddings
+  FOR EACH ROW EXECUTE FUNCTION refresh_compact_embeddings();
+
+-- Rows rewritten before the trigger existed.
+UPDATE unit_embeddings SET embedding_half = embedding::halfvec(768) WHERE embedding_half IS NOT NULL;
+UPDATE unit_embeddings SET embedding_bit = binary_quantize(embedding)::bit(768) WHERE embedding_bit IS NOT NULL;
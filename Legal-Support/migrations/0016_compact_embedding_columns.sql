@@ -0,0 +1,51 @@
+-- Fill the compact copies of 0011 for new vectors too, not only for rows that
+-- already had one (0015). A compact column is in use once it is listed here
+-- (law-crawler/scripts/compact_embeddings.py --backfill / --index and
+-- backfill_embeddings.py --compact register it) or once its index exists;
+-- from then on every inserted or rewritten vector gets its copy, so units the
+-- API embeds after a backfill are not missed by the two-stage first pass.
+CREATE TABLE IF NOT EXISTS compact_embedding_columns (
+  column_name TEXT PRIMARY KEY CHECK (column_name IN ('embedding_half', 'embedding_bit')),
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION refresh_compact_embeddings() RETURNS trigger AS $$
+DECLARE
+  half_on BOOLEAN;
+  bit_on BOOLEAN;
+BEGIN
+  IF TG_OP = 'INSERT' OR NEW.embedding IS DISTINCT FROM OLD.embedding THEN
+    SELECT COALESCE(bool_or(column_name = 'embedding_half'), false),
+           COALESCE(bool_or(column_name = 'embedding_bit'), false)
+      INTO half_on, bit_on
+      FROM compact_embedding_columns;
+    IF half_on OR NEW.embedding_half IS NOT NULL
+       OR to_regclass('idx_unit_embeddings_embedding_half') IS NOT NULL THEN
+      NEW.embedding_half := NEW.embedding::halfvec(768);
+    END IF;
+    IF bit_on OR NEW.embedding_bit IS NOT NULL
+       OR to_regclass('idx_unit_embeddings_embedding_bit') IS NOT NULL THEN
+      NEW.embedding_bit := binary_quantize(NEW.embedding)::bit(768);
+    END IF;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Columns already backfilled or indexed are in use.
+INSERT INTO compact_embedding_columns (column_name)
+SELECT 'embedding_half'
+WHERE to_regclass('idx_unit_embeddings_embedding_half') IS NOT NULL
+   OR EXISTS (SELECT 1 FROM unit_embeddings WHERE embedding_half IS NOT NULL)
+ON CONFLICT DO NOTHING;
+INSERT INTO compact_embedding_columns (column_name)
+SELECT 'embedding_bit'
+WHERE to_regclass('idx_unit_embeddings_embedding_bit') IS NOT NULL
+   OR EXISTS (SELECT 1 FROM unit_embeddings WHERE embedding_bit IS NOT NULL)
+ON CONFLICT DO NOTHING;
+
+-- Vectors written since the last backfill.
+UPDATE unit_embeddings SET embedding_half = embedding::halfvec(768)
+WHERE embedding_half IS NULL AND EXISTS (SELECT 1 FROM compact_embedding_columns WHERE column_name = 'embedding_half');
+UPDATE unit_embeddings SET embedding_bit = binary_quantize(embedding)::bit(768)
+WHERE embedding_bit IS NULL AND EXISTS (SELECT 1 FROM compact_embedding_columns WHERE column_name = 'embedding_bit');